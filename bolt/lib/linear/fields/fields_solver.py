@@ -1,5 +1,6 @@
 import arrayfire as af
 from bolt.lib.linear.utils.fft_funcs import fft2
+from bolt.lib.linear.utils.broadcasted_primitive_operations import multiply
 import numpy as np
 
 from .electrostatic_solver import compute_electrostatic_fields
@@ -22,6 +23,12 @@ class fields_solver(object):
         self.initialize_E = initialize_E
         self.initialize_B = initialize_B
 
+        # q/m for each of the species(along axis 1):
+        self._charge_by_mass = params.charge / params.mass
+
+        # The forces are always formed for all velocities(see A_p):
+        self.magnetic_fields_vanish = False
+
         self._initialize(rho_initial)
 
     def _initialize(self, rho_initial):
@@ -99,5 +106,15 @@ class fields_solver(object):
                self.B1_hat, self.B2_hat, self.B3_hat
               )
 
+    def get_lorentz_fields(self):
+        """
+        Returns the fields returned by get_fields multiplied
+        by q/m of each of the species.
+        """
+        return(tuple(multiply(self._charge_by_mass, field)
+                     for field in self.get_fields()
+                    )
+              )
+
     # Adding solver methods:
     compute_electrostatic_fields = compute_electrostatic_fields
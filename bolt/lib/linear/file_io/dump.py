@@ -71,6 +71,7 @@ def dump_moments(self, file_name):
     af.flat(array_to_dump).to_ndarray(self._glob_moments_array)
     viewer = PETSc.Viewer().createHDF5(file_name + '.h5', 'w')
     viewer(self._glob_moments)
+    viewer.destroy()
 
 def dump_distribution_function(self, file_name):
     """
@@ -119,6 +120,7 @@ def dump_distribution_function(self, file_name):
     
     viewer = PETSc.Viewer().createHDF5(file_name + '.h5', 'w')
     viewer(self._glob_f)
+    viewer.destroy()
 
 def dump_EM_fields(self, file_name):
     """
@@ -179,5 +181,6 @@ def dump_EM_fields(self, file_name):
     
     viewer = PETSc.Viewer().createHDF5(file_name + '.h5', 'w')
     viewer(self.fields_solver._glob_fields)
+    viewer.destroy()
 
     return
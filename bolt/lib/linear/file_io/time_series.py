@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Methods of the linear solver which write the output of the run to a single
+HDF5 file. The time_series_writer of the nonlinear solver is used so that the
+files written by both the solvers follow the same format.
+"""
+
+import arrayfire as af
+from petsc4py import PETSc
+
+from bolt.lib.linear.utils.fft_funcs import ifft2
+from bolt.lib.nonlinear.file_io.time_series import time_series_writer
+
+def open_time_series(self, file_name, flush_interval = 1):
+    """
+    Opens the file 'file_name.h5' to which the output of the run is
+    appended using append_time_series.
+
+    Parameters
+    ----------
+
+    file_name: str
+               Name of the file(without the extension) to be written.
+
+    flush_interval: int
+                    Number of appends after which the file is flushed
+                    to disk. Passing 0 flushes the file only when closed.
+    """
+    self._time_series = time_series_writer(file_name, PETSc.COMM_WORLD.tompi4py(),
+                                           self.N_q1, self.N_q2, self._da_dump_f,
+                                           flush_interval
+                                          )
+    return
+
+def append_time_series(self, moments = True, EM_fields = True,
+                       distribution_function = False
+                      ):
+    """
+    Appends the present state of the system to the file
+    opened by open_time_series.
+
+    Parameters
+    ----------
+
+    moments: bool
+             When True, the moments are appended to the dataset 'moments'.
+
+    EM_fields: bool
+               When True, the EM fields are appended to the dataset 
+               'EM_fields'. This is ignored when the fields are not enabled.
+
+    distribution_function: bool
+                           When True, a snapshot of the distribution function
+                           is appended to the dataset 'distribution_function'.
+    """
+    if(moments == True):
+        attributes = [a for a in dir(self.physical_system.moments) if not a.startswith('_')]
+    
+        for i in range(len(attributes)):
+            
+            if(i == 0):
+                array_to_dump = self.compute_moments(attributes[i])
+            else:
+                array_to_dump = af.join(1, array_to_dump,
+                                        self.compute_moments(attributes[i])
+                                       )
+
+        self._time_series.append('moments', self.time_elapsed,
+                                 af.flat(array_to_dump).to_ndarray()
+                                )
+
+    if(    EM_fields == True
+       and self.physical_system.params.EM_fields_enabled == True
+      ):
+        array_to_dump = 0.5 * self.N_q2 * self.N_q1 * \
+                        af.real(ifft2(self.fields_solver.fields_hat))
+
+        self._time_series.append('EM_fields', self.time_elapsed,
+                                 af.flat(array_to_dump).to_ndarray()
+                                )
+
+    if(distribution_function == True):
+        array_to_dump = 0.5 * self.N_q2 * self.N_q1 * af.real(ifft2(self.f_hat))
+
+        self._time_series.append('distribution_function', self.time_elapsed,
+                                 af.flat(array_to_dump).to_ndarray()
+                                )
+
+    return
+
+def close_time_series(self):
+    """
+    Closes the file opened by open_time_series.
+    """
+    self._time_series.close()
+    self._time_series = None
+    return
@@ -25,10 +25,11 @@ from inspect import signature
 from .fields.fields_solver import fields_solver
 from .calculate_dfdp_background import calculate_dfdp_background
 from .compute_moments import compute_moments as compute_moments_imported
-from .file_io import dump, load
+from .file_io import dump, load, time_series
 from .utils.bandwidth_test import bandwidth_test
 from .utils.print_with_indent import indent
 from .utils.broadcasted_primitive_operations import multiply
+from ..nonlinear.utils import diagnostics
 
 from . import timestep
 
@@ -98,6 +99,11 @@ class linear_solver(object):
         # Initializing variable to hold time elapsed:
         self.time_elapsed = 0
 
+        # Registry of the in-situ diagnostics, which are reduced across
+        # the ranks using this communicator:
+        self._comm        = PETSc.COMM_WORLD.tompi4py()
+        self._diagnostics = diagnostics._initialize_diagnostics(self)
+
         # Checking that periodic B.C's are utilized:
         if(    physical_system.boundary_conditions.in_q1_left   != 'periodic' 
            and physical_system.boundary_conditions.in_q1_right  != 'periodic'
@@ -158,6 +164,17 @@ class linear_solver(object):
         # Initializing f, f_hat and the other EM field quantities:
         self._initialize(physical_system.params)
 
+        # Since tau doesn't vary with time, the zones for which the collisions
+        # are instantaneous are determined once here, instead of at every
+        # timestep. The mask is held only when such zones exist:
+        tau = physical_system.params.tau(self.q1_center, self.q2_center,
+                                         self.p1, self.p2, self.p3
+                                        )
+        if(af.any_true(tau == 0)):
+            self._tau_zero_mask = (tau == 0)
+        else:
+            self._tau_zero_mask = None
+
     def get_dist_func(self):
         """
         Returns the distribution function in the same
@@ -309,5 +326,18 @@ class linear_solver(object):
     dump_distribution_function = dump.dump_distribution_function
     dump_moments               = dump.dump_moments
 
+    # Methods used in writing the output to a single file:
+    open_time_series   = time_series.open_time_series
+    append_time_series = time_series.append_time_series
+    close_time_series  = time_series.close_time_series
+
+    # In-situ diagnostics(the functions need to be passed when registering,
+    # and evaluate_diagnostics needs to be called at the end of each step):
+    register_diagnostic  = diagnostics.register_diagnostic
+    enable_diagnostics   = diagnostics.enable_diagnostics
+    evaluate_diagnostics = diagnostics.evaluate_diagnostics
+    flush_diagnostics    = diagnostics.flush_diagnostics
+    close_diagnostics    = diagnostics.close_diagnostics
+
     # Used to read the data from file
     load_distribution_function = load.load_distribution_function
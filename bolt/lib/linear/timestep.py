@@ -20,10 +20,8 @@ def RK5_step(self, dt):
 
     """
     # For purely collisional cases:
-    tau = self.physical_system.params.tau(self.q1_center, self.q2_center,
-                                          self.p1, self.p2, self.p3
-                                         )
-    if(af.any_true(tau == 0)):
+    # The mask is determined once when the solver is declared:
+    if(self._tau_zero_mask is not None):
 
         f0 = self._source(0.5 * self.N_q1 * self.N_q2 * af.real(ifft2(self.f_hat)),
                           self.time_elapsed, self.q1_center, self.q2_center,
@@ -33,7 +31,7 @@ def RK5_step(self, dt):
                           True
                          )
 
-        self.f_hat = af.select(tau == 0, 
+        self.f_hat = af.select(self._tau_zero_mask, 
                                2 * fft2(f0) / (self.N_q1 * self.N_q2),
                                self.f_hat
                               ) 
@@ -69,10 +67,8 @@ def RK4_step(self, dt):
         The timestep size.
     """
     # For purely collisional cases:
-    tau = self.physical_system.params.tau(self.q1_center, self.q2_center,
-                                          self.p1, self.p2, self.p3
-                                         )
-    if(af.any_true(tau == 0)):
+    # The mask is determined once when the solver is declared:
+    if(self._tau_zero_mask is not None):
 
         f0 = self._source(0.5 * self.N_q1 * self.N_q2 * af.real(ifft2(self.f_hat)),
                           self.time_elapsed, self.q1_center, self.q2_center,
@@ -82,7 +78,7 @@ def RK4_step(self, dt):
                           True
                          )
 
-        self.f_hat = af.select(tau == 0, 
+        self.f_hat = af.select(self._tau_zero_mask, 
                                2 * fft2(f0) / (self.N_q1 * self.N_q2),
                                self.f_hat
                               ) 
@@ -118,10 +114,8 @@ def RK2_step(self, dt):
         The timestep size.
     """
     # For purely collisional cases:
-    tau = self.physical_system.params.tau(self.q1_center, self.q2_center,
-                                          self.p1, self.p2, self.p3
-                                         )
-    if(af.any_true(tau == 0)):
+    # The mask is determined once when the solver is declared:
+    if(self._tau_zero_mask is not None):
 
         f0 = self._source(0.5 * self.N_q1 * self.N_q2 * af.real(ifft2(self.f_hat)),
                           self.time_elapsed, self.q1_center, self.q2_center,
@@ -131,7 +125,7 @@ def RK2_step(self, dt):
                           True
                          )
 
-        self.f_hat = af.select(tau == 0, 
+        self.f_hat = af.select(self._tau_zero_mask, 
                                2 * fft2(f0) / (self.N_q1 * self.N_q2),
                                self.f_hat
                               ) 
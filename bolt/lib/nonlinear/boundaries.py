@@ -3,6 +3,42 @@
 
 import arrayfire as af
 
+from .utils.lazy_evaluation import eval_helper
+from .utils.host_syncs import host_sync
+
+def wrap_periodic(coordinates, start, end):
+    """
+    Maps the coordinates which lie outside [start, end] back into the
+    domain by adding/subtracting integer multiples of the domain length.
+    This gives the same result as repeatedly shifting the out of domain
+    points by the length of the domain, without the host having to wait
+    on a reduction at every iteration.
+
+    Parameters
+    ----------
+    coordinates: af.Array
+                 Coordinates which are to be wrapped.
+
+    start: float
+           Start point of the domain.
+
+    end: float
+         End point of the domain.
+    """
+    L = end - start
+
+    coordinates = af.select(coordinates > end,
+                            coordinates - L * af.ceil((coordinates - end) / L),
+                            coordinates
+                           )
+
+    coordinates = af.select(coordinates < start,
+                            coordinates + L * af.ceil((start - coordinates) / L),
+                            coordinates
+                           )
+
+    return(coordinates)
+
 def apply_shearing_box_bcs_f(self, boundary):
     """
     Applies the shearing box boundary conditions along boundary specified 
@@ -25,16 +61,8 @@ def apply_shearing_box_bcs_f(self, boundary):
         sheared_coordinates = self.q2_center[:, :, :N_g_q] - q * omega * L_q1 * self.time_elapsed
         
         # Applying periodic boundary conditions to the points which are out of domain:
-        while(af.sum(sheared_coordinates>self.q2_end) != 0):
-            sheared_coordinates = af.select(sheared_coordinates>self.q2_end,
-                                            sheared_coordinates - L_q2,
-                                            sheared_coordinates
-                                           )
-
-        while(af.sum(sheared_coordinates<self.q2_start) != 0):
-            sheared_coordinates = af.select(sheared_coordinates<self.q2_start,
-                                            sheared_coordinates + L_q2,
-                                            sheared_coordinates
+        sheared_coordinates = wrap_periodic(sheared_coordinates,
+                                            self.q2_start, self.q2_end
                                            )
 
         # Reordering from (N_p, N_s, N_q1, N_q2) --> (N_q1, N_q2, N_p, N_s)
@@ -54,16 +82,8 @@ def apply_shearing_box_bcs_f(self, boundary):
         sheared_coordinates = self.q2_center[:, :, -N_g_q:] + q * omega * L_q1 * self.time_elapsed
 
         # Applying periodic boundary conditions to the points which are out of domain:
-        while(af.sum(sheared_coordinates>self.q2_end) != 0):
-            sheared_coordinates = af.select(sheared_coordinates>self.q2_end,
-                                            sheared_coordinates - L_q2,
-                                            sheared_coordinates
-                                           )
-
-        while(af.sum(sheared_coordinates<self.q2_start) != 0):
-            sheared_coordinates = af.select(sheared_coordinates<self.q2_start,
-                                            sheared_coordinates + L_q2,
-                                            sheared_coordinates
+        sheared_coordinates = wrap_periodic(sheared_coordinates,
+                                            self.q2_start, self.q2_end
                                            )
 
         # Reordering from (N_p, N_s, N_q1, N_q2) --> (N_q1, N_q2, N_p, N_s)
@@ -84,16 +104,8 @@ def apply_shearing_box_bcs_f(self, boundary):
         sheared_coordinates = self.q1_center[:, :, :, :N_g_q] - q * omega * L_q2 * self.time_elapsed
 
         # Applying periodic boundary conditions to the points which are out of domain:
-        while(af.sum(sheared_coordinates>self.q1_end) != 0):
-            sheared_coordinates = af.select(sheared_coordinates>self.q1_end,
-                                            sheared_coordinates - L_q1,
-                                            sheared_coordinates
-                                           )
-
-        while(af.sum(sheared_coordinates<self.q1_start) != 0):
-            sheared_coordinates = af.select(sheared_coordinates<self.q1_start,
-                                            sheared_coordinates + L_q1,
-                                            sheared_coordinates
+        sheared_coordinates = wrap_periodic(sheared_coordinates,
+                                            self.q1_start, self.q1_end
                                            )
 
         # Reordering from (N_p, N_s, N_q1, N_q2) --> (N_q1, N_q2, N_p, N_s)
@@ -114,16 +126,8 @@ def apply_shearing_box_bcs_f(self, boundary):
         sheared_coordinates = self.q1_center[:, :, :, -N_g_q:] + q * omega * L_q2 * self.time_elapsed
 
         # Applying periodic boundary conditions to the points which are out of domain:
-        while(af.sum(sheared_coordinates>self.q1_end) != 0):
-            sheared_coordinates = af.select(sheared_coordinates>self.q1_end,
-                                            sheared_coordinates - L_q1,
-                                            sheared_coordinates
-                                           )
-
-        while(af.sum(sheared_coordinates<self.q1_start) != 0):
-            sheared_coordinates = af.select(sheared_coordinates<self.q1_start,
-                                            sheared_coordinates + L_q1,
-                                            sheared_coordinates
+        sheared_coordinates = wrap_periodic(sheared_coordinates,
+                                            self.q1_start, self.q1_end
                                            )
         
         # Reordering from (N_p, N_s, N_q1, N_q2) --> (N_q1, N_q2, N_p, N_s)
@@ -187,24 +191,28 @@ def apply_dirichlet_bcs_f(self, boundary):
 
     if(boundary == 'left'):
         f_left = self.boundary_conditions.f_left(self.f, *args)
+        f_left = self._cast_to_storage_precision(f_left)
         # Only changing inflowing characteristics:
         f_left = af.select(A_q1>0, f_left, self.f)
         self.f[:, :, :N_g_q] = f_left[:, :, :N_g_q]
 
     elif(boundary == 'right'):
         f_right = self.boundary_conditions.f_right(self.f, *args)
+        f_right = self._cast_to_storage_precision(f_right)
         # Only changing inflowing characteristics:
         f_right = af.select(A_q1<0, f_right, self.f)
         self.f[:, :, -N_g_q:] = f_right[:, :, -N_g_q:]
 
     elif(boundary == 'bottom'):
         f_bottom = self.boundary_conditions.f_bottom(self.f, *args)
+        f_bottom = self._cast_to_storage_precision(f_bottom)
         # Only changing inflowing characteristics:
         f_bottom = af.select(A_q2>0, f_bottom, self.f)
         self.f[:, :, :, :N_g_q] = f_bottom[:, :, :, :N_g_q]
 
     elif(boundary == 'top'):
         f_top = self.boundary_conditions.f_top(self.f, *args)
+        f_top = self._cast_to_storage_precision(f_top)
         # Only changing inflowing characteristics:
         f_top = af.select(A_q2<0, f_top, self.f)
         self.f[:, :, :, -N_g_q:] = f_top[:, :, :, -N_g_q:]
@@ -407,10 +415,10 @@ def apply_bcs_f(self):
         else:
             raise NotImplementedError('Unavailable/Invalid boundary condition')
 
-    af.eval(self.f)
+    eval_helper(self.f)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_apply_bcs_f += toc - tic
    
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import arrayfire as af
 
+from .utils.lazy_evaluation import eval_planned
+from .utils.host_syncs import host_sync, record_host_sync
+
 def communicate_f(self):
     """
     Used in communicating the values at the boundary zones
@@ -31,10 +35,13 @@ def communicate_f(self):
        or self.boundary_conditions.in_q2_bottom == 'dirichlet' 
        or self.boundary_conditions.in_q2_top    == 'dirichlet' 
       ):
-        af.flat(self.f).to_ndarray(self._local_f_array)
+        af.flat(self._cast_for_communication(self.f)).\
+            to_ndarray(self._local_f_array)
 
     # Global value is non-inclusive of the ghost-zones:
-    af.flat(self.f[:, :, N_g_q:-N_g_q, N_g_q:-N_g_q]).to_ndarray(self._glob_f_array)
+    af.flat(self._cast_for_communication(self.f[:, :, N_g_q:-N_g_q, N_g_q:-N_g_q])).\
+        to_ndarray(self._glob_f_array)
+    record_host_sync(self, 'communicate_f')
 
     # The following function takes care of interzonal communications
     # Additionally, it also automatically applies periodic BCs when necessary
@@ -50,73 +57,180 @@ def communicate_f(self):
                              N_q1_local + 2 * N_g_q,
                              N_q2_local + 2 * N_g_q
                             )
+    self.f      = self._cast_to_storage_precision(self.f)
 
-    af.eval(self.f)
+    eval_planned(self.f)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_communicate_f += toc - tic
 
     return
 
 
-def communicate_fields(self, on_fdtd_grid = False):
+def _get_halo_exchange(self, components):
     """
-    Used in communicating the values at the boundary zones for each of
-    the local vectors among all procs.This routine is called to take care
-    of communication(and periodic B.C's) procedures for the EM field
-    arrays. The function is used for communicating the EM field values 
-    on the cell centered grid  which is used by default. Additionally,it can
-    also be used to communicate the values on the Yee-grid which is used by the FDTD solver.
+    Returns the DMDA, vectors and staging buffers used in exchanging
+    the ghost zones of the field components in range(*components).
+    These are created upon the first exchange of the components, with
+    the same decomposition as _da_fields.
+    """
+    if(components not in self._halo_exchanges):
+        ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_fields.getCorners()
+
+        N_g = self.N_g
+        dof = components[1] - components[0]
+
+        da    = self._da_fields.duplicate(dof = dof)
+        glob  = da.createGlobalVec()
+        local = da.createLocalVec()
+
+        # Sizes of the strips of the local zone which are needed by the
+        # neighbouring ranks(left, right, bottom, top):
+        N_send = 2 * dof * N_g * (N_q1_local + N_q2_local)
+        # Sizes of the ghost slabs(left, right, bottom, top):
+        N_recv = [dof * N_g * (N_q2_local + 2 * N_g)] * 2 + [dof * N_g * N_q1_local] * 2
+
+        self._halo_exchanges[components] = \
+            {'da'          : da,
+             'glob'        : glob,
+             'local'       : local,
+             'glob_array'  : glob.getArray().reshape(N_q2_local, N_q1_local, dof),
+             'local_array' : local.getArray().reshape(N_q2_local + 2 * N_g,
+                                                      N_q1_local + 2 * N_g,
+                                                      dof
+                                                     ),
+             'send'        : np.zeros(N_send),
+             'recv'        : np.zeros(sum(N_recv)),
+             'N_recv'      : N_recv
+            }
+
+    return(self._halo_exchanges[components])
+
+def communicate_fields_begin(self, on_fdtd_grid = False, components = (0, 6)):
+    """
+    Begins the exchange of the ghost zones for the field components in
+    range(*components) by staging the strips of the local zone which are
+    needed by the neighbouring ranks on the host. Only these strips(of
+    width N_g) are transferred, rather than the complete local zone.
+
+    Since ArrayFire queues operations asynchronously, the device may be
+    given work which doesn't depend on the ghost zones(such as the update
+    of the interior zones) between communicate_fields_begin and 
+    communicate_fields_end, which is then carried out while the exchange
+    between the ranks takes place.
+
+    Returns the exchange which is to be passed to communicate_fields_end.
     """
     if(self.performance_test_flag == True):
         tic = af.time()
 
-    # Obtaining start coordinates for the local zone
-    # Additionally, we also obtain the size of the local zone
     ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_fields.getCorners()
 
-    N_g = self.N_g
-
-    # Assigning the values of the af.Array 
-    # fields quantities to the PETSc.Vec:
+    N_g      = self.N_g
+    exchange = _get_halo_exchange(self, components)
+    c        = slice(components[0], components[1])
 
     if(on_fdtd_grid is True):
-        flattened_global_EM_fields_array = \
-            af.flat(self.yee_grid_EM_fields[:, :, N_g:-N_g, N_g:-N_g])
-        flattened_global_EM_fields_array.to_ndarray(self._glob_fields_array)
-
+        fields = self.yee_grid_EM_fields
     else:
-        flattened_global_EM_fields_array = \
-            af.flat(self.cell_centered_EM_fields[:, :, N_g:-N_g, N_g:-N_g])
-        flattened_global_EM_fields_array.to_ndarray(self._glob_fields_array)
+        fields = self.cell_centered_EM_fields
+
+    # Strips of the local zone adjacent to each of the boundaries:
+    af.join(0, af.flat(fields[c, 0, N_g:2 * N_g, N_g:-N_g]),
+               af.flat(fields[c, 0, N_q1_local:N_q1_local + N_g, N_g:-N_g]),
+               af.flat(fields[c, 0, N_g:-N_g, N_g:2 * N_g]),
+               af.flat(fields[c, 0, N_g:-N_g, N_q2_local:N_q2_local + N_g])
+           ).to_ndarray(exchange['send'])
+    record_host_sync(self, 'communicate_fields')
+
+    dof      = components[1] - components[0]
+    N_strip  = [dof * N_g * N_q2_local] * 2 + [dof * N_g * N_q1_local] * 2
+    strips   = np.split(exchange['send'], np.cumsum(N_strip)[:-1])
+    glob     = exchange['glob_array']
+
+    # The remaining zones of the global vector aren't read by the neighbours:
+    glob[:, :N_g]              = strips[0].reshape(N_q2_local, N_g, dof)
+    glob[:, N_q1_local - N_g:] = strips[1].reshape(N_q2_local, N_g, dof)
+    glob[:N_g]                 = strips[2].reshape(N_g, N_q1_local, dof)
+    glob[N_q2_local - N_g:]    = strips[3].reshape(N_g, N_q1_local, dof)
+
+    if(self.performance_test_flag == True):
+        toc = af.time()
+        self.time_communicate_fields += toc - tic
+
+    return(exchange)
+
+def communicate_fields_end(self, exchange, on_fdtd_grid = False, components = (0, 6)):
+    """
+    Completes the exchange begun by communicate_fields_begin, and assigns
+    the ghost zones of the field components in range(*components). Only
+    the ghost slabs are transferred back to the device.
+    """
+    if(self.performance_test_flag == True):
+        tic = af.time()
+
+    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_fields.getCorners()
+
+    N_g = self.N_g
+    dof = components[1] - components[0]
+    c   = slice(components[0], components[1])
 
     # Takes care of boundary conditions and interzonal communications:
-    self._da_fields.globalToLocal(self._glob_fields, self._local_fields)
+    exchange['da'].globalToLocal(exchange['glob'], exchange['local'])
 
-    # Converting back to af.Array
-    if(on_fdtd_grid is True):
+    local = exchange['local_array']
+    recv  = exchange['recv']
 
-        self.yee_grid_EM_fields = af.moddims(af.to_array(self._local_fields_array),
-                                             6, 1, N_q1_local + 2 * N_g,
-                                             N_q2_local + 2 * N_g
-                                            )
-        
-        af.eval(self.yee_grid_EM_fields)
+    # Packing the ghost slabs(left, right, bottom, top) for a single transfer:
+    recv[:] = np.concatenate([local[:, :N_g].ravel(),
+                              local[:, -N_g:].ravel(),
+                              local[:N_g, N_g:-N_g].ravel(),
+                              local[-N_g:, N_g:-N_g].ravel()
+                             ])
 
+    slabs  = af.to_array(recv)
+    offset = np.concatenate([[0], np.cumsum(exchange['N_recv'])])
+
+    def slab(index, N_q1_slab, N_q2_slab):
+        return(af.moddims(slabs[int(offset[index]):int(offset[index + 1])],
+                          dof, 1, N_q1_slab, N_q2_slab
+                         )
+              )
+
+    if(on_fdtd_grid is True):
+        fields = self.yee_grid_EM_fields
     else:
+        fields = self.cell_centered_EM_fields
 
-        self.cell_centered_EM_fields = af.moddims(af.to_array(self._local_fields_array),
-                                                  6, 1, N_q1_local + 2 * N_g,
-                                                  N_q2_local + 2 * N_g
-                                                 )
-        
-        af.eval(self.cell_centered_EM_fields)
+    fields[c, 0, :N_g]             = slab(0, N_g, N_q2_local + 2 * N_g)
+    fields[c, 0, -N_g:]            = slab(1, N_g, N_q2_local + 2 * N_g)
+    fields[c, 0, N_g:-N_g, :N_g]   = slab(2, N_q1_local, N_g)
+    fields[c, 0, N_g:-N_g, -N_g:]  = slab(3, N_q1_local, N_g)
+
+    af.eval(fields)
     
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_communicate_fields += toc - tic
 
     return
+
+def communicate_fields(self, on_fdtd_grid = False, components = (0, 6)):
+    """
+    Used in communicating the values at the boundary zones for each of
+    the local vectors among all procs.This routine is called to take care
+    of communication(and periodic B.C's) procedures for the EM field
+    arrays. The function is used for communicating the EM field values 
+    on the cell centered grid  which is used by default. Additionally,it can
+    also be used to communicate the values on the Yee-grid which is used by the FDTD solver.
+
+    Only the field components in range(*components) are exchanged, i.e.
+    (0, 2) for E1, E2 in electrostatic runs, or (0, 3)/(3, 6) for E/B.
+    """
+    exchange = communicate_fields_begin(self, on_fdtd_grid, components)
+    communicate_fields_end(self, exchange, on_fdtd_grid, components)
+
+    return
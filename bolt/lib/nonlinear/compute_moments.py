@@ -4,33 +4,21 @@
 import arrayfire as af
 import numpy as np
 
-def compute_moments(self, moment_name, f=None):
+from .utils.lazy_evaluation import eval_helper
+
+def _get_moment_inputs(self, f = None):
     """
-    Used in computing the moments of the distribution function.
-    The moment definitions which are passed to physical system
-    are used in computing these moment quantities.
+    Returns the distribution function(non-inclusive of the ghost zones
+    in p-space and in double precision), and the p-arrays which are passed
+    to the moment definitions. This is shared by the moments evaluated
+    together in compute_moments and the dump of the moments.
 
     Parameters
     ----------
 
-    moments_name : str
-                   Pass the moment name which needs to be computed.
-                   It must be noted that this needs to be defined by the
-                   user under moments under src and passed to the 
-                   physical_system object.
-    
     f: af.Array
-       Pass this argument as well when you want to compute the 
-       moments of the input array and not the one stored by the state vector
-       of the object.
-
-    Examples
-    --------
-    
-    >> solver.compute_moments('density')
-
-    The above line will lookup the definition for 'density' and calculate the same
-    accordingly
+       When passed, the inputs are prepared for this array instead of
+       the one stored by the state vector of the object.
     """
     N_g_p = self.N_ghost_p
     
@@ -101,11 +89,48 @@ def compute_moments(self, moment_name, f=None):
                            self.N_p1 * self.N_p2 * self.N_p3, 
                            N_q1, N_q2
                           )
+
+    # The moments are accumulated in double precision, irrespective
+    # of the precision in which the distribution function is stored:
+    if(f.dtype() != af.Dtype.f64):
+        f = af.cast(f, af.Dtype.f64)
+
+    return(f, p1, p2, p3)
+
+def compute_moments(self, moment_name, f=None):
+    """
+    Used in computing the moments of the distribution function.
+    The moment definitions which are passed to physical system
+    are used in computing these moment quantities.
+
+    Parameters
+    ----------
+
+    moments_name : str
+                   Pass the moment name which needs to be computed.
+                   It must be noted that this needs to be defined by the
+                   user under moments under src and passed to the 
+                   physical_system object.
+    
+    f: af.Array
+       Pass this argument as well when you want to compute the 
+       moments of the input array and not the one stored by the state vector
+       of the object.
+
+    Examples
+    --------
     
+    >> solver.compute_moments('density')
+
+    The above line will lookup the definition for 'density' and calculate the same
+    accordingly
+    """
+    f, p1, p2, p3 = _get_moment_inputs(self, f)
+
     moment = af.broadcast(getattr(self.physical_system.moments, 
                                   moment_name
                                  ), f, p1, p2, p3, self.dp3 * self.dp2 * self.dp1
                          )
 
-    af.eval(moment)
+    eval_helper(moment)
     return (moment)
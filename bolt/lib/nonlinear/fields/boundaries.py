@@ -3,6 +3,9 @@
 
 import arrayfire as af
 
+from bolt.lib.nonlinear.boundaries import wrap_periodic
+from bolt.lib.nonlinear.utils.host_syncs import host_sync
+
 def apply_shearing_box_bcs_fields(self, boundary, on_fdtd_grid):
     """
     Applies the shearing box boundary conditions along boundary specified 
@@ -29,16 +32,8 @@ def apply_shearing_box_bcs_fields(self, boundary, on_fdtd_grid):
         sheared_coordinates = self.q2_center[:, :, :N_g_q] - q * omega * L_q1 * self.time_elapsed
         
         # Applying periodic boundary conditions to the points which are out of domain:
-        while(af.sum(sheared_coordinates>self.q2_end) != 0):
-            sheared_coordinates = af.select(sheared_coordinates>self.q2_end,
-                                            sheared_coordinates - L_q2,
-                                            sheared_coordinates
-                                           )
-
-        while(af.sum(sheared_coordinates<self.q2_start) != 0):
-            sheared_coordinates = af.select(sheared_coordinates<self.q2_start,
-                                            sheared_coordinates + L_q2,
-                                            sheared_coordinates
+        sheared_coordinates = wrap_periodic(sheared_coordinates,
+                                            self.q2_start, self.q2_end
                                            )
         if(on_fdtd_grid == True):
             # Reordering from (N_p, N_s, N_q1, N_q2) --> (N_q1, N_q2, N_p, N_s)
@@ -72,16 +67,8 @@ def apply_shearing_box_bcs_fields(self, boundary, on_fdtd_grid):
         sheared_coordinates = self.q2_center[:, :, -N_g_q:] + q * omega * L_q1 * self.time_elapsed
 
         # Applying periodic boundary conditions to the points which are out of domain:
-        while(af.sum(sheared_coordinates>self.q2_end) != 0):
-            sheared_coordinates = af.select(sheared_coordinates>self.q2_end,
-                                            sheared_coordinates - L_q2,
-                                            sheared_coordinates
-                                           )
-
-        while(af.sum(sheared_coordinates<self.q2_start) != 0):
-            sheared_coordinates = af.select(sheared_coordinates<self.q2_start,
-                                            sheared_coordinates + L_q2,
-                                            sheared_coordinates
+        sheared_coordinates = wrap_periodic(sheared_coordinates,
+                                            self.q2_start, self.q2_end
                                            )
 
         if(on_fdtd_grid == True):
@@ -118,16 +105,8 @@ def apply_shearing_box_bcs_fields(self, boundary, on_fdtd_grid):
         sheared_coordinates = self.q1_center[:, :, :, :N_g_q] - q * omega * L_q2 * self.time_elapsed
 
         # Applying periodic boundary conditions to the points which are out of domain:
-        while(af.sum(sheared_coordinates>self.q1_end) != 0):
-            sheared_coordinates = af.select(sheared_coordinates>self.q1_end,
-                                            sheared_coordinates - L_q1,
-                                            sheared_coordinates
-                                           )
-
-        while(af.sum(sheared_coordinates<self.q1_start) != 0):
-            sheared_coordinates = af.select(sheared_coordinates<self.q1_start,
-                                            sheared_coordinates + L_q1,
-                                            sheared_coordinates
+        sheared_coordinates = wrap_periodic(sheared_coordinates,
+                                            self.q1_start, self.q1_end
                                            )
 
         if(on_fdtd_grid == True):
@@ -163,16 +142,8 @@ def apply_shearing_box_bcs_fields(self, boundary, on_fdtd_grid):
         sheared_coordinates = self.q1_center[:, :, :, -N_g_q:] + q * omega * L_q2 * self.time_elapsed
 
         # Applying periodic boundary conditions to the points which are out of domain:
-        while(af.sum(sheared_coordinates>self.q1_end) != 0):
-            sheared_coordinates = af.select(sheared_coordinates>self.q1_end,
-                                            sheared_coordinates - L_q1,
-                                            sheared_coordinates
-                                           )
-
-        while(af.sum(sheared_coordinates<self.q1_start) != 0):
-            sheared_coordinates = af.select(sheared_coordinates<self.q1_start,
-                                            sheared_coordinates + L_q1,
-                                            sheared_coordinates
+        sheared_coordinates = wrap_periodic(sheared_coordinates,
+                                            self.q1_start, self.q1_end
                                            )
 
         if(on_fdtd_grid == True):
@@ -601,7 +572,7 @@ def apply_bcs_fields(self, on_fdtd_grid = False):
     af.eval(self.cell_centered_EM_fields)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_apply_bcs_fields += toc - tic
 
@@ -3,17 +3,35 @@
 
 import arrayfire as af
 
-from bolt.lib.nonlinear.communicate import communicate_fields
+from bolt.lib.nonlinear.communicate import communicate_fields_begin, \
+                                           communicate_fields_end
 from ..boundaries import apply_bcs_fields
+from bolt.lib.nonlinear.utils.host_syncs import host_sync
 
-def fdtd_evolve_E(self, dt):
-    
+# Range of the components of E and B in the field arrays:
+_E = (0, 3)
+_B = (3, 6)
+
+def _shifted(indices, shift):
+    # Indices of the neighbours at an offset of shift:
+    return(slice(indices.start + shift, indices.stop + shift))
+
+def fdtd_evolve_E(self, dt, region):
+    """
+    Evolves E over the zones in region = (slice along q1, slice along q2)
+    of the local array(inclusive of the ghost zones). The values of B at
+    (i - 1) and (j - 1) are read for each zone.
+    """
     if(self.performance_test_flag == True):
         tic = af.time()
 
     dq1 = self.dq1
     dq2 = self.dq2
 
+    i, j      = region
+    i_minus_1 = _shifted(i, -1)
+    j_minus_1 = _shifted(j, -1)
+
     B1 = self.yee_grid_EM_fields[3]
     B2 = self.yee_grid_EM_fields[4]
     B3 = self.yee_grid_EM_fields[5]
@@ -22,36 +40,40 @@ def fdtd_evolve_E(self, dt):
     # dE2/dt = - dB3/dq1
     # dE3/dt = dB2/dq1 - dB1/dq2
 
-    B1_shifted_q2 = af.shift(B1, 0, 0, 0, 1)
-
-    B2_shifted_q1 = af.shift(B2, 0, 0, 1, 0)
-
-    B3_shifted_q1 = af.shift(B3, 0, 0, 1, 0)
-    B3_shifted_q2 = af.shift(B3, 0, 0, 0, 1)
-
-    self.yee_grid_EM_fields[0] +=   (dt / dq2) * (B3 - B3_shifted_q2) - self.J1 * dt
-    self.yee_grid_EM_fields[1] +=  -(dt / dq1) * (B3 - B3_shifted_q1) - self.J2 * dt
-    self.yee_grid_EM_fields[2] +=   (dt / dq1) * (B2 - B2_shifted_q1) \
-                                  - (dt / dq2) * (B1 - B1_shifted_q2) \
-                                  - dt * self.J3
+    self.yee_grid_EM_fields[0, :, i, j] +=   (dt / dq2) * (B3[:, :, i, j] - B3[:, :, i, j_minus_1]) \
+                                           - self.J1[:, :, i, j] * dt
+    self.yee_grid_EM_fields[1, :, i, j] +=  -(dt / dq1) * (B3[:, :, i, j] - B3[:, :, i_minus_1, j]) \
+                                           - self.J2[:, :, i, j] * dt
+    self.yee_grid_EM_fields[2, :, i, j] +=   (dt / dq1) * (B2[:, :, i, j] - B2[:, :, i_minus_1, j]) \
+                                           - (dt / dq2) * (B1[:, :, i, j] - B1[:, :, i, j_minus_1]) \
+                                           - dt * self.J3[:, :, i, j]
 
+    # Launching the kernels without waiting for the same:
     af.eval(self.yee_grid_EM_fields)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_fieldsolver += toc - tic
 
     return
 
-def fdtd_evolve_B(self, dt):
-    
+def fdtd_evolve_B(self, dt, region):
+    """
+    Evolves B over the zones in region = (slice along q1, slice along q2)
+    of the local array(inclusive of the ghost zones). The values of E at
+    (i + 1) and (j + 1) are read for each zone.
+    """
     if(self.performance_test_flag == True):
         tic = af.time()
 
     dq1 = self.dq1
     dq2 = self.dq2
 
+    i, j     = region
+    i_plus_1 = _shifted(i, 1)
+    j_plus_1 = _shifted(j, 1)
+
     E1 = self.yee_grid_EM_fields[0]
     E2 = self.yee_grid_EM_fields[1]
     E3 = self.yee_grid_EM_fields[2]
@@ -60,27 +82,91 @@ def fdtd_evolve_B(self, dt):
     # dB2/dt = + dE3/dq1
     # dB3/dt = - (dE2/dq1 - dE1/dq2)
 
-    E1_shifted_q2 = af.shift(E1, 0, 0, 0, -1)
-
-    E2_shifted_q1 = af.shift(E2, 0, 0, -1, 0)
-
-    E3_shifted_q1 = af.shift(E3, 0, 0, -1, 0)
-    E3_shifted_q2 = af.shift(E3, 0, 0, 0, -1)
-
-    self.yee_grid_EM_fields[3] += -(dt / dq2) * (E3_shifted_q2 - E3)
-    self.yee_grid_EM_fields[4] +=  (dt / dq1) * (E3_shifted_q1 - E3)
-    self.yee_grid_EM_fields[5] += - (dt / dq1) * (E2_shifted_q1 - E2) \
-                                  + (dt / dq2) * (E1_shifted_q2 - E1)
+    self.yee_grid_EM_fields[3, :, i, j] += -(dt / dq2) * (E3[:, :, i, j_plus_1] - E3[:, :, i, j])
+    self.yee_grid_EM_fields[4, :, i, j] +=  (dt / dq1) * (E3[:, :, i_plus_1, j] - E3[:, :, i, j])
+    self.yee_grid_EM_fields[5, :, i, j] += - (dt / dq1) * (E2[:, :, i_plus_1, j] - E2[:, :, i, j]) \
+                                           + (dt / dq2) * (E1[:, :, i, j_plus_1] - E1[:, :, i, j])
 
+    # Launching the kernels without waiting for the same:
     af.eval(self.yee_grid_EM_fields)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_fieldsolver += toc - tic
 
     return
 
+def _get_regions(self):
+    """
+    Returns the regions of the local array over which E and B are evolved
+    while the ghost zones are exchanged(interior), and after the same
+    (boundary). The interior regions are those whose stencils don't read
+    the ghost zones which are being exchanged.
+    """
+    N_g = self.N_g
+
+    N_q1_total = self.yee_grid_EM_fields.dims()[2]
+    N_q2_total = self.yee_grid_EM_fields.dims()[3]
+
+    # Bounds of the local zone:
+    i_0, i_1 = N_g, N_q1_total - N_g
+    j_0, j_1 = N_g, N_q2_total - N_g
+
+    # E reads B at (i - 1), (j - 1). The ghost zones of E are
+    # filled in by the exchange which follows its update:
+    E_interior = [(slice(i_0 + 1, i_1), slice(j_0 + 1, j_1))]
+    E_boundary = [(slice(i_0, i_0 + 1), slice(j_0, j_1)),
+                  (slice(i_0 + 1, i_1), slice(j_0, j_0 + 1))
+                 ]
+
+    # B reads E at (i + 1), (j + 1). The ghost zones of B are evolved
+    # as well(except the outermost layer), such that the interpolation
+    # to the cell centered grid which follows has valid values of B:
+    B_interior = [(slice(i_0, i_1 - 1), slice(j_0, j_1 - 1))]
+    B_boundary = [(slice(0, i_0),              slice(0, N_q2_total - 1)),
+                  (slice(i_1 - 1, N_q1_total - 1), slice(0, N_q2_total - 1)),
+                  (slice(i_0, i_1 - 1),        slice(0, j_0)),
+                  (slice(i_0, i_1 - 1),        slice(j_1 - 1, N_q2_total - 1))
+                 ]
+
+    return(E_interior, E_boundary, B_interior, B_boundary)
+
+def _fdtd_update_E(self, dt):
+    """
+    Exchanges the ghost zones of B and evolves E by dt, with the update
+    of the interior zones overlapping with the exchange.
+    """
+    E_interior, E_boundary, B_interior, B_boundary = _get_regions(self)
+
+    exchange = communicate_fields_begin(self, True, _B)
+    for region in E_interior:
+        fdtd_evolve_E(self, dt, region)
+    communicate_fields_end(self, exchange, True, _B)
+    apply_bcs_fields(self, True)
+
+    for region in E_boundary:
+        fdtd_evolve_E(self, dt, region)
+
+    return
+
+def _fdtd_update_B(self, dt):
+    """
+    Exchanges the ghost zones of E and evolves B by dt, with the update
+    of the interior zones overlapping with the exchange.
+    """
+    E_interior, E_boundary, B_interior, B_boundary = _get_regions(self)
+
+    exchange = communicate_fields_begin(self, True, _E)
+    for region in B_interior:
+        fdtd_evolve_B(self, dt, region)
+    communicate_fields_end(self, exchange, True, _E)
+    apply_bcs_fields(self, True)
+
+    for region in B_boundary:
+        fdtd_evolve_B(self, dt, region)
+
+    return
 
 def fdtd(self, dt):
     """
@@ -100,6 +186,12 @@ def fdtd(self, dt):
     J1 --> (i + 1/2, j)
     J2 --> (i, j + 1/2)
     J3 --> (i, j)
+
+    Before each update, only the components which are read from the ghost
+    zones are exchanged(B before evolving E, E before evolving B). The
+    update of the zones which don't depend on the ghost zones is queued on
+    the device between the start and the end of the exchange, so that it
+    overlaps with the communication between the ranks.
     
     Parameters
     ----------
@@ -107,16 +199,61 @@ def fdtd(self, dt):
     dt : double
          Time-step size to evolve the system
     """
-
-    # The communicate function transfers the data from the 
-    # local vectors to the global vectors, in addition to  
-    # dealing with periodic boundary conditions:
-    communicate_fields(self, True)
-    apply_bcs_fields(self, True)
-    fdtd_evolve_E(self, dt)
-    
-    communicate_fields(self, True)
-    apply_bcs_fields(self, True)
-    fdtd_evolve_B(self, dt)
+    _fdtd_update_E(self, dt)
+    _fdtd_update_B(self, dt)
     
     return
+
+def fdtd_subcycled(self, dt, N_subcycles, J_previous = None):
+    """
+    Evolves the EM fields by dt using N_subcycles FDTD steps of dt / N_subcycles,
+    such that the CFL condition of the light waves doesn't limit the timestep
+    used for the distribution function.
+
+    The currents(self.J1, self.J2, self.J3) are at (n + 1/2). When the currents
+    at (n - 1/2) are passed as J_previous, the currents at the middle of each
+    substep are interpolated linearly in time. Otherwise, they're held fixed.
+
+    B is moved from (n + 1/2) to the first half-substep at the start, and back
+    to (n + 3/2) at the end, such that the staggering between E and B is
+    that of a single FDTD step outside this routine, while each of the
+    substeps is time centered.
+
+    Parameters
+    ----------
+
+    dt : double
+         Time-step size to evolve the system
+
+    N_subcycles : int
+                  Number of FDTD substeps taken.
+
+    J_previous : tuple
+                 (J1, J2, J3) on the Yee grid at (n - 1/2).
+    """
+    if(N_subcycles == 1):
+        fdtd(self, dt)
+        return
+
+    dt_sub = dt / N_subcycles
+    J_now  = (self.J1, self.J2, self.J3)
+
+    # B: (n + 1/2) --> (n + 1/(2 N)) using E at n:
+    _fdtd_update_B(self, -0.5 * (dt - dt_sub))
+
+    for substep in range(N_subcycles):
+        if(J_previous is not None):
+            # Time at the middle of the substep relative to (n + 1/2), in units of dt:
+            tau = (substep + 0.5) / N_subcycles - 0.5
+
+            self.J1, self.J2, self.J3 = [J + tau * (J - J_old)
+                                         for (J, J_old) in zip(J_now, J_previous)
+                                        ]
+
+        fdtd(self, dt_sub)
+
+    # B: (n + 1 + 1/(2 N)) --> (n + 3/2) using E at (n + 1):
+    _fdtd_update_B(self, 0.5 * (dt - dt_sub))
+
+    self.J1, self.J2, self.J3 = J_now
+    return
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Contains the routines used when the fields solver is declared with
+fields_solver = 'ampere'. Instead of solving the Poisson equation at each
+step, the electrostatic fields are evolved using Ampere's law without the
+magnetic field:
+
+dE1/dt = -J1
+dE2/dt = -J2
+
+This only needs the current moments and the exchange of the boundary zones,
+avoiding the global solve. Through the continuity equation, this preserves
+Gauss's law up to the errors in the moments and truncation, which are
+removed by solving the Poisson equation(using the multigrid solver) every
+params.ampere_cleanup_interval calls(10 when not defined in params).
+
+For periodic boundaries, the mean of E isn't set by Gauss's law, and is
+zero in the solutions of the Poisson equation. The mean of the current
+over the domain is then removed in the update, so that the mean of E
+doesn't drift away from that of the clean-up solves.
+"""
+
+import numpy as np
+import arrayfire as af
+from mpi4py import MPI
+
+from bolt.lib.nonlinear.communicate import communicate_fields
+from ..boundaries import apply_bcs_fields
+from bolt.lib.nonlinear.utils.host_syncs import host_sync, record_host_sync
+
+def ampere_cleanup_due(self):
+    """
+    Returns True when the fields need to be obtained by solving the
+    Poisson equation in place of the Ampere update, on the first call
+    and every ampere_cleanup_interval calls after the same.
+    """
+    interval = getattr(self.params, 'ampere_cleanup_interval', 10)
+    due      = (self._ampere_calls % interval == 0)
+
+    self._ampere_calls += 1
+    return(due)
+
+def evolve_electrostatic_fields_ampere(self, J1, J2, dt):
+    """
+    Evolves E1, E2 using Ampere's law.
+
+    Parameters
+    ----------
+
+    J1 : af.Array
+         Array which contains the J1 current for each species.
+
+    J2 : af.Array
+         Array which contains the J2 current for each species.
+
+    dt: double
+        Timestep size
+    """
+    if(self.performance_test_flag == True):
+        tic = af.time()
+
+    N_g = self.N_g
+
+    # Summing for all the species:
+    J1 = af.sum(J1[:, :, N_g:-N_g, N_g:-N_g], 1)
+    J2 = af.sum(J2[:, :, N_g:-N_g, N_g:-N_g], 1)
+
+    # Removing the mean of the currents over the domain(see the notes above):
+    if(    self.boundary_conditions.in_q1_left   == 'periodic'
+       and self.boundary_conditions.in_q2_bottom == 'periodic'
+      ):
+        J_sum = np.array([af.sum(J1), af.sum(J2), J1.elements()], dtype = np.float64)
+        record_host_sync(self, 'evolve_electrostatic_fields_ampere')
+
+        J_sum = self._comm.allreduce(J_sum, op = MPI.SUM)
+
+        J1 = J1 - J_sum[0] / J_sum[2]
+        J2 = J2 - J_sum[1] / J_sum[2]
+
+    self.cell_centered_EM_fields[0, 0, N_g:-N_g, N_g:-N_g] -= dt * J1
+    self.cell_centered_EM_fields[1, 0, N_g:-N_g, N_g:-N_g] -= dt * J2
+
+    af.eval(self.cell_centered_EM_fields)
+
+    if(self.performance_test_flag == True):
+        host_sync(self, 'performance_timing')
+        toc = af.time()
+        self.time_fieldsolver += toc - tic
+
+    communicate_fields(self, components = (0, 2))
+    apply_bcs_fields(self)
+
+    # Dropping the products with q/m held by get_lorentz_fields:
+    self._lorentz_fields = {}
+
+    return
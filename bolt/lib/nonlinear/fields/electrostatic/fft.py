@@ -5,6 +5,34 @@ import arrayfire as af
 import numpy as np
 
 from bolt.lib.nonlinear.utils.broadcasted_primitive_operations import multiply
+from bolt.lib.nonlinear.utils.host_syncs import host_sync
+
+def initialize_fft_poisson(self):
+    """
+    Precomputes the multipliers which give (E1_hat, E2_hat) from rho_hat,
+    i.e. the gradient of the inverse of the Laplacian in Fourier space.
+    These are held as an array of shape (N_q1, N_q2, 2) on the device, so
+    that each call to fft_poisson performs no host work or transfers.
+    """
+    k_q1 = np.fft.fftfreq(self.N_q1, self.dq1)
+    k_q2 = np.fft.fftfreq(self.N_q2, self.dq2)
+
+    k_q2, k_q1 = np.meshgrid(k_q2, k_q1)
+
+    k_squared       = k_q1**2 + k_q2**2
+    k_squared[0, 0] = 1 # Avoiding division by zero
+
+    # potential_hat = rho_hat / (4 pi^2 k^2), E_hat = -i 2 pi k potential_hat:
+    inverse_laplacian       = 1 / (4 * np.pi**2 * k_squared)
+    inverse_laplacian[0, 0] = 0
+
+    multipliers = np.stack([-1j * 2 * np.pi * k_q1 * inverse_laplacian,
+                            -1j * 2 * np.pi * k_q2 * inverse_laplacian
+                           ], axis = 2
+                          )
+
+    self._fft_poisson_multipliers = af.to_array(multipliers)
+    return
 
 def fft_poisson(self, rho):
     """
@@ -13,6 +41,9 @@ def fft_poisson(self, rho):
     (ie. used on a single node) with periodic boundary
     conditions.
 
+    The multipliers are computed once by initialize_fft_poisson, and
+    E1, E2 are obtained from a single batched inverse transform.
+
     Parameters
     ----------
 
@@ -29,42 +60,31 @@ def fft_poisson(self, rho):
     else:
 
         N_g = self.N_g
+
+        if(getattr(self, '_fft_poisson_multipliers', None) is None):
+            initialize_fft_poisson(self)
             
         # Reorder from (1, N_s, N_q1, N_q2) --> (N_q1, N_q2, 1, N_s) 
         rho = af.reorder(rho[:, :, N_g:-N_g, N_g:-N_g] , 2, 3, 0, 1)
         # Summing for all the species:
         rho = af.sum(rho, 3)
 
-        k_q1 = np.fft.fftfreq(rho.shape[0], self.dq1)
-        k_q2 = np.fft.fftfreq(rho.shape[1], self.dq2)
-
-        k_q2, k_q1 = np.meshgrid(k_q2, k_q1)
-
-        k_q1 = af.to_array(k_q1)
-        k_q2 = af.to_array(k_q2)
-
         rho_hat = af.fft2(rho)
 
-        potential_hat       = rho_hat / (4 * np.pi**2 * (k_q1**2 + k_q2**2))
-        potential_hat[0, 0] = 0
-
-        E1_hat = -1j * 2 * np.pi * k_q1 * potential_hat
-        E2_hat = -1j * 2 * np.pi * k_q2 * potential_hat
+        # (N_q1, N_q2, 2) holding (E1_hat, E2_hat), which are transformed
+        # as a batch(af.ifft2 scales by 1 / (N_q1 * N_q2) by default):
+        E_hat = multiply(self._fft_poisson_multipliers, rho_hat)
+        E     = af.real(af.ifft2(E_hat))
 
         # Non-inclusive of ghost-zones:
-        E1_ifft = af.ifft2(E1_hat, scale=1)/(E1_hat.shape[0] * E1_hat.shape[1])
-        E2_ifft = af.ifft2(E2_hat, scale=1)/(E2_hat.shape[0] * E2_hat.shape[1])
-        
-        E1_physical = af.reorder(af.real(E1_ifft), 2, 3, 0, 1)
-        E2_physical = af.reorder(af.real(E2_ifft), 2, 3, 0, 1)
-
-        self.cell_centered_EM_fields[0, 0, N_g:-N_g, N_g:-N_g] = E1_physical
-        self.cell_centered_EM_fields[1, 0, N_g:-N_g, N_g:-N_g] = E2_physical
+        # (N_q1, N_q2, 2) --> (2, 1, N_q1, N_q2)
+        self.cell_centered_EM_fields[:2, 0, N_g:-N_g, N_g:-N_g] = \
+            af.reorder(E, 2, 3, 0, 1)
 
         af.eval(self.cell_centered_EM_fields)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_fieldsolver += toc - tic
     
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Contains the parallel Poisson solver, which is used when the fields solver
+is declared with fields_solver = 'multigrid'(or fields_initialize = 'multigrid').
+
+The equation -laplacian(phi) = rho is discretized using the 5-point stencil
+on a DMDA of dof = 1 which is duplicated from _da_fields, such that the
+domain decomposition is the same as that used for f and the EM fields. This
+is solved using PETSc's KSP(CG by default) preconditioned by geometric
+multigrid(PCMG), where the coarse grids are obtained by coarsening the DMDA.
+The electric fields are then obtained as E = -grad(phi) using central
+differences.
+
+The boundary conditions for phi follow those in the boundary_conditions
+module:
+
+- periodic         : the operator is singular, and the constant nullspace
+                     is attached to it.
+- mirror           : dphi/dn = 0 at the wall, such that E_n = 0.
+- dirichlet        : phi = phi_<boundary> at the wall(conducting walls), where
+- mirror+dirichlet   phi_left, phi_right, phi_bottom, phi_top may be defined as
+                     constants in the boundary_conditions module(default 0).
+
+Since phi is held between calls, each solve starts from the potential of
+the previous solve, which takes a V-cycle or two to converge when the
+charge density changes little between calls. When a solve fails to 
+converge(or gives a non-finite phi), it is repeated starting from phi = 0.
+
+The options of the KSP may be changed at runtime using the prefix poisson_,
+for instance -poisson_ksp_rtol 1e-10 -poisson_ksp_monitor.
+"""
+
+import arrayfire as af
+import numpy as np
+from petsc4py import PETSc
+
+from bolt.lib.nonlinear.utils.host_syncs import host_sync, record_host_sync
+
+def _get_mg_levels(self):
+    """
+    Returns the number of multigrid levels used. The grid is coarsened
+    while the number of zones along each direction is divisible by 2,
+    and each rank holds at least 2 zones along each direction.
+    """
+    nproc_in_q1, nproc_in_q2 = self._da_fields.getProcSizes()
+
+    N_q1_local_min = self.N_q1 // nproc_in_q1
+    N_q2_local_min = self.N_q2 // nproc_in_q2
+
+    N_levels = 1
+    while(    self.N_q1 % 2**N_levels == 0
+          and self.N_q2 % 2**N_levels == 0
+          and min(N_q1_local_min, N_q2_local_min) // 2**N_levels >= 2
+         ):
+        N_levels += 1
+
+    return(N_levels)
+
+def _get_poisson_bcs(self):
+    """
+    Returns the type of the boundary condition for phi('periodic',
+    'neumann' or 'dirichlet') and the potential at the wall for each
+    of the boundaries.
+    """
+    bcs = {}
+    for boundary, bc in [('left',   self.boundary_conditions.in_q1_left),
+                         ('right',  self.boundary_conditions.in_q1_right),
+                         ('bottom', self.boundary_conditions.in_q2_bottom),
+                         ('top',    self.boundary_conditions.in_q2_top)
+                        ]:
+        if(bc == 'periodic'):
+            bcs[boundary] = ('periodic', 0)
+
+        elif(bc == 'mirror'):
+            bcs[boundary] = ('neumann', 0)
+
+        elif(bc == 'dirichlet' or bc == 'mirror+dirichlet'):
+            bcs[boundary] = ('dirichlet',
+                             getattr(self.boundary_conditions, 'phi_' + boundary, 0)
+                            )
+
+        else:
+            raise NotImplementedError('The multigrid Poisson solver is not '
+                                      'implemented for ' + bc + ' boundaries'
+                                     )
+
+    return(bcs)
+
+def _assemble_poisson_operator(self):
+    """
+    Returns the matrix for -laplacian(phi) discretized using the 5-point
+    stencil on the zones of the local domain, along with the array holding
+    the contributions of the dirichlet boundaries to the RHS.
+
+    Since phi is cell centered, the walls lie half a zone away from the
+    boundary zones. The ghost value is eliminated using phi_ghost = phi_0
+    for neumann boundaries and phi_ghost = 2 * phi_wall - phi_0 for
+    dirichlet boundaries.
+    """
+    A = self._da_poisson.createMatrix()
+
+    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_poisson.getCorners()
+
+    bc_rhs = np.zeros([N_q1_local, N_q2_local])
+
+    row = PETSc.Mat.Stencil()
+    col = PETSc.Mat.Stencil()
+
+    stencil = [((-1,  0), 1 / self.dq1**2, 'left'),
+               (( 1,  0), 1 / self.dq1**2, 'right'),
+               (( 0, -1), 1 / self.dq2**2, 'bottom'),
+               (( 0,  1), 1 / self.dq2**2, 'top')
+              ]
+
+    for j in range(i_q2_start, i_q2_start + N_q2_local):
+        for i in range(i_q1_start, i_q1_start + N_q1_local):
+            row.index = (i, j)
+            diagonal  = 0
+
+            for ((di, dj), coefficient, boundary) in stencil:
+                bc, phi_wall = self._poisson_bcs[boundary]
+                diagonal    += coefficient
+
+                outside = (   i + di < 0 or i + di >= self.N_q1
+                           or j + dj < 0 or j + dj >= self.N_q2
+                          )
+
+                # The neighbours outside the domain are wrapped around
+                # by the DMDA for periodic boundaries:
+                if(outside == False or bc == 'periodic'):
+                    col.index = (i + di, j + dj)
+                    A.setValueStencil(row, col, -coefficient)
+
+                elif(bc == 'neumann'):
+                    diagonal -= coefficient
+
+                else:
+                    diagonal += coefficient
+                    bc_rhs[i - i_q1_start, j - i_q2_start] += \
+                        2 * coefficient * phi_wall
+
+            col.index = (i, j)
+            A.setValueStencil(row, col, diagonal)
+
+    A.assemble()
+    return(A, bc_rhs)
+
+def initialize_ksp_poisson(self):
+    """
+    Sets up the DMDA, operator, vectors and KSP used by ksp_poisson.
+    This is called once when the fields solver is declared.
+    """
+    self._poisson_bcs = _get_poisson_bcs(self)
+
+    # Same decomposition as _da_fields, holding only phi:
+    self._da_poisson = self._da_fields.duplicate(dof = 1, stencil_width = 1)
+
+    # For non-periodic boundaries, the DMDA coarsens vertex centered grids
+    # by default(N --> (N - 1) / 2 + 1). Cell centered coarsening(N --> N / 2)
+    # is used instead by taking piecewise constant interpolation:
+    if(any(bc != 'periodic' for (bc, phi_wall) in self._poisson_bcs.values())):
+        self._da_poisson.setInterpolationType(PETSc.DMDA.InterpolationType.Q0)
+
+    self._poisson_A, bc_rhs = _assemble_poisson_operator(self)
+
+    # phi is determined up to a constant when none of the boundaries are dirichlet:
+    if(all(bc != 'dirichlet' for (bc, phi_wall) in self._poisson_bcs.values())):
+        self._poisson_nullspace = PETSc.NullSpace().create(constant = True,
+                                                           comm = self._da_poisson.getComm()
+                                                          )
+        self._poisson_A.setNullSpace(self._poisson_nullspace)
+
+    else:
+        self._poisson_nullspace = None
+
+    self._poisson_rho       = self._da_poisson.createGlobalVec()
+    self._poisson_phi       = self._da_poisson.createGlobalVec()
+    self._poisson_local_phi = self._da_poisson.createLocalVec()
+
+    self._poisson_rho_array       = self._poisson_rho.getArray()
+    self._poisson_local_phi_array = self._poisson_local_phi.getArray()
+
+    # Contributions of the dirichlet boundaries to the RHS(ordered with q1 fastest):
+    self._poisson_bc_rhs = self._da_poisson.createGlobalVec()
+    self._poisson_bc_rhs.getArray()[:] = bc_rhs.ravel(order = 'F')
+
+    # Defaults which may be overridden from the command line:
+    options  = PETSc.Options('poisson_')
+    defaults = {'ksp_type'                   : 'cg',
+                'pc_type'                    : 'mg',
+                'pc_mg_levels'               : _get_mg_levels(self),
+                'pc_mg_galerkin'             : 'both',
+                'mg_levels_ksp_type'         : 'richardson',
+                'mg_levels_pc_type'          : 'jacobi',
+                'mg_coarse_pc_type'          : 'redundant',
+                'mg_coarse_redundant_pc_type': 'svd'
+               }
+
+    for key, value in defaults.items():
+        if(options.hasName(key) == False):
+            options.setValue(key, value)
+
+    self._poisson_ksp = PETSc.KSP().create(self._da_poisson.getComm())
+    self._poisson_ksp.setOptionsPrefix('poisson_')
+    # The DMDA is only used in constructing the coarse grids:
+    self._poisson_ksp.setDM(self._da_poisson)
+    self._poisson_ksp.setDMActive(False)
+    self._poisson_ksp.setOperators(self._poisson_A)
+    # Warm start from the potential of the previous solve:
+    self._poisson_ksp.setInitialGuessNonzero(True)
+    self._poisson_ksp.setFromOptions()
+    self._poisson_ksp.setUp()
+
+    return
+
+def ksp_poisson(self, rho):
+    """
+    Solves the Poisson Equation using KSP with a multigrid preconditioner,
+    and assigns E1, E2 = -grad(phi) to the cell centered fields. Can be
+    used in parallel.
+
+    Parameters
+    ----------
+
+    rho : af.Array
+          Array that holds the charge density for each species
+    """
+    if(self.performance_test_flag == True):
+        tic = af.time()
+
+    N_g = self.N_g
+
+    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_poisson.getCorners()
+
+    # Summing for all the species:
+    rho = af.sum(af.cast(rho[:, :, N_g:-N_g, N_g:-N_g], af.Dtype.f64), 1)
+    af.flat(rho).to_ndarray(self._poisson_rho_array)
+    record_host_sync(self, 'ksp_poisson')
+
+    self._poisson_rho.axpy(1, self._poisson_bc_rhs)
+
+    # Only the component orthogonal to the nullspace has a solution, which
+    # amounts to the neutralizing background for periodic boundaries:
+    if(self._poisson_nullspace is not None):
+        self._poisson_nullspace.remove(self._poisson_rho)
+
+    self._poisson_ksp.solve(self._poisson_rho, self._poisson_phi)
+
+    # The potential of a failed solve isn't used as the initial guess, which
+    # would otherwise carry NaNs into all the following solves. The solve is
+    # then repeated starting from phi = 0:
+    if(   self._poisson_ksp.getConvergedReason() < 0
+       or not np.isfinite(self._poisson_phi.norm())
+      ):
+        self._poisson_phi.set(0)
+        self._poisson_ksp.solve(self._poisson_rho, self._poisson_phi)
+
+    if(self._poisson_ksp.getConvergedReason() < 0):
+        PETSc.Sys.Print('Poisson solver did not converge: reason',
+                        self._poisson_ksp.getConvergedReason()
+                       )
+
+    self._da_poisson.globalToLocal(self._poisson_phi, self._poisson_local_phi)
+
+    phi = af.moddims(af.to_array(self._poisson_local_phi_array),
+                     N_q1_local + 2, N_q2_local + 2
+                    )
+
+    # Filling the ghost zones at the walls which aren't periodic:
+    for (boundary, at_boundary, ghost, interior) in \
+        [('left',   i_q1_start == 0,                       (0, slice(None)),  (1, slice(None))),
+         ('right',  i_q1_start + N_q1_local == self.N_q1,  (-1, slice(None)), (-2, slice(None))),
+         ('bottom', i_q2_start == 0,                       (slice(None), 0),  (slice(None), 1)),
+         ('top',    i_q2_start + N_q2_local == self.N_q2,  (slice(None), -1), (slice(None), -2))
+        ]:
+        bc, phi_wall = self._poisson_bcs[boundary]
+
+        if(at_boundary == True and bc == 'neumann'):
+            phi[ghost] = phi[interior]
+
+        elif(at_boundary == True and bc == 'dirichlet'):
+            phi[ghost] = 2 * phi_wall - phi[interior]
+
+    E1 = -(phi[2:, 1:-1] - phi[:-2, 1:-1]) / (2 * self.dq1)
+    E2 = -(phi[1:-1, 2:] - phi[1:-1, :-2]) / (2 * self.dq2)
+
+    self.cell_centered_EM_fields[0, 0, N_g:-N_g, N_g:-N_g] = \
+        af.moddims(E1, 1, 1, N_q1_local, N_q2_local)
+    self.cell_centered_EM_fields[1, 0, N_g:-N_g, N_g:-N_g] = \
+        af.moddims(E2, 1, 1, N_q1_local, N_q2_local)
+
+    af.eval(self.cell_centered_EM_fields)
+
+    if(self.performance_test_flag == True):
+        host_sync(self, 'performance_timing')
+        toc = af.time()
+        self.time_fieldsolver += toc - tic
+
+    return
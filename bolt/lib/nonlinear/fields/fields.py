@@ -7,15 +7,45 @@ import numpy as np
 from petsc4py import PETSc
 
 from .. import communicate
+from ..utils.broadcasted_primitive_operations import multiply
+from ..utils.rhs_blocks import slice_q2_window
 from .boundaries import apply_bcs_fields
 
-from .electrostatic.fft import fft_poisson
-from .electrodynamic.fdtd_explicit import fdtd
+from .electrostatic.fft import initialize_fft_poisson, fft_poisson
+from .electrostatic.multigrid import initialize_ksp_poisson, ksp_poisson
+from .electrostatic import ampere
+from .electrodynamic.fdtd_explicit import fdtd, fdtd_subcycled
+
+# Weights of the stencils which interpolate between the cell centered grid
+# and the Yee grid, for each of the components(E1, E2, E3, B1, B2, B3). The
+# rows are the weights of the values at (i, j), (i +/- 1, j), (i, j +/- 1) and
+# (i +/- 1, j +/- 1), with + used when interpolating to the Yee grid, and -
+# when interpolating from the Yee grid to the cell centers:
+_yee_grid_weights = np.array([[0.5,  0,    0.5,  0   ],
+                              [0.5,  0.5,  0,    0   ],
+                              [0.25, 0.25, 0.25, 0.25],
+                              [0.5,  0.5,  0,    0   ],
+                              [0.5,  0,    0.5,  0   ],
+                              [1,    0,    0,    0   ]
+                             ]).T
+
+def _yee_stencil(fields, weights, shift):
+    """
+    Returns the weighted sum of the shifted values of all the components
+    of fields as a single expression, which is evaluated by ArrayFire as
+    a single kernel over the array holding the components.
+    """
+    return(  multiply(weights[0], fields)
+           + multiply(weights[1], af.shift(fields, 0, 0, shift, 0))
+           + multiply(weights[2], af.shift(fields, 0, 0, 0, shift))
+           + multiply(weights[3], af.shift(fields, 0, 0, shift, shift))
+          )
 
 class fields_solver(object):
     
     def __init__(self, N_q1, N_q2, N_g, q1, q2, dq1, dq2, comm, boundary_conditions, params,
-                 rho_initial, performance_test_flag, initialize_E = None, initialize_B = None
+                 rho_initial, performance_test_flag, initialize_E = None, initialize_B = None,
+                 memory_lean = False
                 ):
         """
         Constructor for the fields_solver object, which takes in relevant 
@@ -74,6 +104,12 @@ class fields_solver(object):
         initialize_B: func
                       Functions which can be used to initialize the values for
                       magnetic fields
+
+        memory_lean: bool
+                     When True, the arrays which are used only by the FDTD solver
+                     (yee_grid_EM_fields, cell_centered_EM_fields_at_n and 
+                     cell_centered_EM_fields_at_n_plus_half) aren't held when the
+                     fields are not evolved using FDTD.
         """
 
         self.N_q1 = N_q1
@@ -88,6 +124,9 @@ class fields_solver(object):
 
         self._comm = comm
 
+        # Number of host syncs made at each site(shared with the nonlinear solver):
+        self._host_syncs = {}
+
         self.boundary_conditions = boundary_conditions
         self.params              = params
 
@@ -98,6 +137,11 @@ class fields_solver(object):
         
         self.initialize_E = initialize_E
         self.initialize_B = initialize_B
+
+        # Flag which determines if the arrays used by FDTD are held:
+        self._fdtd_arrays_held = (   memory_lean == False
+                                  or self.params.fields_solver == 'fdtd'
+                                 )
         
         petsc_bc_in_q1 = 'ghosted'
         petsc_bc_in_q2 = 'ghosted'
@@ -155,10 +199,53 @@ class fields_solver(object):
         self._local_fields_array = self._local_fields.getArray()
 
         PETSc.Object.setName(self._glob_fields, 'EM_fields')
+
+        # Weights of the interpolations between the cell centered grid and
+        # the Yee grid, held on the device as (6, 1, 1, 1) arrays:
+        self._yee_grid_weights = [af.to_array(weights.copy()) 
+                                  for weights in _yee_grid_weights
+                                 ]
+
+        # Flag which is set when the fields on the Yee grid have been evolved
+        # and the cell centered fields are yet to be recomputed from them:
+        self._cell_centered_stale = False
+
+        # Currents on the Yee grid at the previous timestep, which are
+        # held when FDTD is sub-cycled(params.fdtd_subcycles > 1):
+        self._J_previous = None
+
+        # Vectors used in exchanging the ghost zones of subsets of the
+        # field components(see communicate_fields), created when needed:
+        self._halo_exchanges = {}
         
         # Alternating upon each call to get_fields for FVM:
         # This ensures that the fields are staggerred correctly in time:
         self.at_n = True
+
+        # Window along q2 of the fields returned by get_fields. This is set
+        # by the solver when the RHS is evaluated over blocks of the zone:
+        self._q2_window = None
+
+        # q/m for each of the species(along axis 1), and the products of the
+        # same with the fields, which are held until the fields are next
+        # updated(see get_lorentz_fields):
+        self._charge_by_mass = params.charge / params.mass
+        self._lorentz_fields = {}
+
+        # Precomputing the multipliers used by the FFT solver(serial only):
+        self._fft_poisson_multipliers = None
+        if(self.params.fields_initialize == 'fft' and self._comm.size == 1):
+            initialize_fft_poisson(self)
+
+        # Setting up the parallel Poisson solver when it's used(including
+        # the clean-up solves made when the fields are evolved using Ampere's law):
+        if(   self.params.fields_solver in ['multigrid', 'ampere']
+           or self.params.fields_initialize == 'multigrid'
+          ):
+            initialize_ksp_poisson(self)
+
+        # Number of calls made to ampere_cleanup_due:
+        self._ampere_calls = 0
         
         self._initialize(rho_initial)
     
@@ -188,27 +275,33 @@ class fields_solver(object):
                                                    dtype=af.Dtype.f64
                                                   )
 
-        # Field values at n-th timestep:
-        self.cell_centered_EM_fields_at_n = af.constant(0, 6, 1, 
-                                                        N_q1_local + 2 * self.N_g,
-                                                        N_q2_local + 2 * self.N_g,
-                                                        dtype=af.Dtype.f64
-                                                       )
-
-
-        # Field values at (n+1/2)-th timestep:
-        self.cell_centered_EM_fields_at_n_plus_half = af.constant(0, 6, 1, 
-                                                                  N_q1_local + 2 * self.N_g,
-                                                                  N_q2_local + 2 * self.N_g,
-                                                                  dtype=af.Dtype.f64
-                                                                 )
-
-        # Declaring the arrays which store data on the yee grid for FDTD:
-        self.yee_grid_EM_fields = af.constant(0, 6, 1, 
-                                              N_q1_local + 2 * self.N_g,
-                                              N_q2_local + 2 * self.N_g,
-                                              dtype=af.Dtype.f64
-                                             )
+        if(self._fdtd_arrays_held == True):
+            # Field values at n-th timestep:
+            self.cell_centered_EM_fields_at_n = af.constant(0, 6, 1, 
+                                                            N_q1_local + 2 * self.N_g,
+                                                            N_q2_local + 2 * self.N_g,
+                                                            dtype=af.Dtype.f64
+                                                           )
+
+
+            # Field values at (n+1/2)-th timestep:
+            self.cell_centered_EM_fields_at_n_plus_half = af.constant(0, 6, 1, 
+                                                                      N_q1_local + 2 * self.N_g,
+                                                                      N_q2_local + 2 * self.N_g,
+                                                                      dtype=af.Dtype.f64
+                                                                     )
+
+            # Declaring the arrays which store data on the yee grid for FDTD:
+            self.yee_grid_EM_fields = af.constant(0, 6, 1, 
+                                                  N_q1_local + 2 * self.N_g,
+                                                  N_q2_local + 2 * self.N_g,
+                                                  dtype=af.Dtype.f64
+                                                 )
+
+        else:
+            self.cell_centered_EM_fields_at_n           = None
+            self.cell_centered_EM_fields_at_n_plus_half = None
+            self.yee_grid_EM_fields                     = None
 
         if(self.params.fields_type == 'user-defined'):
             try:
@@ -220,7 +313,12 @@ class fields_solver(object):
         
         if (self.params.fields_initialize == 'fft'):
             fft_poisson(self, rho_initial)
-            communicate.communicate_fields(self)
+            communicate.communicate_fields(self, components = (0, 2))
+            apply_bcs_fields(self)
+
+        elif (self.params.fields_initialize == 'multigrid'):
+            ksp_poisson(self, rho_initial)
+            communicate.communicate_fields(self, components = (0, 2))
             apply_bcs_fields(self)
 
         elif (self.nls.physical_system.params.fields_initialize == 'user-defined'):
@@ -236,106 +334,152 @@ class fields_solver(object):
                                                self.params
                                               )
 
+                self.cell_centered_EM_fields = af.join(0, E1, E2, E3, af.join(0, B1, B2, B3))
+
             else:
+                self._initialize_user_defined_fields()
+        
+        else:
+            raise NotImplementedError('Method not valid/not implemented')
 
-                E1, E2, E3 = self.params.user_defined_E(self.q1,
-                                                        self.q2,
-                                                        0
-                                                       )
+        if(self._fdtd_arrays_held == True):
+            self.cell_centered_grid_to_yee_grid()
+            
+            # At t = 0, we take the value of B_{0} = B{1/2}:
+            self.cell_centered_EM_fields_at_n = self.cell_centered_EM_fields
+            self.cell_centered_EM_fields_at_n_plus_half = self.cell_centered_EM_fields
 
-                B1, B2, B3 = self.params.user_defined_B(self.q1,
-                                                        self.q2,
-                                                        0
-                                                       )
+        # The magnetic fields aren't evolved for electrostatic runs. When these
+        # are zero, the force doesn't depend on the velocity(see A_p):
+        if(self.params.fields_type == 'electrostatic'):
+            self.magnetic_fields_vanish = \
+                (af.max(af.abs(self.cell_centered_EM_fields[3:])) == 0)
 
-            self.cell_centered_EM_fields = af.join(0, E1, E2, E3, af.join(0, B1, B2, B3))
-        
         else:
-            raise NotImplementedError('Method not valid/not implemented')
+            self.magnetic_fields_vanish = False
 
-        self.cell_centered_grid_to_yee_grid()
-        
-        # At t = 0, we take the value of B_{0} = B{1/2}:
-        self.cell_centered_EM_fields_at_n = self.cell_centered_EM_fields
-        self.cell_centered_EM_fields_at_n_plus_half = self.cell_centered_EM_fields
+    def _sync_cell_centered_fields(self):
+        """
+        Recomputes the cell centered fields from the fields on the Yee grid
+        when these have been evolved since the last call. This is done when
+        the cell centered fields are read(see the properties below).
+        """
+        if(self._cell_centered_stale == True):
+            self._cell_centered_stale = False
+            self.yee_grid_to_cell_centered_grid()
 
-    def cell_centered_grid_to_yee_grid(self):
+            # Here
+            # cell_centered_EM_fields[:3] is at n+1
+            # cell_centered_EM_fields[3:] is at n+3/2
+
+            self._cell_centered_EM_fields_at_n_plus_half[:3] = \
+                0.5 * (  self.cell_centered_EM_fields_at_n[:3] 
+                       + self._cell_centered_EM_fields[:3]
+                      )
 
-        E1 = self.cell_centered_EM_fields[0]
-        E2 = self.cell_centered_EM_fields[1]
-        E3 = self.cell_centered_EM_fields[2]
+            self._lorentz_fields = {}
 
-        B1 = self.cell_centered_EM_fields[3]
-        B2 = self.cell_centered_EM_fields[4]
-        B3 = self.cell_centered_EM_fields[5]
+        return
 
-        self.yee_grid_EM_fields[0] = 0.5 * (E1 + af.shift(E1, 0, 0, 0, 1))  # (i+1/2, j)
-        self.yee_grid_EM_fields[1] = 0.5 * (E2 + af.shift(E2, 0, 0, 1, 0))  # (i, j+1/2)
-        self.yee_grid_EM_fields[2] = 0.25 * (  E3 
-                                             + af.shift(E3, 0, 0, 1, 0)
-                                             + af.shift(E3, 0, 0, 0, 1) 
-                                             + af.shift(E3, 0, 0, 1, 1)
-                                            )  # (i, j)
+    # The cell centered fields are recomputed from the Yee grid upon being read,
+    # and the products held by get_lorentz_fields are dropped upon being set:
+    @property
+    def cell_centered_EM_fields(self):
+        self._sync_cell_centered_fields()
+        return(self._cell_centered_EM_fields)
+
+    @cell_centered_EM_fields.setter
+    def cell_centered_EM_fields(self, value):
+        self._cell_centered_EM_fields = value
+        self._cell_centered_stale     = False
+        self._lorentz_fields          = {}
+
+    @property
+    def cell_centered_EM_fields_at_n_plus_half(self):
+        self._sync_cell_centered_fields()
+        return(self._cell_centered_EM_fields_at_n_plus_half)
+
+    @cell_centered_EM_fields_at_n_plus_half.setter
+    def cell_centered_EM_fields_at_n_plus_half(self, value):
+        self._sync_cell_centered_fields()
+        self._cell_centered_EM_fields_at_n_plus_half = value
+        self._lorentz_fields                         = {}
 
-        self.yee_grid_EM_fields[3] = 0.5 * (B1 + af.shift(B1, 0, 0, 1, 0)) # (i, j+1/2)
-        self.yee_grid_EM_fields[4] = 0.5 * (B2 + af.shift(B2, 0, 0, 0, 1)) # (i+1/2, j)
-        self.yee_grid_EM_fields[5] = B3 # (i+1/2, j+1/2)
+    def cell_centered_grid_to_yee_grid(self):
+        """
+        Interpolates the cell centered fields to the Yee grid:
+        E1 --> (i + 1/2, j), E2 --> (i, j + 1/2), E3 --> (i, j)
+        B1 --> (i, j + 1/2), B2 --> (i + 1/2, j), B3 --> (i + 1/2, j + 1/2)
+        """
+        self.yee_grid_EM_fields = \
+            _yee_stencil(self.cell_centered_EM_fields, self._yee_grid_weights, 1)
 
         af.eval(self.yee_grid_EM_fields)
         return
 
     def yee_grid_to_cell_centered_grid(self):
-        
-        E1_yee = self.yee_grid_EM_fields[0] # (i + 1/2, j)
-        E2_yee = self.yee_grid_EM_fields[1] # (i, j + 1/2)
-        E3_yee = self.yee_grid_EM_fields[2] # (i, j)
-
-        B1_yee = self.yee_grid_EM_fields[3] # (i, j + 1/2)
-        B2_yee = self.yee_grid_EM_fields[4] # (i + 1/2, j)
-        B3_yee = self.yee_grid_EM_fields[5] # (i + 1/2, j + 1/2)
-
-        # Interpolating at the (i + 1/2, j + 1/2) point of the grid:
-        self.cell_centered_EM_fields[0] = 0.5 * (E1_yee + af.shift(E1_yee, 0, 0,  0, -1))
-        self.cell_centered_EM_fields[1] = 0.5 * (E2_yee + af.shift(E2_yee, 0, 0, -1,  0))
-        self.cell_centered_EM_fields[2] = 0.25 * (  E3_yee 
-                                                  + af.shift(E3_yee, 0, 0,  0, -1)
-                                                  + af.shift(E3_yee, 0, 0, -1,  0)
-                                                  + af.shift(E3_yee, 0, 0, -1, -1)
-                                                 )
-
-        self.cell_centered_EM_fields[3] = 0.5 * (B1_yee + af.shift(B1_yee, 0, 0, -1,  0))
-        self.cell_centered_EM_fields[4] = 0.5 * (B2_yee + af.shift(B2_yee, 0, 0,  0, -1))
-        self.cell_centered_EM_fields[5] = B3_yee
+        """
+        Interpolates the fields on the Yee grid to the (i + 1/2, j + 1/2)
+        point of the grid.
+        """
+        self.cell_centered_EM_fields = \
+            _yee_stencil(self.yee_grid_EM_fields, self._yee_grid_weights, -1)
 
         af.eval(self.cell_centered_EM_fields)
         return
 
     def current_values_to_yee_grid(self):
+        """
+        Obtains the values for current density on the Yee-Grid:
+        J1 --> (i + 1/2, j), J2 --> (i, j + 1/2), J3 --> (i, j)
+        """
+        J = _yee_stencil(af.join(0, self.J1, self.J2, self.J3),
+                         [weights[:3] for weights in self._yee_grid_weights], 1
+                        )
+        af.eval(J)
 
-        # Obtaining the values for current density on the Yee-Grid:
-        self.J1 = 0.5 * (self.J1 + af.shift(self.J1, 0, 0, 0, 1))  # (i + 1/2, j)
-        self.J2 = 0.5 * (self.J2 + af.shift(self.J2, 0, 0, 1, 0))  # (i, j + 1/2)
-
-        self.J3 = 0.25 * (  self.J3 + af.shift(self.J3, 0, 0, 1, 0)
-                          + af.shift(self.J3, 0, 0, 0, 1)
-                          + af.shift(self.J3, 0, 0, 1, 1)
-                         )  # (i, j)
+        self.J1 = J[0]
+        self.J2 = J[1]
+        self.J3 = J[2]
 
         return
 
     def compute_electrostatic_fields(self, rho):
+        """
+        Computes the electrostatic fields for the charge density passed,
+        using the parallel multigrid solver when fields_solver = 'multigrid'
+        (or 'ampere', for the clean-up solves) and the FFT solver(which can
+        only be used in serial) otherwise.
 
-        if (self.params.fields_initialize == 'fft'):
+        Parameters
+        ----------
+
+        rho : af.Array
+              Array that holds the charge density for each species
+        """
+        if (self.params.fields_solver in ['multigrid', 'ampere']):
+            ksp_poisson(self, rho)
+            # Only E1, E2 are changed by the electrostatic solvers:
+            communicate.communicate_fields(self, components = (0, 2))
+            apply_bcs_fields(self)
+
+        elif (self.params.fields_initialize == 'fft'):
             
             fft_poisson(self, rho)
-            communicate.communicate_fields(self)
+            communicate.communicate_fields(self, components = (0, 2))
             apply_bcs_fields(self)
 
-        # ADD SNES BELOW
+        # The fields are changed in place by the solvers:
+        self._lorentz_fields = {}
+
+    # Used when the electrostatic fields are evolved using Ampere's law:
+    ampere_cleanup_due                 = ampere.ampere_cleanup_due
+    evolve_electrostatic_fields_ampere = ampere.evolve_electrostatic_fields_ampere
 
     def evolve_electrodynamic_fields(self, J1, J2, J3, dt):
         """
-        Evolve the fields using FDTD.
+        Evolve the fields using FDTD. When params.fdtd_subcycles = N is
+        defined, N FDTD substeps are taken over dt(see fdtd_subcycled).
 
         Parameters
         ----------
@@ -371,33 +515,28 @@ class fields_solver(object):
                   )
 
         self.cell_centered_EM_fields_at_n_plus_half[3:] = self.cell_centered_EM_fields[3:]
+        self._lorentz_fields = {}
 
-        fdtd(self, dt)
-        self.yee_grid_to_cell_centered_grid()
+        # Number of FDTD substeps taken per timestep, with the currents
+        # interpolated between (n - 1/2) and (n + 1/2) at the substeps:
+        N_subcycles = getattr(self.params, 'fdtd_subcycles', 1)
 
-        # Here
-        # cell_centered_EM_fields[:3] is at n+1
-        # cell_centered_EM_fields[3:] is at n+3/2
+        fdtd_subcycled(self, dt, N_subcycles, self._J_previous)
 
-        self.cell_centered_EM_fields_at_n_plus_half[:3] = \
-            0.5 * (  self.cell_centered_EM_fields_at_n[:3] 
-                   + self.cell_centered_EM_fields[:3]
-                  )
+        if(N_subcycles > 1):
+            self._J_previous = (self.J1, self.J2, self.J3)
+
+        # The cell centered fields(and cell_centered_EM_fields_at_n_plus_half[:3])
+        # are recomputed from the Yee grid when read next:
+        self._cell_centered_stale = True
 
         return
 
-    def update_user_defined_fields(self, time_elapsed):
+    def _evaluate_user_defined_fields(self, time_elapsed):
         """
-        Updates the cell-centered EM fields value using the value that is 
-        returned by the user defined function at that particular time.
-
-        Parameters
-        ----------
-
-        time_elapsed : double
-                       Time at which the field values are to be evaluated.
+        Returns the 6-component array of the fields returned by the
+        user defined functions at the time considered.
         """
-
         E1, E2, E3 = self.params.user_defined_E(self.q1,
                                                 self.q2,
                                                 time_elapsed
@@ -408,51 +547,159 @@ class fields_solver(object):
                                                 time_elapsed
                                                )
 
-        self.cell_centered_EM_fields = af.join(0, E1, E2, E3, 
-                                               af.join(0, B1, B2, B3)
-                                              )
+        EM_fields = af.join(0, E1, E2, E3, af.join(0, B1, B2, B3))
+        af.eval(EM_fields)
 
-        return
+        return(EM_fields)
 
-    def get_fields(self):
+    def _initialize_user_defined_fields(self):
         """
-        Returns the fields value as held by the
-        solver in it's current state.
+        Sets up the user defined fields. By default, the user defined functions
+        are evaluated upon each call to update_user_defined_fields. This may
+        be changed in the parameters file by declaring:
+
+        user_defined_fields_static = True
+            The fields are evaluated once at t = 0 and held as such.
+
+        user_defined_fields_times = [t_0, t_1, ..., t_N]
+            The fields are evaluated at the listed(increasing) times and held
+            on the device, such that the updates only linearly interpolate
+            between the tabulated values. The values at t_0 and t_N are used
+            for times outside the range of the table.
         """
-        if(self.params.fields_solver != 'fdtd'):
+        self._user_defined_fields_static = \
+            getattr(self.params, 'user_defined_fields_static', False)
+
+        times = getattr(self.params, 'user_defined_fields_times', None)
+
+        if(times is not None):
+            self._user_defined_fields_times = np.array(times, dtype = np.float64)
 
-            E1 = self.cell_centered_EM_fields[0]
-            E2 = self.cell_centered_EM_fields[1]
-            E3 = self.cell_centered_EM_fields[2]
+            if(np.any(np.diff(self._user_defined_fields_times) <= 0)):
+                raise ValueError('user_defined_fields_times needs to be increasing')
 
-            B1 = self.cell_centered_EM_fields[3]
-            B2 = self.cell_centered_EM_fields[4]
-            B3 = self.cell_centered_EM_fields[5]
+            self._user_defined_fields_table = \
+                [self._evaluate_user_defined_fields(time)
+                 for time in self._user_defined_fields_times
+                ]
 
         else:
-            if(self.at_n == True):
+            self._user_defined_fields_times = None
+            self._user_defined_fields_table = None
+
+        self.update_user_defined_fields(0, force_update = True)
+        return
 
-                E1 = self.cell_centered_EM_fields_at_n[0]
-                E2 = self.cell_centered_EM_fields_at_n[1]
-                E3 = self.cell_centered_EM_fields_at_n[2]
+    def update_user_defined_fields(self, time_elapsed, force_update = False):
+        """
+        Updates the cell-centered EM fields value using the value that is 
+        returned by the user defined function at that particular time, or
+        interpolated from the tabulated values when these have been declared.
+        Static fields are left untouched.
+
+        Parameters
+        ----------
+
+        time_elapsed : double
+                       Time at which the field values are to be evaluated.
+
+        force_update : bool
+                       Updates the fields even when these are static.
+        """
+        if(self._user_defined_fields_static == True and force_update == False):
+            return
+
+        table = self._user_defined_fields_table
+
+        if(table is None):
+            self.cell_centered_EM_fields = \
+                self._evaluate_user_defined_fields(time_elapsed)
+
+        else:
+            times = self._user_defined_fields_times
+            # Index of the entry of the table at or before time_elapsed:
+            i = int(np.clip(np.searchsorted(times, time_elapsed, side = 'right') - 1,
+                            0, len(times) - 1
+                           )
+                   )
 
-                B1 = self.cell_centered_EM_fields_at_n[3]
-                B2 = self.cell_centered_EM_fields_at_n[4]
-                B3 = self.cell_centered_EM_fields_at_n[5]
+            if(i == len(times) - 1 or time_elapsed <= times[0]):
+                self.cell_centered_EM_fields = table[i].copy()
 
             else:
+                weight = (time_elapsed - times[i]) / (times[i + 1] - times[i])
+                self.cell_centered_EM_fields =   (1 - weight) * table[i] \
+                                               + weight * table[i + 1]
+                af.eval(self.cell_centered_EM_fields)
 
-                E1 = self.cell_centered_EM_fields_at_n_plus_half[0]
-                E2 = self.cell_centered_EM_fields_at_n_plus_half[1]
-                E3 = self.cell_centered_EM_fields_at_n_plus_half[2]
+        return
+
+    def _get_EM_fields(self):
+        """
+        Returns the 6-component array of the fields at the time level
+        which is used in the current evaluation, along with the name of
+        the array. For FVM, the time level is alternated upon each call.
+        """
+        if(self.params.fields_solver != 'fdtd'):
+            EM_fields, name = self.cell_centered_EM_fields, 'cell_centered'
+
+        else:
+            if(self.at_n == True):
+                EM_fields, name = self.cell_centered_EM_fields_at_n, 'at_n'
 
-                B1 = self.cell_centered_EM_fields_at_n_plus_half[3]
-                B2 = self.cell_centered_EM_fields_at_n_plus_half[4]
-                B3 = self.cell_centered_EM_fields_at_n_plus_half[5]
+            else:
+                EM_fields, name = self.cell_centered_EM_fields_at_n_plus_half, \
+                                  'at_n_plus_half'
 
         if(self.params.solver_method_in_p == 'FVM'):
             # Alternating upon each call for FVM:
             # TEMP FIX: Need to change to something more clean
             self.at_n = not(self.at_n)
 
+        return(EM_fields, name)
+
+    def get_fields(self):
+        """
+        Returns the fields value as held by the
+        solver in it's current state.
+        """
+        EM_fields, name = self._get_EM_fields()
+
+        if(self._q2_window is not None):
+            EM_fields = slice_q2_window(EM_fields, self._q2_window)
+
+        E1 = EM_fields[0]
+        E2 = EM_fields[1]
+        E3 = EM_fields[2]
+
+        B1 = EM_fields[3]
+        B2 = EM_fields[4]
+        B3 = EM_fields[5]
+
         return(E1, E2, E3, B1, B2, B3)
+
+    def get_lorentz_fields(self):
+        """
+        Returns the fields returned by get_fields multiplied by q/m of
+        each of the species, (q/m)E1, (q/m)E2, (q/m)E3, (q/m)B1, (q/m)B2, (q/m)B3
+        with shape (1, N_s, N_q1, N_q2). These are obtained as a single
+        product over all the components, which is held until the fields are
+        next updated, such that the product is only taken once for each of
+        the time levels per update(irrespective of the blocks over which
+        the RHS is evaluated).
+        """
+        EM_fields, name = self._get_EM_fields()
+
+        if(name in self._lorentz_fields):
+            lorentz_fields = self._lorentz_fields[name]
+
+        else:
+            lorentz_fields = multiply(self._charge_by_mass, EM_fields)
+            af.eval(lorentz_fields)
+
+            self._lorentz_fields[name] = lorentz_fields
+
+        if(self._q2_window is not None):
+            lorentz_fields = slice_q2_window(lorentz_fields, self._q2_window)
+
+        return(tuple(lorentz_fields[i] for i in range(6)))
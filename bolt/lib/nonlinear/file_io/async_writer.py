@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Contains the async_writer, which is used by the dump routines of the solver
+when it is declared with async_output = True.
+
+The data to be dumped is copied into a host staging buffer and the call
+returns immediately, while a background thread writes the buffer to file.
+Two staging buffers are held for each dataset, so that the next dump may be
+staged while the previous one is being written. A dump waits only when both
+the buffers of the dataset are still being written.
+
+The files written follow the layout of the files written by the PETSc viewers
+(a dataset of shape (N_q2, N_q1, dof)), so that the files may be post-processed
+and loaded in the same manner.
+
+When running on more than one rank, the writes involve MPI calls from the
+background thread. This requires MPI to have been initialized with
+MPI_THREAD_MULTIPLE. When this isn't the case, the writes are carried out
+synchronously. The writer uses a duplicate of the solver's communicator, 
+since the collectives issued by the background thread would otherwise be
+interleaved with those issued by the solver on the main thread.
+"""
+
+import atexit
+import threading
+import queue
+
+import numpy as np
+from mpi4py import MPI
+
+from .write_hdf5 import write_hdf5
+
+class async_writer(object):
+    """
+    Writes the dumps of the solver to file using a background thread.
+    """
+
+    def __init__(self, comm, N_q1, N_q2, da):
+        """
+        Starts the background thread used for writing.
+
+        Parameters
+        ----------
+
+        comm: mpi4py.MPI.Comm
+              The communicator used by the solver.
+
+        N_q1: int
+              Number of zones along q1 in the complete domain.
+
+        N_q2: int
+              Number of zones along q2 in the complete domain.
+
+        da: PETSc.DMDA
+            The DA which describes the partitioning of the domain.
+        """
+        # Collectives from the background thread are kept apart
+        # from those of the solver using a communicator of its own:
+        self._comm = comm.Dup()
+        self.N_q1  = N_q1
+        self.N_q2  = N_q2
+
+        self._corners = da.getCorners()
+        ((self.i_q1_start, self.i_q2_start), (self.N_q1_local, self.N_q2_local)) = \
+            self._corners
+
+        self.asynchronous = (   self._comm.size == 1
+                             or MPI.Query_thread() == MPI.THREAD_MULTIPLE
+                            )
+
+        # Two staging buffers per dataset, along with the events which
+        # are set when the write from the buffer has been completed:
+        self._staging      = {}
+        self._write_done   = {}
+        self._staging_next = {}
+
+        self._queue = queue.Queue()
+        self._error = None
+
+        if(self.asynchronous == True):
+            self._thread = threading.Thread(target = self._run, daemon = True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _get_staging_buffer(self, dataset_name, shape, dtype):
+        """
+        Returns the key and index of the staging buffer for the next dump
+        of the dataset, waiting for the write from the same to complete.
+        The buffers are held separately for each shape and dtype in which
+        the dataset is dumped.
+        """
+        key = (dataset_name, shape, np.dtype(dtype).str)
+
+        if(key not in self._staging):
+            self._staging[key]      = [np.empty(shape, dtype = dtype),
+                                       np.empty(shape, dtype = dtype)
+                                      ]
+            self._write_done[key]   = [threading.Event(), threading.Event()]
+            self._staging_next[key] = 0
+
+            for event in self._write_done[key]:
+                event.set()
+
+        index = self._staging_next[key]
+        self._staging_next[key] = 1 - index
+
+        self._write_done[key][index].wait()
+        self._write_done[key][index].clear()
+
+        return(key, index)
+
+    def submit(self, file_name, dataset_name, local_data, dtype = np.float64,
+               **options
+              ):
+        """
+        Stages the data for writing to the file 'file_name.h5' and returns.
+
+        Parameters
+        ----------
+
+        file_name: str
+                   Name of the file(without the extension) to be written.
+
+        dataset_name: str
+                      Key with which the data is stored in the file.
+
+        local_data: np.ndarray
+                    Data in the local zone(non-inclusive of the ghost zones),
+                    as held in the global PETSc vectors.
+
+        dtype: np.dtype
+               Precision with which the data is written.
+
+        options: 
+                 Options used in creating the dataset(compression, shuffle,
+                 chunks, attrs) which are passed to write_hdf5.
+        """
+        self._raise_error()
+
+        shape = (self.N_q2_local, self.N_q1_local, local_data.size // (  self.N_q2_local
+                                                                       * self.N_q1_local
+                                                                      )
+                )
+
+        if(self.asynchronous == False):
+            self._write(file_name, dataset_name, 
+                        local_data.reshape(shape).astype(dtype), options
+                       )
+            return
+
+        key, index = self._get_staging_buffer(dataset_name, shape, dtype)
+        np.copyto(self._staging[key][index], local_data.reshape(shape))
+
+        self._queue.put((file_name, dataset_name, key, index, options))
+        return
+
+    def _run(self):
+        """
+        Target of the background thread, which writes the staged buffers.
+        """
+        while(True):
+            job = self._queue.get()
+
+            if(job is None):
+                self._queue.task_done()
+                return
+
+            file_name, dataset_name, key, index, options = job
+
+            try:
+                self._write(file_name, dataset_name, 
+                            self._staging[key][index], options
+                           )
+
+            except Exception as error:
+                self._error = error
+
+            self._write_done[key][index].set()
+            self._queue.task_done()
+
+    def _write(self, file_name, dataset_name, local_data, options):
+        """
+        Writes the data of all the ranks to the file 'file_name.h5'.
+        """
+        write_hdf5(self._comm, self._corners, self.N_q1, self.N_q2,
+                   file_name, dataset_name, local_data, **options
+                  )
+        return
+
+    def _raise_error(self):
+        """
+        Raises the exception(if any) encountered by the background thread.
+        """
+        if(self._error is not None):
+            error       = self._error
+            self._error = None
+            raise error
+
+    def wait(self):
+        """
+        Blocks until all the staged dumps have been written to file.
+        """
+        if(self.asynchronous == True):
+            self._queue.join()
+
+        self._raise_error()
+        return
+
+    # Since the files are closed once written, waiting on
+    # the writes also ensures that the data is on disk:
+    flush = wait
+
+    def close(self):
+        """
+        Writes the staged dumps, and stops the background thread.
+        """
+        if(self.asynchronous == True and self._thread.is_alive()):
+            self._queue.put(None)
+            self._thread.join()
+
+        if(self._comm != MPI.COMM_NULL):
+            self._comm.Free()
+
+        self._raise_error()
+        return
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Contains the routines which write and read checkpoints, holding the complete
+state of the solver in a single HDF5 file. Restarting from a checkpoint
+continues the run as though it hadn't been interrupted.
+
+The checkpoint holds:
+
+- the distribution function(in the precision in which it is stored).
+- the EM fields held by the fields solver: the cell centered fields, and
+  when the fields are evolved using FDTD, the fields on the Yee grid and
+  the time staggered values at n and (n + 1/2).
+- the currents at (n - 1/2) held when FDTD is sub-cycled, and the number
+  of calls made to ampere_cleanup_due(which sets the steps at which the
+  clean-up solves are made when fields_solver = 'ampere').
+- the time elapsed, the number of timesteps taken, and the flag used by
+  the fields solver to alternate between the staggered values.
+
+The solution of the previous Poisson solve, which is used as the initial
+guess by the multigrid solver, isn't held. It is zeroed upon loading, such
+that the first solve after a restart begins from the same initial guess as
+the first solve of a new run. This only changes the number of iterations
+taken, and not the solution(to within the tolerance of the solver).
+
+Each array is stored as a dataset of shape (N_q2, N_q1, dof) over the
+complete domain(non-inclusive of the ghost zones). Since each rank reads
+its local zone by index, a checkpoint may be loaded using a different
+number of ranks from the run which wrote it. The ghost zones are filled
+through communication and the boundary conditions upon loading. When h5py
+hasn't been built with MPI support, the datasets are written to a file per
+rank, and 'file_name.h5' presents them through virtual datasets(see
+write_hdf5). The per-rank files then need to be kept along with the same.
+
+Checkpoints may additionally be written automatically at the end of a
+timestep, before the wall time budget of a batch job is exhausted or upon
+receiving a signal from the scheduler(see enable_auto_checkpoint).
+"""
+
+import signal
+
+import numpy as np
+import arrayfire as af
+from mpi4py import MPI
+
+from .write_hdf5 import write_hdf5, write_hdf5_attrs, read_hdf5, read_hdf5_attrs
+from .load import _set_f_from_dump_array
+from .. import communicate
+from ..fields.boundaries import apply_bcs_fields
+
+# Arrays of the fields solver which are held in the checkpoint:
+_field_arrays = ['cell_centered_EM_fields',
+                 'cell_centered_EM_fields_at_n',
+                 'cell_centered_EM_fields_at_n_plus_half',
+                 'yee_grid_EM_fields'
+                ]
+
+def _get_grid_attrs(self):
+    """
+    Returns the attributes describing the resolution of the run, which
+    need to match when a checkpoint is loaded.
+    """
+    return({'N_q1'      : self.N_q1,
+            'N_q2'      : self.N_q2,
+            'N_p1'      : self.N_p1,
+            'N_p2'      : self.N_p2,
+            'N_p3'      : self.N_p3,
+            'N_species' : self.N_species
+           })
+
+def save_checkpoint(self, file_name):
+    """
+    Writes the complete state of the solver to the file 'file_name.h5'.
+    This needs to be called by all the ranks.
+
+    Parameters
+    ----------
+
+    file_name : str
+                Name of the file(without the extension) to be written.
+
+    Examples
+    --------
+
+    >> solver.save_checkpoint('dump/checkpoint')
+
+    The run may then be restarted(possibly on a different number of ranks)
+    by declaring the solver as before and calling:
+
+    >> solver.load_checkpoint('dump/checkpoint')
+    """
+    # Ensuring that the dumps written in the background are on disk:
+    self.wait_for_dumps()
+
+    corners = self._da_f.getCorners()
+    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = corners
+
+    f_array = self._fill_dump_f_buffer()
+    write_hdf5(self._comm, corners, self.N_q1, self.N_q2, file_name,
+               'distribution_function',
+               f_array.reshape(N_q2_local, N_q1_local, -1).\
+               astype(np.float32 if self.precision == 'mixed' else np.float64),
+               mode = 'w'
+              )
+
+    attrs = _get_grid_attrs(self)
+    attrs.update({'time_elapsed' : self.time_elapsed,
+                  'time_step'    : self.time_step
+                 })
+
+    if(self.physical_system.params.EM_fields_enabled == True):
+        N_g = self.N_ghost_q
+
+        for name in _field_arrays:
+            array = getattr(self.fields_solver, name)
+
+            if(array is not None):
+                write_hdf5(self._comm, corners, self.N_q1, self.N_q2, file_name,
+                           'EM_fields/' + name,
+                           af.flat(array[:, :, N_g:-N_g, N_g:-N_g]).to_ndarray().\
+                           reshape(N_q2_local, N_q1_local, 6),
+                           mode = 'a'
+                          )
+
+        # Currents on the Yee grid at (n - 1/2) used by the sub-cycled FDTD:
+        J_previous = self.fields_solver._J_previous
+
+        if(J_previous is not None):
+            write_hdf5(self._comm, corners, self.N_q1, self.N_q2, file_name,
+                       'EM_fields/J_previous',
+                       af.flat(af.join(0, *J_previous)[:, :, N_g:-N_g, N_g:-N_g]).\
+                       to_ndarray().reshape(N_q2_local, N_q1_local, 3),
+                       mode = 'a'
+                      )
+
+        attrs['fields_at_n']         = self.fields_solver.at_n
+        attrs['J_previous_held']     = (J_previous is not None)
+        attrs['fields_ampere_calls'] = self.fields_solver._ampere_calls
+
+    write_hdf5_attrs(self._comm, file_name, attrs)
+
+    return
+
+def _communicate_field_array(fields_solver, array, on_fdtd_grid):
+    """
+    Fills the ghost zones of the field array passed through communication
+    and the boundary conditions. The communication routines of the fields
+    solver act on the cell centered fields(or the fields on the Yee grid),
+    which are thus swapped with the array passed for the same.
+    """
+    if(on_fdtd_grid == True):
+        communicate.communicate_fields(fields_solver, True)
+        apply_bcs_fields(fields_solver, True)
+        return(fields_solver.yee_grid_EM_fields)
+
+    cell_centered_EM_fields = fields_solver.cell_centered_EM_fields
+
+    fields_solver.cell_centered_EM_fields = array
+    communicate.communicate_fields(fields_solver)
+    apply_bcs_fields(fields_solver)
+
+    array                                 = fields_solver.cell_centered_EM_fields
+    fields_solver.cell_centered_EM_fields = cell_centered_EM_fields
+
+    return(array)
+
+def load_checkpoint(self, file_name):
+    """
+    Restores the complete state of the solver from the file 'file_name.h5'
+    written by save_checkpoint. The number of ranks used may differ from
+    that of the run which wrote the checkpoint, while the resolution needs
+    to be the same. This needs to be called by all the ranks.
+
+    Parameters
+    ----------
+
+    file_name : str
+                Name of the file(without the extension) to be read.
+    """
+    self.wait_for_dumps()
+
+    attrs = read_hdf5_attrs(file_name)
+
+    for key, value in _get_grid_attrs(self).items():
+        if(attrs[key] != value):
+            raise ValueError('Checkpoint was written with ' + key + ' = ' +
+                             str(attrs[key]) + ', while the solver uses ' +
+                             key + ' = ' + str(value)
+                            )
+
+    corners = self._da_f.getCorners()
+    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = corners
+
+    _set_f_from_dump_array(self, read_hdf5(self._comm, corners, file_name,
+                                           'distribution_function'
+                                          )
+                          )
+    self._communicate_f()
+    self._apply_bcs_f()
+
+    if(self.physical_system.params.EM_fields_enabled == True):
+        N_g = self.N_ghost_q
+
+        for name in _field_arrays:
+            array = getattr(self.fields_solver, name)
+
+            if(array is not None):
+                array[:, :, N_g:-N_g, N_g:-N_g] = \
+                    af.moddims(af.to_array(read_hdf5(self._comm, corners, file_name,
+                                                     'EM_fields/' + name
+                                                    ).ravel()
+                                          ),
+                               6, 1, N_q1_local, N_q2_local
+                              )
+
+                setattr(self.fields_solver, name,
+                        _communicate_field_array(self.fields_solver, array,
+                                                 name == 'yee_grid_EM_fields'
+                                                )
+                       )
+
+        self.fields_solver._J_previous = None
+
+        # Dropping the products with q/m held by get_lorentz_fields:
+        self.fields_solver._lorentz_fields = {}
+
+        if(bool(attrs.get('J_previous_held', False)) == True):
+            J_previous = af.constant(0, 3, 1, N_q1_local + 2 * N_g, N_q2_local + 2 * N_g,
+                                     dtype = af.Dtype.f64
+                                    )
+
+            # Only the values in the interior of the zone are used by FDTD:
+            J_previous[:, :, N_g:-N_g, N_g:-N_g] = \
+                af.moddims(af.to_array(read_hdf5(self._comm, corners, file_name,
+                                                 'EM_fields/J_previous'
+                                                ).ravel()
+                                      ),
+                           3, 1, N_q1_local, N_q2_local
+                          )
+
+            self.fields_solver._J_previous = (J_previous[0], J_previous[1], 
+                                              J_previous[2]
+                                             )
+
+        self.fields_solver.at_n          = bool(attrs['fields_at_n'])
+        self.fields_solver._ampere_calls = int(attrs.get('fields_ampere_calls', 0))
+
+        # The initial guess of the multigrid solver(see the notes above):
+        if(getattr(self.fields_solver, '_poisson_phi', None) is not None):
+            self.fields_solver._poisson_phi.set(0)
+
+    self.time_elapsed = float(attrs['time_elapsed'])
+    self.time_step    = int(attrs['time_step'])
+
+    return
+
+def enable_auto_checkpoint(self, file_name, walltime = None, walltime_margin = 0,
+                           signals = ('SIGTERM', 'SIGUSR1'), check_interval = 1,
+                           exit_after_checkpoint = True
+                          ):
+    """
+    Enables writing a checkpoint at the end of a timestep when the wall time
+    budget of the run is about to be exhausted, or when one of the signals
+    passed is received(as sent by batch schedulers ahead of the walltime
+    limit). The checkpoint is written collectively by all the ranks at the
+    same step, even when the signal is received only by some of them.
+
+    Parameters
+    ----------
+
+    file_name : str
+                Name of the file(without the extension) to which the 
+                checkpoint is written.
+
+    walltime : double
+               Wall time budget(in seconds) from the time of this call. 
+               A checkpoint is written when the time remaining is less
+               than the duration of the longest timestep seen, along with
+               walltime_margin. When None, only the signals are watched.
+
+    walltime_margin : double
+                      Additional time(in seconds) which is left in the budget,
+                      such as the time needed to write the checkpoint.
+
+    signals : tuple
+              Names of the signals upon which a checkpoint is written.
+
+    check_interval : int
+                     Number of timesteps after which the ranks check for the
+                     requests. Since this involves a reduction across the 
+                     ranks, this may be increased to reduce synchronization.
+
+    exit_after_checkpoint : bool
+                            When True, the run is terminated(by raising
+                            SystemExit) once the checkpoint is written.
+
+    Examples
+    --------
+
+    >> solver.enable_auto_checkpoint('dump/checkpoint', walltime = 23.5 * 3600)
+
+    >> for time_index in range(N_steps):
+
+    >>     solver.strang_timestep(dt)
+
+    The run is then restarted from the state at the step at which
+    the checkpoint was written using:
+
+    >> solver.load_checkpoint('dump/checkpoint')
+    """
+    disable_auto_checkpoint(self)
+
+    self._auto_checkpoint = {'file_name'             : file_name,
+                             'walltime'              : walltime,
+                             'walltime_margin'       : walltime_margin,
+                             'check_interval'        : check_interval,
+                             'exit_after_checkpoint' : exit_after_checkpoint,
+                             'time_start'            : MPI.Wtime(),
+                             'time_last_check'       : MPI.Wtime(),
+                             'max_step_duration'     : 0,
+                             'signal_received'       : False,
+                             'previous_handlers'     : {}
+                            }
+
+    def handler(signum, frame):
+        # Only flagged here, since the checkpoint involves collective
+        # calls which need to be made at the same step by all ranks:
+        self._auto_checkpoint['signal_received'] = True
+
+    for name in signals:
+        signum = getattr(signal, name)
+        self._auto_checkpoint['previous_handlers'][signum] = \
+            signal.signal(signum, handler)
+
+    return
+
+def disable_auto_checkpoint(self):
+    """
+    Disables the checkpoints enabled by enable_auto_checkpoint, restoring
+    the handlers of the signals which were watched.
+    """
+    if(self._auto_checkpoint is not None):
+        for signum, previous_handler in self._auto_checkpoint['previous_handlers'].items():
+            signal.signal(signum, previous_handler)
+
+    self._auto_checkpoint = None
+    return
+
+def check_auto_checkpoint(self):
+    """
+    Called by the timestepping routines at the end of each timestep. Writes
+    a checkpoint when the same has been requested on any of the ranks, 
+    through a signal or due to the wall time budget being exhausted.
+    Returns True when a checkpoint was written.
+    """
+    state = self._auto_checkpoint
+
+    if(   state is None
+       or self.time_step % state['check_interval'] != 0
+      ):
+        return(False)
+
+    time_now = MPI.Wtime()
+    state['max_step_duration'] = max(state['max_step_duration'],
+                                     (time_now - state['time_last_check']) / state['check_interval']
+                                    )
+    state['time_last_check']   = time_now
+
+    requested = state['signal_received']
+
+    if(state['walltime'] is not None):
+        time_remaining = state['walltime'] - (time_now - state['time_start'])
+        requested      = (   requested 
+                          or time_remaining < (  state['max_step_duration']
+                                               * state['check_interval']
+                                               + state['walltime_margin']
+                                              )
+                         )
+
+    if(self._comm.allreduce(requested, op = MPI.LOR) == False):
+        return(False)
+
+    save_checkpoint(self, state['file_name'])
+    state['signal_received'] = False
+
+    if(state['exit_after_checkpoint'] == True):
+        raise SystemExit('Checkpoint written to ' + state['file_name'] + '.h5 at ' +
+                         'timestep ' + str(self.time_step)
+                        )
+
+    return(True)
@@ -5,7 +5,300 @@ from petsc4py import PETSc
 import numpy as np
 import arrayfire as af
 
-def dump_moments(self, file_name):
+import h5py
+
+from .write_hdf5 import write_hdf5, write_hdf5_attrs, velocity_block_chunks
+from ..compute_moments import _get_moment_inputs
+
+def _get_dump_f_buffers(self):
+    """
+    Returns the PETSc vector(and its array) used in dumping the
+    distribution function, allocating the same upon first use.
+
+    When the layout of the global vector used in communication is the same
+    as that of the dump(no ghost zones in p-space, and no packing of single
+    precision values), the vector used for communication is used directly.
+    """
+    if(self._glob_dump_f is None):
+
+        if(self.N_ghost_p == 0 and self._pack_f_in_communication == False):
+            self._glob_dump_f       = self._glob_f
+            self._glob_dump_f_array = self._glob_f_array
+
+        else:
+            self._glob_dump_f       = self._da_dump_f.createGlobalVec()
+            self._glob_dump_f_array = self._glob_dump_f.getArray()
+
+        # Setting names for the objects which will then be
+        # used as the key identifiers for the HDF5 files:
+        PETSc.Object.setName(self._glob_dump_f, 'distribution_function')
+
+    return(self._glob_dump_f, self._glob_dump_f_array)
+
+def _get_moments_buffers(self):
+    """
+    Returns the PETSc vector(and its array) used in dumping the
+    moments, allocating the same upon first use.
+    """
+    if(self._glob_moments is None):
+        self._glob_moments       = self._da_dump_moments.createGlobalVec()
+        self._glob_moments_array = self._glob_moments.getArray()
+
+        PETSc.Object.setName(self._glob_moments, 'moments')
+
+    return(self._glob_moments, self._glob_moments_array)
+
+def release_dump_buffers(self):
+    """
+    Releases the host buffers which are used in dumping the distribution
+    function and the moments. These are allocated again upon the next dump.
+    """
+    if(self._glob_dump_f is not None and self._glob_dump_f is not self._glob_f):
+        self._glob_dump_f.destroy()
+
+    if(self._glob_moments is not None):
+        self._glob_moments.destroy()
+
+    self._glob_dump_f       = None
+    self._glob_dump_f_array = None
+
+    self._glob_moments       = None
+    self._glob_moments_array = None
+
+    return
+
+def wait_for_dumps(self):
+    """
+    Blocks until the dumps which are being written in the background
+    (when the solver is declared with async_output = True) have been
+    written to file. This needs to be called before the files are read,
+    as when restarting from the same.
+    """
+    if(self._async_writer is not None):
+        self._async_writer.wait()
+
+    return
+
+def _get_moment_names(self, moments = None):
+    """
+    Returns the names of the moments which are dumped. When moments is
+    None, all the moments defined under the moments module passed to the
+    physical_system are returned in alphabetical order.
+    """
+    attributes = [a for a in dir(self.physical_system.moments) if not a.startswith('_')]
+
+    # Removing utility functions:
+    if('integral_over_v' in attributes):
+        attributes.remove('integral_over_v')
+
+    if(moments is None):
+        return(attributes)
+
+    for moment_name in moments:
+        if(moment_name not in attributes):
+            raise ValueError('Moment ' + moment_name + ' is not defined. ' +
+                             'Available moments: ' + ', '.join(attributes)
+                            )
+
+    return(list(moments))
+
+def _fill_moments_buffer(self, moments = None):
+    """
+    Computes the moments, and copies the same(non-inclusive of the ghost
+    zones) to the global vector used in dumping the moments. The array
+    of the vector(holding only the moments requested) is returned.
+
+    The inputs to the moment definitions are prepared once(over the zones
+    in q-space which are dumped), and all the moments requested are written
+    into a preallocated array within a single broadcasting context. The
+    array is evaluated once, as it is copied to the buffer. Since the moment definitions are functions defined 
+    by the user, each of the moments is still reduced over p by a kernel 
+    of its own.
+    """
+    N_g_q = self.N_ghost_q
+    N_s   = self.N_species
+
+    moment_names = _get_moment_names(self, moments)
+    definitions  = [getattr(self.physical_system.moments, moment_name) 
+                    for moment_name in moment_names
+                   ]
+
+    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_f.getCorners()
+
+    f, p1, p2, p3 = _get_moment_inputs(self, self.f[:, :, N_g_q:-N_g_q, N_g_q:-N_g_q])
+
+    array_to_dump = af.constant(0, 1, N_s * len(moment_names), N_q1_local, N_q2_local,
+                                dtype = af.Dtype.f64
+                               )
+
+    @af.broadcast
+    def evaluate_moments(f, p1, p2, p3, integral_measure):
+        for i in range(len(definitions)):
+            array_to_dump[:, i * N_s:(i + 1) * N_s] = \
+                definitions[i](f, p1, p2, p3, integral_measure)
+
+    evaluate_moments(f, p1, p2, p3, self.dp3 * self.dp2 * self.dp1)
+
+    glob_moments, glob_moments_array = _get_moments_buffers(self)
+    
+    # Only the leading part of the buffer is used when a subset is dumped:
+    glob_moments_array = glob_moments_array[:array_to_dump.elements()]
+    af.flat(array_to_dump).to_ndarray(glob_moments_array)
+
+    return(glob_moments_array)
+
+def _fill_dump_f_buffer(self):
+    """
+    Copies the distribution function(non-inclusive of the ghost zones)
+    to the global vector used in dumping the distribution function. The
+    array of the vector is returned.
+    """
+    N_g_q = self.N_ghost_q
+    N_g_p = self.N_ghost_p
+
+    glob_dump_f, glob_dump_f_array = _get_dump_f_buffers(self)
+
+    # The zones of f(inclusive of the ghost zones in p-space) are copied to 
+    # the global vector used in communication. When ghost zones are present
+    # in p-space, the dump vector is filled from a strided view of the same.
+    # This avoids creating a sliced copy of f on the device:
+    af.flat(self._cast_for_communication(self.f[:, :, N_g_q:-N_g_q, N_g_q:-N_g_q])).\
+        to_ndarray(self._glob_f_array)
+
+    if(glob_dump_f is not self._glob_f):
+
+        ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_f.getCorners()
+        
+        # Viewing in C-order as (N_q2, N_q1, N_s, N_p3, N_p2, N_p1):
+        glob_f_array = self._glob_f_array.reshape(N_q2_local, N_q1_local,
+                                                  self.N_species,
+                                                  self.N_p3 + 2 * N_g_p,
+                                                  self.N_p2 + 2 * N_g_p,
+                                                  self.N_p1 + 2 * N_g_p
+                                                 )
+
+        if(N_g_p != 0):
+            glob_f_array = glob_f_array[:, :, :, 
+                                        N_g_p:-N_g_p, 
+                                        N_g_p:-N_g_p, 
+                                        N_g_p:-N_g_p
+                                       ]
+
+        glob_dump_f_array.reshape(glob_f_array.shape)[:] = glob_f_array
+
+    return(glob_dump_f_array)
+
+def _fill_EM_fields_buffer(self):
+    """
+    Copies the cell centered EM fields(non-inclusive of the ghost zones)
+    to the global vector of the fields solver. The array of the vector 
+    is returned.
+    """
+    N_g = self.N_ghost_q
+    
+    flattened_global_EM_fields_array = \
+        af.flat(self.fields_solver.cell_centered_EM_fields[:, :, N_g:-N_g, N_g:-N_g])
+    flattened_global_EM_fields_array.to_ndarray(self.fields_solver._glob_fields_array)
+
+    return(self.fields_solver._glob_fields_array)
+
+def _dump_reduced_distribution_function(self, file_name, glob_dump_f_array,
+                                        precision, compression, p_stride
+                                       ):
+    """
+    Writes the distribution function held in the dump vector with reduced
+    precision, compression and/or subsampling in velocity space using h5py,
+    since these options aren't available with the PETSc viewer.
+    """
+    if(precision is None):
+        precision = 'float32' if self.precision == 'mixed' else 'float64'
+
+    if(precision not in ['float64', 'float32', 'float16']):
+        raise ValueError('precision needs to be one of float64, float32 or float16')
+
+    if(compression not in [None, 'gzip', 'lzf']):
+        raise ValueError('compression needs to be one of gzip or lzf')
+
+    if(isinstance(p_stride, int)):
+        p_stride = (p_stride, p_stride, p_stride)
+
+    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_f.getCorners()
+
+    # Subsampling using a strided view in C-order as 
+    # (N_q2, N_q1, N_s, N_p3, N_p2, N_p1):
+    f_dump = glob_dump_f_array.reshape(N_q2_local, N_q1_local, self.N_species,
+                                       self.N_p3, self.N_p2, self.N_p1
+                                      )[:, :, :, 
+                                        ::p_stride[2], ::p_stride[1], ::p_stride[0]
+                                       ]
+
+    attrs = {'N_species' : self.N_species,
+             'N_p1'      : f_dump.shape[5],
+             'N_p2'      : f_dump.shape[4],
+             'N_p3'      : f_dump.shape[3],
+             'p_stride'  : p_stride,
+             'p_start'   : (self.p1_start, self.p2_start, self.p3_start),
+             'dp'        : (  self.dp1 * p_stride[0],
+                              self.dp2 * p_stride[1],
+                              self.dp3 * p_stride[2]
+                           )
+            }
+
+    f_dump = f_dump.reshape(N_q2_local, N_q1_local, -1)
+    dtype  = np.dtype(precision)
+
+    options = {'compression' : compression,
+               'shuffle'     : compression is not None,
+               'chunks'      : velocity_block_chunks((self.N_q2, self.N_q1, f_dump.shape[2]), 
+                                                     dtype.itemsize
+                                                    ),
+               'attrs'       : attrs,
+               'per_rank'    : self.output_mode == 'per_rank'
+              }
+
+    if(self._async_writer is not None):
+        self._async_writer.submit(file_name, 'distribution_function', 
+                                  f_dump, dtype, **options
+                                 )
+
+    else:
+        write_hdf5(self._comm, self._da_f.getCorners(), self.N_q1, self.N_q2,
+                   file_name, 'distribution_function', f_dump.astype(dtype),
+                   **options
+                  )
+
+    return
+
+def _create_hdf5_viewer(self, file_name, single_precision = False):
+    """
+    Returns a HDF5 viewer for writing to the file 'file_name.h5'. When
+    single_precision is True, PETSc converts the data to single precision
+    as it is written, which halves the size of the file written.
+    """
+    if(single_precision == False):
+        return(PETSc.Viewer().createHDF5(file_name + '.h5', 'w', comm=self._comm))
+
+    viewer = PETSc.Viewer().create(comm=self._comm)
+    viewer.setType(PETSc.Viewer.Type.HDF5)
+
+    # The option can only be set through the options database. It is set
+    # under a prefix used only by this viewer, and removed once read so
+    # that the options database of the process is left unchanged:
+    viewer.setOptionsPrefix('bolt_dump_f_')
+    options = PETSc.Options('bolt_dump_f_')
+    options.setValue('viewer_hdf5_sp_output', True)
+
+    try:
+        viewer.setFromOptions()
+    finally:
+        options.delValue('viewer_hdf5_sp_output')
+
+    viewer.setFileMode('w')
+    viewer.setFileName(file_name + '.h5')
+
+    return(viewer)
+
+def dump_moments(self, file_name, moments = None):
     """
     This function is used to dump variables to a file for later usage.
 
@@ -15,6 +308,10 @@ def dump_moments(self, file_name):
     file_name : str
                 The variables will be dumped to this provided file name.
 
+    moments : list
+              Names of the moments which are dumped(in the order passed).
+              By default, all the moments defined are dumped.
+
     Returns
     -------
 
@@ -61,28 +358,55 @@ def dump_moments(self, file_name):
 
     >> mom_p1_species_2 = h5f['moments'][:][:, :, 5]
 
-    """
-    N_g_q = self.N_ghost_q
-
-    attributes = [a for a in dir(self.physical_system.moments) if not a.startswith('_')]
+    The names of the moments dumped are stored as the attribute 'moments'
+    of the dataset, in the order in which they are stored:
 
-    # Removing utility functions:
-    if('integral_over_v' in attributes):
-        attributes.remove('integral_over_v')
+    >> solver.dump_moments('density_dump', moments = ['density'])
 
-    for i in range(len(attributes)):
-        if(i == 0):
-            array_to_dump = self.compute_moments(attributes[i])[:, :, N_g_q:-N_g_q,N_g_q:-N_g_q]
-        else:
-            array_to_dump = af.join(1, array_to_dump,
-                                    self.compute_moments(attributes[i])[:, :, N_g_q:-N_g_q, N_g_q:-N_g_q]
-                                   )
+    >> h5f['moments'].attrs['moments'] # ['density']
+    """
+    moment_names       = _get_moment_names(self, moments)
+    glob_moments_array = _fill_moments_buffer(self, moment_names)
+
+    attrs = {'moments'   : np.array(moment_names, dtype = 'S'),
+             'N_species' : self.N_species
+            }
+
+    if(self._async_writer is not None):
+        self._async_writer.submit(file_name, 'moments', glob_moments_array,
+                                  attrs = attrs, per_rank = (self.output_mode == 'per_rank')
+                                 )
+
+        return
+
+    # The PETSc viewer is used when the vector holds all the moments dumped. 
+    # h5py is used when only a subset of the same is held in the leading part
+    # of the vector, when the dumps are written per rank, or when h5py has 
+    # been built with MPI support:
+    if(    glob_moments_array.size == self._glob_moments.getLocalSize()
+       and self.output_mode != 'per_rank'
+       and not (h5py.get_config().mpi == True and self._comm.size > 1)
+      ):
+        viewer = _create_hdf5_viewer(self, file_name)
+        viewer(self._glob_moments)
+        viewer.destroy()
+
+        write_hdf5_attrs(self._comm, file_name, attrs, 'moments')
+        return
+
+    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_f.getCorners()
+
+    write_hdf5(self._comm, self._da_f.getCorners(), self.N_q1, self.N_q2,
+               file_name, 'moments', 
+               glob_moments_array.reshape(N_q2_local, N_q1_local, -1),
+               attrs = attrs, per_rank = (self.output_mode == 'per_rank')
+              )
 
-    af.flat(array_to_dump).to_ndarray(self._glob_moments_array)
-    viewer = PETSc.Viewer().createHDF5(file_name + '.h5', 'w', comm=self._comm)
-    viewer(self._glob_moments)
+    return
 
-def dump_distribution_function(self, file_name):
+def dump_distribution_function(self, file_name, precision = None,
+                               compression = None, p_stride = 1
+                              ):
     """
     This function is used to dump distribution function to a file for
     later usage.This dumps the complete 5D distribution function which
@@ -94,6 +418,22 @@ def dump_distribution_function(self, file_name):
     file_name : The distribution_function array will be dumped to this
                 provided file name.
 
+    precision : str
+                Precision of the dump('float64', 'float32' or 'float16').
+                By default, the dump follows the precision in which f is
+                stored.
+
+    compression : str
+                  Filter used to compress the dump('gzip' or 'lzf'). The
+                  shuffle filter is applied before the compression, and 
+                  the dataset is chunked such that each chunk holds the
+                  complete velocity blocks of a set of zones.
+
+    p_stride : int/tuple
+               Stride with which the velocity space is subsampled. A tuple
+               (stride_p1, stride_p2, stride_p3) may be passed to use
+               different strides along each dimension.
+
     Returns
     -------
 
@@ -123,33 +463,54 @@ def dump_distribution_function(self, file_name):
     a long-running calculation.
 
     >> solver.load_distribution_function('distribution_function')
+
+    To reduce the size of the snapshots used in post-processing:
+
+    >> solver.dump_distribution_function('distribution_function', 
+                                         precision   = 'float16',
+                                         compression = 'gzip',
+                                         p_stride    = 2
+                                        )
+
+    The data is then stored with the shape (N_q2, N_q1, N_s * N_p3 * N_p2 * N_p1),
+    where N_p1, N_p2, N_p3 are the number of subsampled velocity zones, which 
+    are stored as attributes of the dataset. Dumps which are subsampled in
+    velocity space cannot be used with load_distribution_function.
     """
-    N_g_q = self.N_ghost_q
-    N_g_p = self.N_ghost_p
-    
-    N_q1_local = self.f.shape[2]
-    N_q2_local = self.f.shape[3]
-
-    # The dumped array shouldn't be inclusive of velocity ghost zones:
-    if(N_g_p != 0):
-        array_to_dump = self._convert_to_p_expanded(self.f)[N_g_p:-N_g_p, 
-                                                            N_g_p:-N_g_p,
-                                                            N_g_p:-N_g_p
-                                                           ]
-        array_to_dump = af.moddims(array_to_dump, 
-                                   self.N_p1 * self.N_p2 * self.N_p3,
-                                   self.N_species,
-                                   N_q1_local,
-                                   N_q2_local
-                                  )                                           
-    
-    else:
-        array_to_dump = self.f
-    
-    array_to_dump = af.flat(array_to_dump[:, :, N_g_q:-N_g_q, N_g_q:-N_g_q])
-    array_to_dump.to_ndarray(self._glob_dump_f_array)
-    viewer = PETSc.Viewer().createHDF5(file_name + '.h5', 'w', comm=self._comm)
-    viewer(self._glob_dump_f)
+    glob_dump_f, glob_dump_f_array = _get_dump_f_buffers(self)
+    _fill_dump_f_buffer(self)
+
+    if(precision is not None or compression is not None or p_stride != 1):
+        _dump_reduced_distribution_function(self, file_name, glob_dump_f_array,
+                                            precision, compression, p_stride
+                                           )
+        return
+
+    # The dump follows the precision in which f is stored:
+    dtype = np.float32 if self.precision == 'mixed' else np.float64
+
+    if(self._async_writer is not None):
+        self._async_writer.submit(file_name, 'distribution_function',
+                                  glob_dump_f_array, dtype,
+                                  per_rank = (self.output_mode == 'per_rank')
+                                 )
+        return
+
+    if(self.output_mode == 'per_rank'):
+        ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_f.getCorners()
+
+        write_hdf5(self._comm, self._da_f.getCorners(), self.N_q1, self.N_q2,
+                   file_name, 'distribution_function', 
+                   glob_dump_f_array.reshape(N_q2_local, N_q1_local, -1).astype(dtype),
+                   per_rank = True
+                  )
+        return
+
+    viewer = _create_hdf5_viewer(self, file_name, 
+                                 single_precision = (self.precision == 'mixed')
+                                )
+    viewer(glob_dump_f)
+    viewer.destroy()
 
     return
 
@@ -207,13 +568,26 @@ def dump_EM_fields(self, file_name):
 
     >> solver.load_EM_fields('data_EM_fields')
     """
-    N_g = self.N_ghost_q
-    
-    flattened_global_EM_fields_array = \
-        af.flat(self.fields_solver.cell_centered_EM_fields[:, :, N_g:-N_g, N_g:-N_g])
-    flattened_global_EM_fields_array.to_ndarray(self.fields_solver._glob_fields_array)
+    glob_fields_array = _fill_EM_fields_buffer(self)
+
+    if(self._async_writer is not None):
+        self._async_writer.submit(file_name, 'EM_fields', glob_fields_array,
+                                  per_rank = (self.output_mode == 'per_rank')
+                                 )
+        return
+
+    if(self.output_mode == 'per_rank'):
+        ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_f.getCorners()
+
+        write_hdf5(self._comm, self._da_f.getCorners(), self.N_q1, self.N_q2,
+                   file_name, 'EM_fields', 
+                   glob_fields_array.reshape(N_q2_local, N_q1_local, -1),
+                   per_rank = True
+                  )
+        return
     
     viewer = PETSc.Viewer().createHDF5(file_name + '.h5', 'w', comm=self._comm)
     viewer(self.fields_solver._glob_fields)
+    viewer.destroy()
 
     return
@@ -5,6 +5,8 @@ from petsc4py import PETSc
 import numpy as np
 import arrayfire as af
 
+from .dump import _get_dump_f_buffers
+
 def load_distribution_function(self, file_name):
     """
     This function is used to load the distribution function from the
@@ -24,21 +26,43 @@ def load_distribution_function(self, file_name):
     The above statemant will load the distribution function data stored in the file
     distribution_function.h5 into self.f
     """
-    # Obtaining start coordinates for the local zone
-    # Additionally, we also obtain the size of the local zone
-    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_f.getCorners()
+    # Ensuring that the dumps written in the background are on disk:
+    self.wait_for_dumps()
 
     viewer = PETSc.Viewer().createHDF5(file_name + '.h5', 
                                        PETSc.Viewer.Mode.READ, 
                                        comm=self._comm
                                       )
-    self._glob_dump_f.load(viewer)
+    glob_dump_f, glob_dump_f_array = _get_dump_f_buffers(self)
+    glob_dump_f.load(viewer)
+    viewer.destroy()
+
+    _set_f_from_dump_array(self, glob_dump_f_array)
+
+    return
+
+def _set_f_from_dump_array(self, f_array):
+    """
+    Sets the distribution function in the local zone(non-inclusive of the
+    ghost zones in q-space) using the array passed, which is laid out as 
+    in the dumps of the distribution function. The ghost zones in p-space
+    are set to zero.
+
+    Parameters
+    ----------
+
+    f_array: np.ndarray
+             Array holding the local zone of f, which is interpreted in
+             C-order as (N_q2_local, N_q1_local, N_s, N_p3, N_p2, N_p1).
+    """
+    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_f.getCorners()
 
     N_g_q = self.N_ghost_q
     N_g_p = self.N_ghost_p
 
     # Distribution function non inclusive of the ghost zones in p, q:
-    f_no_ghost_zones = af.to_array(self._glob_f_array)
+    f_no_ghost_zones = af.to_array(np.ascontiguousarray(f_array).ravel())
+    f_no_ghost_zones = self._cast_to_storage_precision(f_no_ghost_zones)
     # Convert to (N_p1, N_p2, N_p3, N_s * N_q):
     f_no_ghost_zones = af.moddims(f_no_ghost_zones, self.N_p1, self.N_p2, self.N_p3,
                                   self.N_species * N_q1_local * N_q2_local
@@ -49,29 +73,22 @@ def load_distribution_function(self, file_name):
                                               self.N_p2 + 2 * N_g_p,
                                               self.N_p3 + 2 * N_g_p,
                                               self.N_species * N_q1_local * N_q2_local,
-                                              dtype = af.Dtype.f64
+                                              dtype = self.dtype_f
                                              )
 
         f_with_ghost_zones_in_p[N_g_p:-N_g_p, N_g_p:-N_g_p, N_g_p:-N_g_p, :] = \
             f_no_ghost_zones
 
-        f_no_ghost_zones_in_q = af.moddims(f_with_ghost_zones_in_p, 
-                                             (self.N_p1 + 2 * self.N_ghost_p)
-                                           * (self.N_p2 + 2 * self.N_ghost_p) 
-                                           * (self.N_p3 + 2 * self.N_ghost_p),
-                                           self.N_species, N_q1_local, N_q2_local
-                                          )    
-    
     else:
-        f_no_ghost_zones_in_q = f_no_ghost_zones
-
-    self.f[:, N_g_q:-N_g_q, N_g_q:-N_g_q] = af.moddims(f_no_ghost_zones_in_q,
-                                                         (self.N_p1 + 2 * self.N_ghost_p)
-                                                       * (self.N_p2 + 2 * self.N_ghost_p) 
-                                                       * (self.N_p3 + 2 * self.N_ghost_p),
-                                                       N_q1_local, N_q2_local
-                                                      )
-
+        f_with_ghost_zones_in_p = f_no_ghost_zones
+
+    self.f[:, :, N_g_q:-N_g_q, N_g_q:-N_g_q] = af.moddims(f_with_ghost_zones_in_p,
+                                                            (self.N_p1 + 2 * N_g_p)
+                                                          * (self.N_p2 + 2 * N_g_p) 
+                                                          * (self.N_p3 + 2 * N_g_p),
+                                                          self.N_species,
+                                                          N_q1_local, N_q2_local
+                                                         )
     return
 
 def load_EM_fields(self, file_name):
@@ -93,6 +110,8 @@ def load_EM_fields(self, file_name):
     The above statemant will load the EM fields data stored in the file
     data_EM_fields.h5 into self.cell_centered_EM_fields
     """
+    self.wait_for_dumps()
+
     viewer = PETSc.Viewer().createHDF5(file_name + '.h5', 
                                        PETSc.Viewer.Mode.READ, 
                                        comm=self._comm
@@ -111,4 +130,7 @@ def load_EM_fields(self, file_name):
                    6, 1, N_q1_local, N_q2_local
                   )
 
+    # Dropping the products with q/m held by get_lorentz_fields:
+    self.fields_solver._lorentz_fields = {}
+
     return
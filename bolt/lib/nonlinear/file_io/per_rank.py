@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Contains the routines for the per-rank output mode, which is used when
+the solver is declared with output_mode = 'per_rank'.
+
+Instead of all the ranks writing to a shared file(which serializes on the
+metadata operations at high rank counts), each rank writes its local zone
+to its own file 'file_name_rank_<rank>.h5'. The position of the local zone
+in the domain is stored as attributes of each dataset. Rank 0 additionally
+writes the file 'file_name.h5', holding HDF5 virtual datasets which present
+the global view of the data without copying the same. The files may thus be
+post-processed(and loaded) as those written in the shared mode.
+
+The virtual datasets may also be created offline from the per-rank files,
+optionally copying the data into a contiguous dataset:
+
+$ python -m bolt.lib.nonlinear.file_io.per_rank dump/moments_0010 [--copy]
+"""
+
+import argparse
+import glob
+import os
+
+import numpy as np
+import h5py
+
+def rank_file_name(file_name, rank):
+    """
+    Returns the name(without the extension) of the file written by the rank.
+    """
+    return(file_name + '_rank_%05d'%rank)
+
+def write_per_rank(comm, corners, N_q1, N_q2, file_name, dataset_name, local_data,
+                   compression = None, shuffle = False, chunks = None, attrs = None,
+                   mode = 'w'
+                  ):
+    """
+    Writes the local zone to the dataset 'dataset_name' of the file written
+    by this rank, and adds the corresponding virtual dataset to the file
+    'file_name.h5'. The arguments are the same as those of write_hdf5.
+    This needs to be called by all the ranks.
+    """
+    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = corners
+
+    # Chunks can't exceed the extent of the local zone:
+    if(chunks is not None):
+        chunks = tuple(min(c, n) for c, n in zip(chunks, local_data.shape))
+
+    with h5py.File(rank_file_name(file_name, comm.rank) + '.h5', mode) as h5f:
+        dataset = h5f.create_dataset(dataset_name, data = local_data,
+                                     compression = compression, shuffle = shuffle,
+                                     chunks = chunks
+                                    )
+
+        dataset.attrs['i_q1_start'] = i_q1_start
+        dataset.attrs['i_q2_start'] = i_q2_start
+        dataset.attrs['N_q1']       = N_q1
+        dataset.attrs['N_q2']       = N_q2
+
+        for key, value in (attrs or {}).items():
+            dataset.attrs[key] = value
+
+    all_corners = comm.gather(corners, root = 0)
+
+    if(comm.rank == 0):
+        write_virtual_dataset(file_name, dataset_name,
+                              [(rank_file_name(file_name, rank), all_corners[rank])
+                               for rank in range(comm.size)
+                              ],
+                              (N_q2, N_q1, local_data.shape[2]), local_data.dtype,
+                              attrs, 'w' if mode == 'w' else 'a'
+                             )
+
+    return
+
+def write_virtual_dataset(file_name, dataset_name, sources, shape, dtype,
+                          attrs = None, mode = 'w'
+                         ):
+    """
+    Writes the virtual dataset 'dataset_name' to the file 'file_name.h5',
+    mapping the local zones held in the per-rank files onto the domain.
+
+    Parameters
+    ----------
+
+    file_name: str
+               Name of the file(without the extension) to be written.
+
+    dataset_name: str
+                  Name of the dataset in the per-rank files and the virtual
+                  dataset created.
+
+    sources: list
+             List of (rank_file_name, corners) for each of the per-rank files.
+
+    shape: tuple
+           Shape of the global dataset (N_q2, N_q1, dof).
+
+    dtype: np.dtype
+           Type of the data held in the per-rank files.
+
+    attrs: dict
+           Attributes which are attached to the virtual dataset.
+
+    mode: str
+          Mode in which the file is opened.
+    """
+    layout = h5py.VirtualLayout(shape = shape, dtype = dtype)
+
+    for (source_file_name, corners) in sources:
+        ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = corners
+
+        # The sources are referred to relative to the virtual file,
+        # such that the files may be moved together:
+        source = h5py.VirtualSource(os.path.basename(source_file_name) + '.h5',
+                                    dataset_name,
+                                    shape = (N_q2_local, N_q1_local, shape[2])
+                                   )
+
+        layout[i_q2_start:i_q2_start + N_q2_local,
+               i_q1_start:i_q1_start + N_q1_local
+              ] = source
+
+    with h5py.File(file_name + '.h5', mode) as h5f:
+        dataset = h5f.create_virtual_dataset(dataset_name, layout, 
+                                             fillvalue = np.zeros(1, dtype = dtype)[0]
+                                            )
+
+        for key, value in (attrs or {}).items():
+            dataset.attrs[key] = value
+
+    return
+
+def merge_per_rank(file_name, copy = False):
+    """
+    Creates the file 'file_name.h5' presenting the global view of the
+    datasets held in the per-rank files 'file_name_rank_<rank>.h5' using
+    virtual datasets. When copy is True, the data is instead copied into
+    contiguous datasets, such that the per-rank files aren't needed.
+    """
+    rank_files = sorted(glob.glob(glob.escape(file_name) + '_rank_[0-9]*.h5'))
+
+    if(len(rank_files) == 0):
+        raise FileNotFoundError('No per-rank files found for ' + file_name)
+
+    sources = {}
+    attrs   = {}
+
+    for rank_file in rank_files:
+        with h5py.File(rank_file, 'r') as h5f:
+
+            def visit(name, obj):
+                if(isinstance(obj, h5py.Dataset)):
+                    corners = ((int(obj.attrs['i_q1_start']), int(obj.attrs['i_q2_start'])),
+                               (obj.shape[1], obj.shape[0])
+                              )
+                    shape   = (int(obj.attrs['N_q2']), int(obj.attrs['N_q1']), obj.shape[2])
+
+                    sources.setdefault(name, []).append((rank_file[:-3], corners, shape, obj.dtype))
+                    attrs[name] = dict((key, value) for key, value in obj.attrs.items()
+                                       if key not in ['i_q1_start', 'i_q2_start', 'N_q1', 'N_q2']
+                                      )
+
+            h5f.visititems(visit)
+
+    mode = 'w'
+    for name in sorted(sources):
+        shape = sources[name][0][2]
+        dtype = sources[name][0][3]
+
+        if(copy == False):
+            write_virtual_dataset(file_name, name,
+                                  [(source[0], source[1]) for source in sources[name]],
+                                  shape, dtype, attrs[name], mode
+                                 )
+
+        else:
+            with h5py.File(file_name + '.h5', mode) as h5f:
+                dataset = h5f.create_dataset(name, shape, dtype = dtype)
+
+                for (source_file_name, corners, _, _) in sources[name]:
+                    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = corners
+
+                    with h5py.File(source_file_name + '.h5', 'r') as source:
+                        dataset[i_q2_start:i_q2_start + N_q2_local,
+                                i_q1_start:i_q1_start + N_q1_local
+                               ] = source[name][:]
+
+                for key, value in attrs[name].items():
+                    dataset.attrs[key] = value
+
+        mode = 'a'
+
+    return
+
+def main():
+    parser = argparse.ArgumentParser(description = 'Merges the per-rank output files' +
+                                                   ' written by Bolt into a global view'
+                                    )
+    parser.add_argument('file_name',
+                        help = 'Name of the output(without the _rank_<rank>.h5 suffix)'
+                       )
+    parser.add_argument('--copy', action = 'store_true',
+                        help = 'Copy the data into contiguous datasets' +
+                               ' instead of creating virtual datasets'
+                       )
+    args = parser.parse_args()
+
+    merge_per_rank(args.file_name, args.copy)
+    return
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Contains the time_series_writer, which writes the output of a run to a
+single HDF5 file, instead of creating a new file at each dump.
+
+Each quantity(moments, EM_fields, distribution_function) is appended to
+an extendable, chunked dataset of shape (N_t, N_q2, N_q1, dof), which
+follows the (N_q2, N_q1, dof) layout of the files written by the dump
+routines. The times at which the quantity was appended are held in the
+dataset '<name>_time'.
+
+When h5py has been built with MPI support, all the ranks write their local
+zones to the file collectively. Otherwise, when running on multiple ranks,
+each rank appends its local zone to a file of its own, and rank 0 writes the
+file 'file_name.h5' holding virtual datasets which present the global view
+(as with output_mode = 'per_rank', see per_rank.py). The local zones aren't
+gathered to a single rank. The virtual datasets are written again upon each
+flush(and when the file is closed), such that they cover all the entries
+appended until then.
+"""
+
+import os
+
+import numpy as np
+import h5py
+
+from .per_rank import rank_file_name
+
+# Upper bound on the size of each chunk of the datasets:
+_chunk_bytes = 2**22
+
+def _chunk_shape(shape, itemsize):
+    """
+    Returns the shape of the chunks for a dataset of shape
+    (N_t, N_q2, N_q1, dof). Each chunk holds a single timestep,
+    and as many rows along q2 as allowed by _chunk_bytes.
+    """
+    N_q2, N_q1, dof = shape[1:]
+
+    bytes_per_row = N_q1 * dof * itemsize
+    N_rows        = max(1, min(N_q2, _chunk_bytes // max(bytes_per_row, 1)))
+
+    # When a single row exceeds the bound, the chunks are split along dof:
+    if(bytes_per_row > _chunk_bytes):
+        return((1, 1, 1, max(1, min(dof, _chunk_bytes // itemsize))))
+
+    return((1, N_rows, N_q1, dof))
+
+class time_series_writer(object):
+    """
+    Appends the data of a run to extendable datasets in a single HDF5 file.
+    """
+
+    def __init__(self, file_name, comm, N_q1, N_q2, da, flush_interval = 1):
+        """
+        Opens the file 'file_name.h5' for writing.
+
+        Parameters
+        ----------
+
+        file_name: str
+                   Name of the file(without the extension) to which the
+                   time series is written.
+
+        comm: mpi4py.MPI.Comm
+              The communicator used by the solver.
+
+        N_q1: int
+              Number of zones along q1 in the complete domain.
+
+        N_q2: int
+              Number of zones along q2 in the complete domain.
+
+        da: PETSc.DMDA
+            The DA which describes the partitioning of the domain.
+
+        flush_interval: int
+                        Number of appends after which the file is flushed
+                        to disk. Passing 0 flushes the file only when closed.
+        """
+        self._comm = comm
+        self.N_q1  = N_q1
+        self.N_q2  = N_q2
+
+        ((self.i_q1_start, self.i_q2_start), (self.N_q1_local, self.N_q2_local)) = \
+            da.getCorners()
+
+        self.flush_interval = flush_interval
+        self._N_appends     = 0
+
+        self.parallel = (    h5py.get_config().mpi == True
+                         and self._comm.size > 1
+                        )
+        self.per_rank = (self.parallel == False and self._comm.size > 1)
+
+        self._file_name = file_name
+        self._names     = []
+
+        if(self.parallel == True):
+            self._h5f = h5py.File(file_name + '.h5', 'w',
+                                  driver = 'mpio', comm = self._comm
+                                 )
+
+        elif(self.per_rank == True):
+            self._h5f = h5py.File(rank_file_name(file_name, self._comm.rank) + '.h5', 'w')
+
+            # Used by rank 0 in mapping the local zones onto the domain:
+            self._all_corners = self._comm.gather(da.getCorners(), root = 0)
+
+        else:
+            self._h5f = h5py.File(file_name + '.h5', 'w')
+
+    def _get_dataset(self, name, N_q2, N_q1, dof, dtype):
+        """
+        Returns the dataset for the quantity, creating the same along
+        with its time coordinate upon the first append. This needs to
+        be called by all the ranks when writing in parallel.
+        """
+        if(name not in self._h5f):
+            shape = (0, N_q2, N_q1, dof)
+
+            self._h5f.create_dataset(name, shape, dtype = dtype,
+                                     maxshape = (None, N_q2, N_q1, dof),
+                                     chunks   = _chunk_shape(shape, np.dtype(dtype).itemsize)
+                                    )
+            self._h5f.create_dataset(name + '_time', (0,), dtype = np.float64,
+                                     maxshape = (None,), chunks = (1024,)
+                                    )
+            self._names.append(name)
+
+        return(self._h5f[name], self._h5f[name + '_time'])
+
+    def _write_virtual_datasets(self):
+        """
+        Writes the file holding the virtual datasets, which map the local
+        zones held in the per-rank files onto the domain for all the entries
+        appended so far. This is carried out by rank 0.
+        """
+        if(self._comm.rank != 0):
+            return
+
+        with h5py.File(self._file_name + '.h5', 'w') as h5f:
+            for name in self._names:
+                N_t, dof = self._h5f[name].shape[0], self._h5f[name].shape[3]
+                dtype    = self._h5f[name].dtype
+
+                layout = h5py.VirtualLayout(shape = (N_t, self.N_q2, self.N_q1, dof),
+                                            dtype = dtype
+                                           )
+
+                for rank in range(self._comm.size):
+                    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = \
+                        self._all_corners[rank]
+
+                    # Referred to relative to the virtual file:
+                    source = \
+                        h5py.VirtualSource(os.path.basename(rank_file_name(self._file_name,
+                                                                           rank
+                                                                          )
+                                                           ) + '.h5',
+                                           name, shape = (N_t, N_q2_local, N_q1_local, dof)
+                                          )
+
+                    layout[:, i_q2_start:i_q2_start + N_q2_local,
+                           i_q1_start:i_q1_start + N_q1_local
+                          ] = source
+
+                h5f.create_virtual_dataset(name, layout,
+                                           fillvalue = np.zeros(1, dtype = dtype)[0]
+                                          )
+
+                # The time coordinate is taken from the file of rank 0:
+                time_layout    = h5py.VirtualLayout(shape = (N_t,), dtype = np.float64)
+                time_layout[:] = \
+                    h5py.VirtualSource(os.path.basename(rank_file_name(self._file_name, 0))
+                                       + '.h5', name + '_time', shape = (N_t,)
+                                      )
+
+                h5f.create_virtual_dataset(name + '_time', time_layout, fillvalue = 0.)
+
+        return
+
+    def append(self, name, time, local_data):
+        """
+        Appends the local zone of the quantity at the time passed.
+
+        Parameters
+        ----------
+
+        name: str
+              Name of the dataset to which the data is appended.
+
+        time: double
+              Time at which the data was obtained.
+
+        local_data: np.ndarray
+                    Data in the local zone(non-inclusive of the ghost zones),
+                    as held in the global PETSc vectors. This is interpreted
+                    in C-order as (N_q2_local, N_q1_local, dof).
+        """
+        local_data = local_data.reshape(self.N_q2_local, self.N_q1_local, -1)
+
+        dof    = local_data.shape[2]
+        slices = (slice(self.i_q2_start, self.i_q2_start + self.N_q2_local),
+                  slice(self.i_q1_start, self.i_q1_start + self.N_q1_local)
+                 )
+
+        if(self.parallel == True):
+            dataset, time_dataset = self._get_dataset(name, self.N_q2, self.N_q1, 
+                                                      dof, local_data.dtype
+                                                     )
+            N_t = dataset.shape[0]
+
+            dataset.resize(N_t + 1, axis = 0)
+            time_dataset.resize(N_t + 1, axis = 0)
+
+            with dataset.collective:
+                dataset[N_t, slices[0], slices[1]] = local_data
+
+            if(self._comm.rank == 0):
+                time_dataset[N_t] = time
+
+        # Each rank appends to its own file(which holds the complete
+        # domain when running on a single rank):
+        else:
+            dataset, time_dataset = self._get_dataset(name, self.N_q2_local, 
+                                                      self.N_q1_local, dof,
+                                                      local_data.dtype
+                                                     )
+            N_t = dataset.shape[0]
+
+            dataset.resize(N_t + 1, axis = 0)
+            time_dataset.resize(N_t + 1, axis = 0)
+
+            dataset[N_t]      = local_data
+            time_dataset[N_t] = time
+
+        self._N_appends += 1
+
+        if(    self.flush_interval != 0
+           and self._N_appends % self.flush_interval == 0
+          ):
+            self.flush()
+
+        return
+
+    def flush(self):
+        """
+        Flushes the data written to disk.
+        """
+        if(self._h5f is not None):
+            self._h5f.flush()
+
+            if(self.per_rank == True):
+                self._write_virtual_datasets()
+
+        return
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        if(self._h5f is not None):
+            if(self.per_rank == True):
+                self._write_virtual_datasets()
+
+            self._h5f.close()
+            self._h5f = None
+
+        return
+
+def open_time_series(self, file_name, flush_interval = 1):
+    """
+    Opens the file 'file_name.h5' to which the output of the run is
+    appended using append_time_series. This is used in place of calling
+    the dump routines at each step, which creates a file per call.
+
+    Parameters
+    ----------
+
+    file_name: str
+               Name of the file(without the extension) to be written.
+
+    flush_interval: int
+                    Number of appends after which the file is flushed
+                    to disk. Passing 0 flushes the file only when closed.
+
+    Examples
+    --------
+
+    >> solver.open_time_series('dump/time_series', flush_interval = 10)
+
+    >> for time_index in range(N_steps):
+
+    >>     solver.strang_timestep(dt)
+
+    >>     solver.append_time_series()
+
+    >> solver.close_time_series()
+
+    The data may then be accessed using:
+
+    >> h5f     = h5py.File('dump/time_series.h5', 'r')
+
+    >> moments = h5f['moments'][:]      # (N_t, N_q2, N_q1, N_moments * N_s)
+
+    >> time    = h5f['moments_time'][:] # (N_t)
+    """
+    self._time_series = time_series_writer(file_name, self._comm,
+                                           self.N_q1, self.N_q2, self._da_f,
+                                           flush_interval
+                                          )
+    return
+
+def append_time_series(self, moments = True, EM_fields = True,
+                       distribution_function = False
+                      ):
+    """
+    Appends the present state of the system to the file
+    opened by open_time_series.
+
+    Parameters
+    ----------
+
+    moments: bool
+             When True, the moments are appended to the dataset 'moments'.
+
+    EM_fields: bool
+               When True, the cell centered EM fields are appended to the
+               dataset 'EM_fields'. This is ignored when the fields are
+               not enabled.
+
+    distribution_function: bool
+                           When True, a snapshot of the distribution function
+                           is appended to the dataset 'distribution_function'.
+    """
+    if(moments == True):
+        self._time_series.append('moments', self.time_elapsed,
+                                 self._fill_moments_buffer()
+                                )
+
+    if(    EM_fields == True
+       and self.physical_system.params.EM_fields_enabled == True
+      ):
+        self._time_series.append('EM_fields', self.time_elapsed,
+                                 self._fill_EM_fields_buffer()
+                                )
+
+    if(distribution_function == True):
+        self._time_series.append('distribution_function', self.time_elapsed,
+                                 self._fill_dump_f_buffer()
+                                )
+
+    return
+
+def close_time_series(self):
+    """
+    Closes the file opened by open_time_series.
+    """
+    self._time_series.close()
+    self._time_series = None
+    return
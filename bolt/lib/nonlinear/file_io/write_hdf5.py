@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Contains write_hdf5, which writes the local zones of all the ranks to a
+single dataset of shape (N_q2, N_q1, dof) using h5py, and read_hdf5 which
+reads back the local zone of such a dataset. This follows the layout of the
+files written by the PETSc viewers, while allowing for the options which
+aren't available with the same(reduced precision, filters and a chunked
+layout).
+
+When h5py has been built with MPI support, all the ranks write their local
+zones to the shared file collectively. Otherwise, when running on multiple
+ranks, each rank writes its local zone to a file of its own, and rank 0
+writes the file 'file_name.h5' holding a virtual dataset which presents the
+global view(as with output_mode = 'per_rank', see per_rank.py). The local
+zones aren't gathered to a single rank, which would need the memory for the
+complete domain on the same. The per-rank files need to be kept alongside
+the file, or merged into it using per_rank.merge_per_rank(copy = True).
+"""
+
+import numpy as np
+import h5py
+
+from .per_rank import write_per_rank
+
+# Upper bound on the size of each chunk of the datasets:
+_chunk_bytes = 2**22
+
+def velocity_block_chunks(shape, itemsize):
+    """
+    Returns the shape of the chunks for a dataset of shape (N_q2, N_q1, dof),
+    such that each chunk holds complete velocity blocks(all the dof of a zone)
+    for as many zones as allowed by _chunk_bytes.
+    """
+    N_q2, N_q1, dof = shape
+
+    bytes_per_zone = dof * itemsize
+    N_zones        = max(1, _chunk_bytes // bytes_per_zone)
+
+    N_q1_chunk = min(N_q1, N_zones)
+    N_q2_chunk = min(N_q2, max(1, N_zones // N_q1_chunk))
+
+    return((N_q2_chunk, N_q1_chunk, dof))
+
+def write_hdf5(comm, corners, N_q1, N_q2, file_name, dataset_name, local_data,
+               compression = None, shuffle = False, chunks = None, attrs = None,
+               mode = 'w', per_rank = False
+              ):
+    """
+    Writes the local zones of all the ranks to the dataset 'dataset_name'
+    of the file 'file_name.h5'. This needs to be called by all the ranks.
+
+    Parameters
+    ----------
+
+    comm: mpi4py.MPI.Comm
+          The communicator used by the solver.
+
+    corners: tuple
+             ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) for the
+             local zone as returned by DMDA.getCorners().
+
+    N_q1: int
+          Number of zones along q1 in the complete domain.
+
+    N_q2: int
+          Number of zones along q2 in the complete domain.
+
+    file_name: str
+               Name of the file(without the extension) to be written.
+
+    dataset_name: str
+                  Key with which the data is stored in the file.
+
+    local_data: np.ndarray
+                Data in the local zone, of shape (N_q2_local, N_q1_local, dof).
+                The dataset is created with the dtype of the same.
+
+    compression: str
+                 Filter used to compress the dataset('gzip' or 'lzf').
+
+    shuffle: bool
+             When True, the shuffle filter is applied before compression.
+
+    chunks: tuple
+            Shape of the chunks of the dataset.
+
+    attrs: dict
+           Attributes which are attached to the dataset.
+
+    mode: str
+          Mode in which the file is opened. Passing 'a' adds the dataset
+          to an existing file.
+
+    per_rank: bool
+              When True, each rank writes its local zone to its own file,
+              while the global view is presented through a virtual dataset
+              (see per_rank.py). This is also used when h5py hasn't been
+              built with MPI support and comm.size > 1.
+    """
+    parallel = (h5py.get_config().mpi == True and comm.size > 1)
+
+    if(per_rank == True or (parallel == False and comm.size > 1)):
+        write_per_rank(comm, corners, N_q1, N_q2, file_name, dataset_name, local_data,
+                       compression, shuffle, chunks, attrs, mode
+                      )
+        return
+
+    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = corners
+
+    slices = (slice(i_q2_start, i_q2_start + N_q2_local),
+              slice(i_q1_start, i_q1_start + N_q1_local)
+             )
+    shape  = (N_q2, N_q1, local_data.shape[2])
+
+    # The PETSc viewers drop the axis of size 1 for vectors with dof = 1.
+    # This is retained for the chunked datasets to keep the chunks valid:
+    if(shape[2] == 1 and chunks is None and compression is None):
+        shape      = shape[:2]
+        local_data = local_data[:, :, 0]
+
+    options = {'dtype'       : local_data.dtype,
+               'compression' : compression,
+               'shuffle'     : shuffle,
+               'chunks'      : chunks
+              }
+
+    if(parallel == True):
+        with h5py.File(file_name + '.h5', mode, driver = 'mpio', comm = comm) as h5f:
+            dataset = h5f.create_dataset(dataset_name, shape, **options)
+            with dataset.collective:
+                dataset[slices] = local_data
+
+            for key, value in (attrs or {}).items():
+                dataset.attrs[key] = value
+
+    # A single rank holds the complete domain:
+    else:
+        with h5py.File(file_name + '.h5', mode) as h5f:
+            dataset = h5f.create_dataset(dataset_name, data = local_data, **options)
+
+            for key, value in (attrs or {}).items():
+                dataset.attrs[key] = value
+
+    return
+
+def write_hdf5_attrs(comm, file_name, attrs, dataset_name = None):
+    """
+    Attaches the attributes passed to the root group of the existing
+    file 'file_name.h5'(or to the dataset 'dataset_name' when passed).
+    This needs to be called by all the ranks.
+    """
+    if(h5py.get_config().mpi == True and comm.size > 1):
+        with h5py.File(file_name + '.h5', 'a', driver = 'mpio', comm = comm) as h5f:
+            target = h5f if dataset_name is None else h5f[dataset_name]
+            for key, value in attrs.items():
+                target.attrs[key] = value
+
+    elif(comm.rank == 0):
+        with h5py.File(file_name + '.h5', 'a') as h5f:
+            target = h5f if dataset_name is None else h5f[dataset_name]
+            for key, value in attrs.items():
+                target.attrs[key] = value
+
+    # Ensuring that the file is complete before returning on all ranks:
+    comm.Barrier()
+    return
+
+def read_hdf5(comm, corners, file_name, dataset_name):
+    """
+    Reads the local zone of the dataset 'dataset_name' written by write_hdf5,
+    returning an array of shape (N_q2_local, N_q1_local, dof). Since the local
+    zone is read by index, the file may be read using a different partitioning
+    of the domain from the one it was written with.
+    """
+    ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = corners
+
+    if(h5py.get_config().mpi == True and comm.size > 1):
+        h5f = h5py.File(file_name + '.h5', 'r', driver = 'mpio', comm = comm)
+    else:
+        h5f = h5py.File(file_name + '.h5', 'r')
+
+    local_data = h5f[dataset_name][i_q2_start:i_q2_start + N_q2_local,
+                                   i_q1_start:i_q1_start + N_q1_local
+                                  ]
+    h5f.close()
+
+    return(local_data.reshape(N_q2_local, N_q1_local, -1))
+
+def read_hdf5_attrs(file_name):
+    """
+    Returns the attributes of the root group of the file 'file_name.h5'.
+    """
+    with h5py.File(file_name + '.h5', 'r') as h5f:
+        attrs = dict(h5f.attrs.items())
+
+    return(attrs)
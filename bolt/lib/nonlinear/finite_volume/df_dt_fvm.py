@@ -4,6 +4,9 @@ import arrayfire as af
 from .riemann import riemann_solver
 from .reconstruct import reconstruct
 from bolt.lib.nonlinear.utils.broadcasted_primitive_operations import multiply
+from bolt.lib.nonlinear.utils.lazy_evaluation import eval_helper, eval_planned
+from bolt.lib.nonlinear.utils.rhs_blocks import get_N_rhs_blocks, get_q2_blocks, \
+                                               slice_q2_window, temporaries_df_dt_fvm
 
 """
 Equation to solve:
@@ -29,19 +32,150 @@ d(f_{i+1/2, j+1/2})/dt  = ((- (C_q1 * f)_{i + 1, j + 1/2} + (C_q1 * f)_{i, j + 1
 The same concept is extended to p-space as well.                          
 """
 
+def update_fields(f, self):
+    """
+    Updates the fields which are used in evaluating df/dt. This is done
+    once per evaluation of df/dt, using the complete local zone.
+
+    Parameters
+    ----------
+
+    f : af.Array
+        Array of the distribution function at which df_dt is to 
+        be evaluated.
+    """
+    if(    self.physical_system.params.solver_method_in_p == 'FVM' 
+       and self.physical_system.params.EM_fields_enabled == True
+      ):
+
+        if(self.physical_system.params.fields_type == 'electrostatic'):
+            if(self.physical_system.params.fields_solver in ['fft', 'multigrid']):
+                rho = multiply(self.physical_system.params.charge,
+                               self.compute_moments('density', f=f)
+                              )
+                self.fields_solver.compute_electrostatic_fields(rho)
+
+        if(self.physical_system.params.fields_type == 'user-defined'):
+            self.fields_solver.update_user_defined_fields(self.time_elapsed)
+
+    return
+
 def df_dt_fvm(f, self):
     """
     Returns the expression for df/dt which is then 
     evolved by a timestepper.
 
+    When the solver is declared with rhs_blocks != 1, df/dt is evaluated
+    over blocks along q2. Each block is extended by the ghost zones on either
+    side so that the stencils are complete for the zones of the block. The
+    blocks at the ends of the local zone are further extended by wrapping
+    around the local zone, such that the values in the ghost zones are the
+    same as those obtained when the complete local zone is evaluated.
+
     Parameters
     ----------
 
     f : af.Array
         Array of the distribution function at which df_dt is to 
         be evaluated.
-    """ 
-    
+    """
+    update_fields(f, self)
+
+    N_g_q    = self.N_ghost_q
+    N_blocks = get_N_rhs_blocks(self, temporaries_df_dt_fvm)
+
+    if(N_blocks != 1 and f.numdims() == 4):
+        blocks = get_q2_blocks(f.shape[3] - 2 * N_g_q, N_blocks)
+
+    if(N_blocks == 1 or f.numdims() < 4 or len(blocks) == 1):
+        df_dt = _df_dt_fvm_block(f, self)
+        eval_planned(df_dt)
+        _release_advection_coefficients(self)
+        return(df_dt)
+
+    EM_fields_enabled = self.physical_system.params.EM_fields_enabled
+
+    # get_fields alternates the time level of the fields upon each call.
+    # This is restored for each of the blocks:
+    if(EM_fields_enabled == True):
+        at_n = self.fields_solver.at_n
+
+    for i in range(len(blocks)):
+        
+        # Zones of the local zone whose values are taken from this block. The 
+        # ghost zones at the ends of the local zone are taken from the first
+        # and last blocks:
+        keep_start = 0 if (i == 0) else blocks[i][0] + N_g_q
+        keep_end   = f.shape[3] if (i == len(blocks) - 1) else blocks[i][1] + N_g_q
+
+        # Window which includes N_g_q zones on either side of those which are
+        # kept. For the first and last blocks this wraps around the local zone
+        # as the af.shift of the stencils does for the complete local zone:
+        q2_window = (keep_start - N_g_q, keep_end + N_g_q)
+
+        if(EM_fields_enabled == True):
+            self.fields_solver.at_n       = at_n
+            self.fields_solver._q2_window = q2_window
+
+        df_dt_block = _df_dt_fvm_block(slice_q2_window(f, q2_window), self, q2_window)
+
+        if(i == 0):
+            df_dt = af.constant(0, f.shape[0], f.shape[1], f.shape[2], f.shape[3],
+                                dtype = df_dt_block.dtype()
+                               )
+
+        df_dt[:, :, :, keep_start:keep_end] = \
+            df_dt_block[:, :, :, N_g_q:df_dt_block.shape[3] - N_g_q]
+
+        eval_planned(df_dt)
+
+    if(EM_fields_enabled == True):
+        self.fields_solver._q2_window = None
+
+    _release_advection_coefficients(self)
+    return(df_dt)
+
+def _release_advection_coefficients(self):
+    """
+    The advection coefficients are stored on the solver object since 
+    they are needed by the Riemann solvers. In the lean mode, these are
+    released once df_dt has been evaluated.
+    """
+    if(self.memory_lean == True):
+        self._C_q1 = self._C_q2 = None
+        self._C_p1 = self._C_p2 = self._C_p3 = None
+
+    return
+
+def _df_dt_fvm_block(f, self, q2_window = None):
+    """
+    Returns df/dt for the block of the local zone which is passed.
+
+    Parameters
+    ----------
+
+    f : af.Array
+        Array of the distribution function at which df_dt is to 
+        be evaluated.
+
+    q2_window: tuple
+               The (start, end) indices along q2 of the block in the local
+               zone(inclusive of the ghost zones), which may wrap around the
+               local zone(see slice_q2_window). None is passed when the 
+               complete local zone is evaluated.
+    """
+    # Position arrays and the size of the zone for the block considered:
+    q1_center = self.q1_center
+    q2_center = self.q2_center
+    N_q_local = None
+
+    if(q2_window is not None):
+        q1_center = slice_q2_window(q1_center, q2_window)
+        q2_center = slice_q2_window(q2_center, q2_window)
+        N_q_local = (f.shape[2] - 2 * self.N_ghost_q,
+                     f.shape[3] - 2 * self.N_ghost_q
+                    )
+
     # Giving shorter name references:
     reconstruction_in_q = self.physical_system.params.reconstruction_method_in_q
     reconstruction_in_p = self.physical_system.params.reconstruction_method_in_p
@@ -55,7 +189,7 @@ def df_dt_fvm(f, self):
     # af.broadcast used to perform batched operations on arrays of different sizes:
     self._C_q1, self._C_q2 = \
         af.broadcast(self._C_q, f, self.time_elapsed, 
-                     self.q1_center, self.q2_center,
+                     q1_center, q2_center,
                      self.p1_center, self.p2_center, self.p3_center,
                      self.physical_system.params
                     )
@@ -106,7 +240,7 @@ def df_dt_fvm(f, self):
            and self.physical_system.params.instantaneous_collisions != True
           ):
             df_dt += self._source(f, self.time_elapsed, 
-                                  self.q1_center, self.q2_center,
+                                  q1_center, q2_center,
                                   self.p1_center, self.p2_center, self.p3_center, 
                                   self.compute_moments, 
                                   self.physical_system.params, False
@@ -116,27 +250,17 @@ def df_dt_fvm(f, self):
        and self.physical_system.params.EM_fields_enabled == True
       ):
 
-        if(self.physical_system.params.fields_type == 'electrostatic'):
-            if(self.physical_system.params.fields_solver == 'fft'):
-                rho = multiply(self.physical_system.params.charge,
-                               self.compute_moments('density', f=f)
-                              )
-                self.fields_solver.compute_electrostatic_fields(rho)
-
-        if(self.physical_system.params.fields_type == 'user-defined'):
-            self.fields_solver.update_user_defined_fields(self.time_elapsed)
-
         (self._C_p1, self._C_p2, self._C_p3) = \
             af.broadcast(self._C_p, f, self.time_elapsed,
-                         self.q1_center, self.q2_center,
+                         q1_center, q2_center,
                          self.p1_center, self.p2_center, self.p3_center,
                          self.fields_solver, self.physical_system.params
                         )
 
-        self._C_p1 = self._convert_to_p_expanded(self._C_p1)
-        self._C_p2 = self._convert_to_p_expanded(self._C_p2)
-        self._C_p3 = self._convert_to_p_expanded(self._C_p3)
-        f          = self._convert_to_p_expanded(f)
+        self._C_p1 = self._convert_to_p_expanded(self._C_p1, N_q_local)
+        self._C_p2 = self._convert_to_p_expanded(self._C_p2, N_q_local)
+        self._C_p3 = self._convert_to_p_expanded(self._C_p3, N_q_local)
+        f          = self._convert_to_p_expanded(f, N_q_local)
 
         if(self.physical_system.params.riemann_solver_in_p == 'lax-friedrichs'):
             
@@ -218,18 +342,18 @@ def df_dt_fvm(f, self):
         top_flux_p2   = af.shift(bot_flux_p2,   0, -1)
         front_flux_p3 = af.shift(back_flux_p3,  0,  0, -1)
 
-        left_flux_p1  = self._convert_to_q_expanded(left_flux_p1)
-        right_flux_p1 = self._convert_to_q_expanded(right_flux_p1)
+        left_flux_p1  = self._convert_to_q_expanded(left_flux_p1, N_q_local)
+        right_flux_p1 = self._convert_to_q_expanded(right_flux_p1, N_q_local)
 
-        bot_flux_p2 = self._convert_to_q_expanded(bot_flux_p2)
-        top_flux_p2 = self._convert_to_q_expanded(top_flux_p2)
+        bot_flux_p2 = self._convert_to_q_expanded(bot_flux_p2, N_q_local)
+        top_flux_p2 = self._convert_to_q_expanded(top_flux_p2, N_q_local)
 
-        back_flux_p3  = self._convert_to_q_expanded(back_flux_p3)
-        front_flux_p3 = self._convert_to_q_expanded(front_flux_p3)
+        back_flux_p3  = self._convert_to_q_expanded(back_flux_p3, N_q_local)
+        front_flux_p3 = self._convert_to_q_expanded(front_flux_p3, N_q_local)
 
         df_dt += - (right_flux_p1 - left_flux_p1)/self.dp1 \
                  - (top_flux_p2   - bot_flux_p2 )/self.dp2 \
                  - (front_flux_p3 - back_flux_p3)/self.dp3
 
-    af.eval(df_dt)
+    eval_helper(df_dt)
     return(df_dt)
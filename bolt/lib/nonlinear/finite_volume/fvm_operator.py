@@ -1,12 +1,15 @@
 import arrayfire as af
 from .df_dt_fvm import df_dt_fvm
 from bolt.lib.nonlinear.utils.broadcasted_primitive_operations import multiply
+from bolt.lib.nonlinear.utils.lazy_evaluation import eval_planned
+from bolt.lib.nonlinear.utils.host_syncs import host_sync
 from bolt.lib.nonlinear.temporal_evolution import operator_splitting_methods as split
 
 def timestep_fvm(self, dt):
 
     f_initial = self.f
     self.f    = self.f + df_dt_fvm(self.f, self) * (dt / 2)
+    self.f    = self._cast_to_storage_precision(self.f)
     
     self._communicate_f()
     self._apply_bcs_f()
@@ -28,13 +31,54 @@ def timestep_fvm(self, dt):
 
             self.fields_solver.evolve_electrodynamic_fields(J1, J2, J3, dt)
 
+        # Evolving the electrostatic fields using Ampere's law(E^{n+1} from
+        # E^{n} using J^{n+1/2}). The evaluation at the midpoint uses
+        # E^{n+1/2} = (E^{n} + E^{n+1}) / 2, and E^{n+1} is restored after
+        # the same. On the clean-up steps, E^{n+1/2} is obtained by solving
+        # the Poisson equation, and is evolved by dt / 2 after the midpoint
+        # evaluation:
+        if(self.physical_system.params.fields_solver == 'ampere'):
+
+            J1 = multiply(self.physical_system.params.charge, 
+                          self.compute_moments('mom_v1_bulk')
+                         )  # (i + 1/2, j + 1/2)
+            J2 = multiply(self.physical_system.params.charge, 
+                          self.compute_moments('mom_v2_bulk')
+                         )  # (i + 1/2, j + 1/2)
+
+            ampere_cleanup = self.fields_solver.ampere_cleanup_due()
+            
+            if(ampere_cleanup == True):
+                rho = multiply(self.physical_system.params.charge,
+                               self.compute_moments('density')
+                              )
+                self.fields_solver.compute_electrostatic_fields(rho)
+
+            else:
+                E_n = self.fields_solver.cell_centered_EM_fields.copy()
+                self.fields_solver.evolve_electrostatic_fields_ampere(J1, J2, dt)
+                E_n_plus_1 = self.fields_solver.cell_centered_EM_fields
+
+                # The ghost zones of both are filled, and so are those of the average:
+                self.fields_solver.cell_centered_EM_fields = 0.5 * (E_n + E_n_plus_1)
+
         # Since it will be evaluated again at the midpoint
         if(self.physical_system.params.fields_type == 'user-defined'):
             self.time_elapsed += 0.5 * dt
 
     self.f = f_initial + df_dt_fvm(self.f, self) * dt
+    self.f = self._cast_to_storage_precision(self.f)
 
     if(self.physical_system.params.EM_fields_enabled == True):
+
+        # Obtaining E^{n+1} once the evaluation at the midpoint is done:
+        if(self.physical_system.params.fields_solver == 'ampere'):
+            if(ampere_cleanup == True):
+                self.fields_solver.evolve_electrostatic_fields_ampere(J1, J2, 0.5 * dt)
+
+            else:
+                self.fields_solver.cell_centered_EM_fields = E_n_plus_1
+
         # Subtracting the change made to avoid messing 
         # with the counter on timestep.py
         if(self.physical_system.params.fields_type == 'user-defined'):
@@ -49,6 +93,7 @@ def update_for_instantaneous_collisions(self, dt):
                           self.physical_system.params, 
                           True
                          )
+    self.f = self._cast_to_storage_precision(self.f)
 
     return
 
@@ -59,7 +104,9 @@ def op_fvm(self, dt):
     evaluation at the midpoint, we evaluate the currents(J^{n+0.5}) and 
     pass it to the FDTD algo when an electrodynamic case needs to be evolved.
     The FDTD algo updates the field values, which are used at the next
-    evaluation of df_dt.
+    evaluation of df_dt. With fields_solver = 'ampere', the same currents
+    evolve E to E^{n+1}, and the evaluation at the midpoint uses the
+    average of E^{n} and E^{n+1}.
 
     Parameters
     ----------
@@ -80,9 +127,9 @@ def op_fvm(self, dt):
         timestep_fvm(self, dt)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_fvm_solver += toc - tic
     
-    af.eval(self.f)
+    eval_planned(self.f)
     return
@@ -1,7 +1,11 @@
+import arrayfire as af
+
 from .reconstruction.minmod import reconstruct_minmod
 from .reconstruction.ppm import reconstruct_ppm
 from .reconstruction.weno5 import reconstruct_weno5
 
+from bolt.lib.nonlinear.utils.host_syncs import host_sync
+
 def reconstruct(self, input_array, axis, reconstruction_method):
     """
     Reconstructs the variation within a cell using the
@@ -41,7 +45,7 @@ def reconstruct(self, input_array, axis, reconstruction_method):
         raise NotImplementedError('Reconstruction method invalid/not-implemented')
     
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_reconstruct += toc - tic
 
@@ -1,5 +1,7 @@
 import arrayfire as af
 
+from bolt.lib.nonlinear.utils.lazy_evaluation import eval_helper
+
 # Adapted from grim(by Chandra et al.):
 def minmod(x, y, z):
 
@@ -12,7 +14,7 @@ def minmod(x, y, z):
     
     result = 0.25 * af.abs(signx + signy) * (signx + signz) * min_of_all
 
-    af.eval(result)
+    eval_helper(result)
     return result
 
 def slope_minmod(input_array, axis):
@@ -5,6 +5,9 @@ by the FVM routines.
 
 import arrayfire as af
 
+from bolt.lib.nonlinear.utils.lazy_evaluation import eval_helper
+from bolt.lib.nonlinear.utils.host_syncs import host_sync
+
 def upwind_flux(left_flux, right_flux, velocity):
     """
     Returns the flux, using the 1st order upwind flux Riemann solver.
@@ -27,7 +30,7 @@ def upwind_flux(left_flux, right_flux, velocity):
                      right_flux
                     )
     
-    af.eval(flux)
+    eval_helper(flux)
     return(flux)
 
 def lax_friedrichs_flux(left_flux, right_flux, left_f, right_f, c_lax):
@@ -57,7 +60,7 @@ def lax_friedrichs_flux(left_flux, right_flux, left_f, right_f, c_lax):
     
     flux = 0.5 * (left_flux + right_flux) - 0.5 * c_lax * (right_f - left_f)
 
-    af.eval(flux)
+    eval_helper(flux)
     return(flux)
 
 
@@ -161,7 +164,7 @@ def riemann_solver(self, left_flux, right_flux, left_f, right_f, method, dim):
         raise NotImplementedError('Riemann solver passed is invalid/not-implemented')
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_riemann += toc - tic
 
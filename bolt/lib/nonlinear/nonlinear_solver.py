@@ -38,11 +38,20 @@ from . import timestep
 
 from .file_io import dump
 from .file_io import load
+from .file_io import time_series
+from .file_io import checkpoint
+from .temporal_evolution import rollback
+from .file_io.async_writer import async_writer
 
 from .utils.bandwidth_test import bandwidth_test
 from .utils.print_with_indent import indent
 from .utils.performance_timings import print_table
 from .utils.broadcasted_primitive_operations import multiply
+from .utils.lazy_evaluation import eval_helper
+from .utils.lazy_evaluation import reset_jit_statistics, print_jit_diagnostics
+from .utils.host_syncs import reset_host_sync_count, get_host_sync_count, print_host_syncs
+from .utils.memory_report import memory_report
+from .utils import diagnostics
 from .compute_moments import compute_moments as compute_moments_imported
 from .fields.fields import fields_solver
 
@@ -58,7 +67,11 @@ class nonlinear_solver(object):
     compute_moments() method.  
     """
 
-    def __init__(self, physical_system, performance_test_flag = False):
+    def __init__(self, physical_system, performance_test_flag = False,
+                 lazy_evaluation = False, divergence_check_interval = 1,
+                 precision = 'double', rhs_blocks = 1, memory_lean = False,
+                 async_output = False, output_mode = 'shared'
+                ):
         """
         Constructor for the nonlinear_solver object. It takes the physical
         system object as an argument and uses it in intialization and
@@ -79,6 +92,66 @@ class nonlinear_solver(object):
                          nonlinear_solver. This system is then evolved, and
                          monitored using the various methods under the
                          nonlinear_solver class.
+
+        performance_test_flag: bool
+                               When True, the time consumed by each of the
+                               major solver routines is stored.
+
+        lazy_evaluation: bool
+                         When True, the helper routines of the solver no longer
+                         force the evaluation of their results. Evaluations then
+                         take place only at the planned points of each stage,
+                         allowing the ArrayFire JIT to fuse across function
+                         boundaries. The number of evaluations made may be
+                         checked using print_jit_diagnostics.
+
+        divergence_check_interval: int
+                                   Number of timesteps after which the distribution
+                                   function is checked for infinities/NaNs. Since the
+                                   check requires the host to wait on the device, it
+                                   may be carried out less frequently for production
+                                   runs. Passing 0 disables the check.
+
+        precision: str
+                   Precision policy used for the distribution function. With
+                   'double', all quantities are held in double precision. With
+                   'mixed', the distribution function is stored in single
+                   precision while the moments(and other conservation sensitive
+                   reductions) are accumulated in double precision. The buffers
+                   used for communication and the dumps of the distribution
+                   function then follow the storage precision.
+
+        rhs_blocks: int/str
+                    Number of blocks along q2 over which df_dt_fvm and 
+                    f_interp_p_3d are evaluated. Since the temporaries created
+                    are then of the size of a block, this bounds the peak memory
+                    usage for large velocity grids. When 'auto' is passed, the
+                    number of blocks is chosen using the memory which is available
+                    on the device.
+
+        memory_lean: bool
+                     When True, the arrays which aren't needed by the methods used
+                     are not held by the solver. This includes the initial state 
+                     f_initial, the advection coefficients(_C_q1, _C_q2, _C_p1..3)
+                     which are otherwise retained after each evaluation of df_dt, 
+                     and the field arrays used only by the FDTD solver(yee grid and
+                     time staggered values) when the fields aren't evolved using FDTD.
+                     The memory held may be checked using memory_report.
+
+        async_output: bool
+                      When True, the dump routines copy the data into a host
+                      staging buffer and return, while the file is written by
+                      a background thread(see file_io/async_writer.py). Before
+                      reading back the files written, wait_for_dumps needs to
+                      be called.
+
+        output_mode: str
+                     With 'shared', all the ranks write the dumps to a single
+                     file. With 'per_rank', each rank writes its local zone to
+                     its own file, while rank 0 writes a file with virtual 
+                     datasets presenting the global view of the data(see
+                     file_io/per_rank.py). This avoids the serialization of
+                     the collective writes at high rank counts.
         """
         self.physical_system = physical_system
 
@@ -110,6 +183,9 @@ class nonlinear_solver(object):
         
         # Declaring the communicator:
         self._comm = PETSc.COMM_WORLD.tompi4py()
+
+        # Number of host syncs made at each site by this solver:
+        self._host_syncs = {}
         if(self.physical_system.params.num_devices>1):
             af.set_device(self._comm.rank%self.physical_system.params.num_devices)
 
@@ -143,6 +219,38 @@ class nonlinear_solver(object):
         PETSc.Sys.syncFlush()
 
         self.performance_test_flag = performance_test_flag
+
+        # Setting the points at which the JIT is forced to evaluate. This
+        # is made active during the timesteps of this solver(see timestep.py):
+        self.lazy_evaluation = lazy_evaluation
+
+        self.divergence_check_interval = divergence_check_interval
+
+        # Setting the storage precision of the distribution function:
+        self.precision = precision
+
+        if(precision == 'double'):
+            self.dtype_f = af.Dtype.f64
+
+        elif(precision == 'mixed'):
+            self.dtype_f = af.Dtype.f32
+
+        else:
+            raise NotImplementedError('Precision policy invalid/not-implemented')
+
+        # Number of blocks used in evaluating the RHS:
+        if(rhs_blocks != 'auto' and (int(rhs_blocks) != rhs_blocks or rhs_blocks < 1)):
+            raise ValueError('rhs_blocks needs to be a positive integer or auto')
+
+        self.rhs_blocks    = rhs_blocks
+        self._N_rhs_blocks = {}
+
+        self.memory_lean = memory_lean
+
+        if(output_mode not in ['shared', 'per_rank']):
+            raise ValueError('output_mode needs to be shared or per_rank')
+
+        self.output_mode = output_mode
     
         # Initializing variables which are used to time the components of the solver: 
         if(performance_test_flag == True):
@@ -224,16 +332,31 @@ class nonlinear_solver(object):
         if(self.boundary_conditions.in_q1_left == 'shearing-box'):
             nproc_in_q2 = 1
 
+        dof_f = (  self.N_species 
+                 * (self.N_p1 + 2 * N_g_p) 
+                 * (self.N_p2 + 2 * N_g_p) 
+                 * (self.N_p3 + 2 * N_g_p)
+                )
+
+        # When the distribution function is stored in single precision, two
+        # values are packed into each double precision entry of the PETSc 
+        # vectors used for communication. Since the communication routines 
+        # only copy these entries, this halves the amount of data exchanged. 
+        # This is possible only when the DOF per zone is even:
+        self._pack_f_in_communication = (    precision == 'mixed'
+                                         and PETSc.ScalarType == np.float64
+                                         and dof_f % 2 == 0
+                                        )
+
+        if(self._pack_f_in_communication == True):
+            dof_f = dof_f // 2
+
         # DMDA is a data structure to handle a distributed structure 
         # grid and its related core algorithms. It stores metadata of
         # how the grid is partitioned when run in parallel which is 
         # utilized by the various methods of the solver.
         self._da_f = PETSc.DMDA().create([self.N_q1, self.N_q2],
-                                         dof           = (  self.N_species 
-                                                          * (self.N_p1 + 2 * N_g_p) 
-                                                          * (self.N_p2 + 2 * N_g_p) 
-                                                          * (self.N_p3 + 2 * N_g_p)
-                                                         ),
+                                         dof           = dof_f,
                                          stencil_width = N_g_q,
                                          boundary_type = (petsc_bc_in_q1,
                                                           petsc_bc_in_q2
@@ -286,21 +409,62 @@ class nonlinear_solver(object):
         self._glob_f  = self._da_f.createGlobalVec()
         self._local_f = self._da_f.createLocalVec()
 
-        # The following vector is used to dump the data to file:
-        self._glob_dump_f  = self._da_dump_f.createGlobalVec()
-        self._glob_moments = self._da_dump_moments.createGlobalVec()
+        # The vectors used to dump the data to file are allocated 
+        # upon first use by the FileIO routines(see file_io/dump.py):
+        self._glob_dump_f  = None
+        self._glob_moments = None
+
+        self._glob_dump_f_array  = None
+        self._glob_moments_array = None
+
+        # Writer used by the time series output(see file_io/time_series.py):
+        self._time_series = None
+
+        # Writer used when the dumps are written in the background:
+        if(async_output == True):
+            self._async_writer = async_writer(self._comm, self.N_q1, self.N_q2,
+                                              self._da_f
+                                             )
+        else:
+            self._async_writer = None
+
+        # Checkpoints written at the end of a timestep upon signals or when
+        # the walltime budget is exhausted(see file_io/checkpoint.py):
+        self._auto_checkpoint = None
+
+        # Ring buffer of accepted states used to roll back upon divergence
+        # (see temporal_evolution/rollback.py):
+        self._rollback    = None
+        self.rollback_log = []
+
+        # Method used for the advection in p-space by the semi-lagrangian
+        # solver(see semi_lagrangian/interpolation_routines.py). With 
+        # 'spectral', the advection is carried out using spectral shifts
+        # when the advection terms don't depend on p:
+        self._p_advection = getattr(physical_system.params, 'p_advection', 'interpolation')
+
+        if(self._p_advection not in ['interpolation', 'spectral']):
+            raise ValueError('p_advection needs to be interpolation or spectral')
+
+        # The spectral shifts take the grid in p-space to be periodic:
+        if(self._p_advection == 'spectral' and N_g_p != 0):
+            raise ValueError('p_advection = spectral needs N_ghost_p = 0')
+
+        # Wavenumbers along p used when the advection in p-space is carried
+        # out spectrally:
+        self._p_wavenumbers = None
+
+        # Registry of the in-situ diagnostics(see utils/diagnostics.py):
+        self._diagnostics = diagnostics._initialize_diagnostics(self)
 
         # Getting the arrays for the above vectors:
         self._glob_f_array  = self._glob_f.getArray()
         self._local_f_array = self._local_f.getArray()
 
-        self._glob_moments_array = self._glob_moments.getArray()
-        self._glob_dump_f_array  = self._glob_dump_f.getArray()
-
-        # Setting names for the objects which will then be
-        # used as the key identifiers for the HDF5 files:
-        PETSc.Object.setName(self._glob_dump_f, 'distribution_function')
-        PETSc.Object.setName(self._glob_moments, 'moments')
+        # Viewing the packed entries as single precision values:
+        if(self._pack_f_in_communication == True):
+            self._glob_f_array  = self._glob_f_array.view(np.float32)
+            self._local_f_array = self._local_f_array.view(np.float32)
 
         # Obtaining the array values of the cannonical variables:
         self.q1_center, self.q2_center                 = self._calculate_q_center()
@@ -352,8 +516,10 @@ class nonlinear_solver(object):
                                              )[:, :, -N_g_q:]
 
         # Assigning the value to the PETSc Vecs(for dump at t = 0):
-        (af.flat(self.f)).to_ndarray(self._local_f_array)
-        (af.flat(self.f[:, :, N_g_q:-N_g_q, N_g_q:-N_g_q])).to_ndarray(self._glob_f_array)
+        (af.flat(self._cast_for_communication(self.f))).\
+            to_ndarray(self._local_f_array)
+        (af.flat(self._cast_for_communication(self.f[:, :, N_g_q:-N_g_q, N_g_q:-N_g_q]))).\
+            to_ndarray(self._glob_f_array)
 
         # Assigning the function objects to methods of the solver:
         self._A_q = physical_system.A_q
@@ -364,10 +530,57 @@ class nonlinear_solver(object):
         # Source/Sink term:
         self._source = physical_system.source
 
-        # Initializing a variable to track time-elapsed:
+        # Since tau doesn't vary with time, the zones for which the collisions
+        # are instantaneous are determined once here, instead of at every
+        # call to op_solve_src. The mask is held only when such zones exist:
+        tau = physical_system.params.tau(self.q1_center, self.q2_center,
+                                         self.p1_center, self.p2_center, 
+                                         self.p3_center
+                                        )
+        if(af.any_true(tau == 0)):
+            self._tau_zero_mask = (tau == 0)
+        else:
+            self._tau_zero_mask = None
+
+        # Initializing variables to track time-elapsed
+        # and the number of timesteps taken:
         self.time_elapsed = 0
+        self.time_step    = 0
+
+        # The JIT diagnostics and the host syncs only account
+        # for the operations after the initialization of the solver:
+        self.reset_jit_statistics()
+        self.reset_host_sync_count()
 
-    def _convert_to_q_expanded(self, array):
+    def _cast_to_storage_precision(self, array):
+        """
+        Casts the array to the precision in which the distribution
+        function is stored. The operations carried out on the distribution
+        function involve arrays held in double precision(such as p_center),
+        which promotes the result to double precision. This is used at the
+        end of each update to restore the storage precision.
+        """
+        if(array.dtype() != self.dtype_f):
+            array = af.cast(array, self.dtype_f)
+
+        return(array)
+
+    def _cast_for_communication(self, array):
+        """
+        Casts the array to the precision of the buffers used in 
+        communicating the distribution function. The packed buffers 
+        hold single precision values, while the others hold values 
+        in double precision.
+        """
+        if(self._pack_f_in_communication == True):
+            return(self._cast_to_storage_precision(array))
+
+        elif(array.dtype() != af.Dtype.f64):
+            array = af.cast(array, af.Dtype.f64)
+
+        return(array)
+
+    def _convert_to_q_expanded(self, array, N_q_local = None):
         """
         Since we are limited to use 4D arrays due to
         the bound from ArrayFire, we define 2 forms
@@ -379,10 +592,17 @@ class nonlinear_solver(object):
         
         This function converts the input array from
         p_expanded to q_expanded form.
+
+        The size of the local zone(non-inclusive of the ghost zones) may
+        be passed as the tuple N_q_local = (N_q1_local, N_q2_local) when
+        the array holds only a block of the local zone.
         """
         # Obtaining start coordinates for the local zone
         # Additionally, we also obtain the size of the local zone
         ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_f.getCorners()
+
+        if(N_q_local is not None):
+            N_q1_local, N_q2_local = N_q_local
      
         array = af.moddims(array,
                              (self.N_p1 + 2 * self.N_ghost_p) 
@@ -393,10 +613,10 @@ class nonlinear_solver(object):
                            (N_q2_local + 2 * self.N_ghost_q)
                           )
 
-        af.eval(array)
+        eval_helper(array)
         return (array)
 
-    def _convert_to_p_expanded(self, array):
+    def _convert_to_p_expanded(self, array, N_q_local = None):
         """
         Since we are limited to use 4D arrays due to
         the bound from ArrayFire, we define 2 forms
@@ -408,10 +628,17 @@ class nonlinear_solver(object):
         
         This function converts the input array from
         q_expanded to p_expanded form.
+
+        The size of the local zone(non-inclusive of the ghost zones) may
+        be passed as the tuple N_q_local = (N_q1_local, N_q2_local) when
+        the array holds only a block of the local zone.
         """
         # Obtaining start coordinates for the local zone
         # Additionally, we also obtain the size of the local zone
         ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_f.getCorners()
+
+        if(N_q_local is not None):
+            N_q1_local, N_q2_local = N_q_local
         
         array = af.moddims(array,
                            self.N_p1 + 2 * self.N_ghost_p, 
@@ -422,7 +649,7 @@ class nonlinear_solver(object):
                            * (N_q2_local + 2 * self.N_ghost_q)
                           )
 
-        af.eval(array)
+        eval_helper(array)
         return (array)
 
     def _calculate_q_center(self):
@@ -630,8 +857,13 @@ class nonlinear_solver(object):
                               initialize_f, self.q1_center, self.q2_center,
                               self.p1_center, self.p2_center, self.p3_center, params
                              )
+        self.f = self._cast_to_storage_precision(self.f)
 
-        self.f_initial = self.f
+        # Not retained in the lean mode, since a copy is made when f is updated:
+        if(self.memory_lean == True):
+            self.f_initial = None
+        else:
+            self.f_initial = self.f
 
         if(self.physical_system.params.EM_fields_enabled):
             rho_initial = multiply(self.physical_system.params.charge,
@@ -642,8 +874,11 @@ class nonlinear_solver(object):
                                                self.dq1, self.dq2, self._comm,
                                                self.boundary_conditions, 
                                                self.physical_system.params,
-                                               rho_initial, self.performance_test_flag
+                                               rho_initial, self.performance_test_flag,
+                                               memory_lean = self.memory_lean
                                               )
+            # The syncs of the fields solver are counted along with those of this solver:
+            self.fields_solver._host_syncs = self._host_syncs
         
     # Injection of solver functions into class as methods:
     _communicate_f      = communicate.\
@@ -660,8 +895,39 @@ class nonlinear_solver(object):
     dump_distribution_function = dump.dump_distribution_function
     dump_moments               = dump.dump_moments
     dump_EM_fields             = dump.dump_EM_fields
+    release_dump_buffers       = dump.release_dump_buffers
+    wait_for_dumps             = dump.wait_for_dumps
+
+    _fill_moments_buffer   = dump._fill_moments_buffer
+    _fill_dump_f_buffer    = dump._fill_dump_f_buffer
+    _fill_EM_fields_buffer = dump._fill_EM_fields_buffer
+
+    open_time_series   = time_series.open_time_series
+    append_time_series = time_series.append_time_series
+    close_time_series  = time_series.close_time_series
 
     load_distribution_function = load.load_distribution_function
     load_EM_fields             = load.load_EM_fields
+
+    save_checkpoint = checkpoint.save_checkpoint
+    load_checkpoint = checkpoint.load_checkpoint
+
+    enable_auto_checkpoint  = checkpoint.enable_auto_checkpoint
+    disable_auto_checkpoint = checkpoint.disable_auto_checkpoint
+
+    enable_rollback  = rollback.enable_rollback
+    disable_rollback = rollback.disable_rollback
+
+    register_diagnostic  = diagnostics.register_diagnostic
+    enable_diagnostics   = diagnostics.enable_diagnostics
+    evaluate_diagnostics = diagnostics.evaluate_diagnostics
+    flush_diagnostics    = diagnostics.flush_diagnostics
+    close_diagnostics    = diagnostics.close_diagnostics
     
     print_performance_timings  = print_table
+    print_jit_diagnostics      = print_jit_diagnostics
+    reset_jit_statistics       = reset_jit_statistics
+    print_host_syncs           = print_host_syncs
+    reset_host_sync_count      = reset_host_sync_count
+    get_host_sync_count        = get_host_sync_count
+    memory_report              = memory_report
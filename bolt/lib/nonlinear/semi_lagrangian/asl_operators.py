@@ -14,6 +14,8 @@ import arrayfire as af
 from ..temporal_evolution import integrators
 from .interpolation_routines import f_interp_2d, f_interp_p_3d
 from bolt.lib.nonlinear.utils.broadcasted_primitive_operations import multiply
+from bolt.lib.nonlinear.utils.lazy_evaluation import eval_planned
+from bolt.lib.nonlinear.utils.host_syncs import host_sync
 
 # Advection in q-space:
 def op_advect_q(self, dt):
@@ -52,20 +54,18 @@ def op_solve_src(self, dt):
         tic = af.time()
 
     # Solving for tau = 0 systems:
-    tau = self.physical_system.params.tau(self.q1_center, self.q2_center,
-                                          self.p1_center, self.p2_center, 
-                                          self.p3_center
-                                         )
-    if(af.any_true(tau == 0)):
+    # The mask is determined once when the solver is declared:
+    if(self._tau_zero_mask is not None):
         
-        self.f = af.select(tau == 0, 
-                           self._source(self.f, self.time_elapsed,
-                                        self.q1_center, self.q2_center,
-                                        self.p1_center, self.p2_center, 
-                                        self.p3_center, self.compute_moments, 
-                                        self.physical_system.params, 
-                                        True
-                                       ),
+        f_src  = self._source(self.f, self.time_elapsed,
+                              self.q1_center, self.q2_center,
+                              self.p1_center, self.p2_center, 
+                              self.p3_center, self.compute_moments, 
+                              self.physical_system.params, 
+                              True
+                             )
+        self.f = af.select(self._tau_zero_mask, 
+                           self._cast_to_storage_precision(f_src),
                            self.f
                           )
     
@@ -76,9 +76,11 @@ def op_solve_src(self, dt):
                              self.p3_center, self.compute_moments, 
                              self.physical_system.params
                             )
-    
+    self.f = self._cast_to_storage_precision(self.f)
+    eval_planned(self.f)
+
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_sourcets += toc - tic
     
@@ -99,12 +101,32 @@ def op_fields(self, dt):
     if(self.performance_test_flag == True):
         tic = af.time()
     
-    if(self.physical_system.params.fields_solver == 'electrostatic'):
+    if(self.physical_system.params.fields_solver in ['electrostatic', 'multigrid']):
         rho = multiply(self.physical_system.params.charge,
                        self.compute_moments('density')
                       )
         self.fields_solver.compute_electrostatic_fields(rho)
     
+    # Evolving the electrostatic fields using Ampere's law, with the
+    # Poisson equation solved in place of the same on a cadence:
+    if(self.physical_system.params.fields_solver == 'ampere'):
+        
+        if(self.fields_solver.ampere_cleanup_due() == True):
+            rho = multiply(self.physical_system.params.charge,
+                           self.compute_moments('density')
+                          )
+            self.fields_solver.compute_electrostatic_fields(rho)
+
+        else:
+            J1 = multiply(self.physical_system.params.charge, 
+                          self.compute_moments('mom_v1_bulk')
+                         )
+            J2 = multiply(self.physical_system.params.charge, 
+                          self.compute_moments('mom_v2_bulk')
+                         )
+
+            self.fields_solver.evolve_electrostatic_fields_ampere(J1, J2, dt)
+
     # Evolving fields:
     if(self.physical_system.params.fields_solver == 'fdtd'):
         
@@ -121,10 +143,10 @@ def op_fields(self, dt):
         self.fields_solver.evolve_electrodynamic_fields(J1, J2, J3, dt)
 
     f_interp_p_3d(self, dt)
-    af.eval(self.f)
+    eval_planned(self.f)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_fieldstep += toc - tic
     
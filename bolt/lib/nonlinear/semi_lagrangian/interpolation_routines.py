@@ -4,7 +4,11 @@
 import arrayfire as af
 import numpy as np
 
-from bolt.lib.nonlinear.utils.broadcasted_primitive_operations import add
+from bolt.lib.nonlinear.utils.broadcasted_primitive_operations import add, multiply
+from bolt.lib.nonlinear.utils.lazy_evaluation import eval_planned
+from bolt.lib.nonlinear.utils.host_syncs import host_sync
+from bolt.lib.nonlinear.utils.rhs_blocks import get_N_rhs_blocks, get_q2_blocks, \
+                                               temporaries_f_interp_p_3d
 
 def f_interp_2d(self, dt):
     """
@@ -48,11 +52,12 @@ def f_interp_2d(self, dt):
 
     # Reordering from (N_q1, N_q2, N_s, dof) --> (dof, N_s, N_q1, N_q2)
     self.f = af.reorder(self.f, 3, 2, 0, 1)
+    self.f = self._cast_to_storage_precision(self.f)
 
-    af.eval(self.f)
+    eval_planned(self.f)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_interp2 += toc - tic
 
@@ -73,6 +78,10 @@ def f_interp_p_3d(self, dt):
     dt : double
          Time-step size to evolve the system
 
+    When params.p_advection = 'spectral' is set and the advection terms
+    returned by A_p don't depend on p, the advection is instead carried
+    out using spectral shifts(see _f_shift_p_spectral).
+
     NOTE: This function currently makes use of a Strang split approx1, approx2 with
           reorders to apply along the intended axes. With implementation of approx3
           complete this would be changed to make use of a single call of approx3.
@@ -81,12 +90,90 @@ def f_interp_p_3d(self, dt):
     # Following Strang Splitting:
     if(self.performance_test_flag == True):
         tic = af.time()
-    
-    (A_p1, A_p2, A_p3) = af.broadcast(self._A_p, self.f, self.time_elapsed,
-                                      self.q1_center, self.q2_center,
+
+    N_blocks = get_N_rhs_blocks(self, temporaries_f_interp_p_3d)
+
+    if(N_blocks == 1 or self.f.numdims() < 4):
+        self.f = _f_interp_p_3d_block(self, self.f, dt)
+
+    else:
+        # Since the interpolations in p-space are local to each zone,
+        # the blocks are evaluated without any overlap:
+        blocks = get_q2_blocks(self.f.shape[3], N_blocks)
+        f_new  = af.constant(0, self.f.shape[0], self.f.shape[1], 
+                             self.f.shape[2], self.f.shape[3], 
+                             dtype = self.f.dtype()
+                            )
+        
+        for block in blocks:
+            
+            if(self.physical_system.params.EM_fields_enabled == True):
+                self.fields_solver._q2_window = block
+
+            f_new[:, :, :, block[0]:block[1]] = \
+                _f_interp_p_3d_block(self, self.f[:, :, :, block[0]:block[1]], 
+                                     dt, block
+                                    )
+            eval_planned(f_new)
+
+        if(self.physical_system.params.EM_fields_enabled == True):
+            self.fields_solver._q2_window = None
+
+        self.f = f_new
+
+    self.f = self._cast_to_storage_precision(self.f)
+    eval_planned(self.f)
+
+    if(self.performance_test_flag == True):
+        host_sync(self, 'performance_timing')
+        toc = af.time()
+        self.time_interp3 += toc - tic
+
+    return
+
+def _f_interp_p_3d_block(self, f, dt, q2_window = None):
+    """
+    Returns the result of the interpolations in p-space for the
+    block of the local zone which is passed.
+
+    Parameters
+    ----------
+
+    f : af.Array
+        Array of the distribution function for the block.
+
+    dt : double
+         Time-step size to evolve the system
+
+    q2_window: tuple
+               The (start, end) indices along q2 of the block in the local
+               zone(inclusive of the ghost zones). None is passed when the 
+               complete local zone is evaluated.
+    """
+    # Position arrays and the size of the zone for the block considered:
+    q1_center = self.q1_center
+    q2_center = self.q2_center
+    N_q_local = None
+
+    if(q2_window is not None):
+        q1_center = q1_center[:, :, :, q2_window[0]:q2_window[1]]
+        q2_center = q2_center[:, :, :, q2_window[0]:q2_window[1]]
+        N_q_local = (f.shape[2] - 2 * self.N_ghost_q,
+                     f.shape[3] - 2 * self.N_ghost_q
+                    )
+
+    (A_p1, A_p2, A_p3) = af.broadcast(self._A_p, f, self.time_elapsed,
+                                      q1_center, q2_center,
                                       self.p1_center, self.p2_center, self.p3_center,
                                       self.fields_solver, self.physical_system.params
                                      )
+
+    # When the advection terms are returned without the velocity axis, 
+    # the characteristics are shifts which are the same for all p:
+    if(    self._p_advection == 'spectral'
+       and A_p1.shape[0] == 1 and A_p2.shape[0] == 1 and A_p3.shape[0] == 1
+      ):
+        return(_f_shift_p_spectral(self, f, A_p1, A_p2, A_p3, dt, N_q_local))
     
     # Using the add method wrapped with af.broadcast
     p1_new = add(self.p1_center, - dt * A_p1)
@@ -95,8 +182,8 @@ def f_interp_p_3d(self, dt):
     # Since the interpolation function are being performed in velocity space,
     # the arrays used in the computation need to be in p_expanded form.
     # Hence we will need to convert the same:
-    p1_new = self._convert_to_p_expanded(p1_new)
-    p2_new = self._convert_to_p_expanded(p2_new)
+    p1_new = self._convert_to_p_expanded(p1_new, N_q_local)
+    p2_new = self._convert_to_p_expanded(p2_new, N_q_local)
 
     # Transforming interpolant to go from [0, N_p - 1]:
     p1_lower_boundary = self.p1_start + 0.5 * self.dp1
@@ -108,49 +195,110 @@ def f_interp_p_3d(self, dt):
     if(self.physical_system.params.p_dim == 3):        
         
         p3_new = add(self.p3_center, - 0.5 * dt * A_p3)
-        p3_new = self._convert_to_p_expanded(p3_new)
+        p3_new = self._convert_to_p_expanded(p3_new, N_q_local)
         p3_lower_boundary = self.p3_start + 0.5 * self.dp3
     
         # Reordering from (N_p1, N_p2, N_p3, N_s * N_q) --> (N_p3, N_p1, N_p2, N_s * N_q)
         p3_interpolant = af.reorder((p3_new - p3_lower_boundary) / self.dp3, 2, 0, 1, 3)
 
     # We perform the 3d interpolation by performing individual 1d + 2d interpolations: 
-    self.f = self._convert_to_p_expanded(self.f)
+    f = self._convert_to_p_expanded(f, N_q_local)
     
     if(self.physical_system.params.p_dim == 3):
         
         # Reordering from (N_p1, N_p2, N_p3, N_s * N_q) --> (N_p3, N_p1, N_p2, N_s * N_q)
-        self.f = af.approx1(af.reorder(self.f, 2, 0, 1, 3),
-                            p3_interpolant, 
-                            af.INTERP.CUBIC_SPLINE
-                           )
+        f = af.approx1(af.reorder(f, 2, 0, 1, 3),
+                       p3_interpolant, 
+                       af.INTERP.CUBIC_SPLINE
+                      )
 
         # Reordering back from (N_p1, N_p2, N_p3, N_s * N_q) --> (N_p3, N_p1, N_p2, N_s * N_q)
-        self.f = af.reorder(self.f, 1, 2, 0, 3)
+        f = af.reorder(f, 1, 2, 0, 3)
 
-    self.f = af.approx2(self.f,
-                        p1_interpolant,
-                        p2_interpolant,
-                        af.INTERP.BICUBIC_SPLINE
-                       )
+    f = af.approx2(f,
+                   p1_interpolant,
+                   p2_interpolant,
+                   af.INTERP.BICUBIC_SPLINE
+                  )
 
     if(self.physical_system.params.p_dim == 3):
         
         # Reordering from (N_p1, N_p2, N_p3, N_s * N_q) --> (N_p3, N_p1, N_p2, N_s * N_q)
-        self.f = af.approx1(af.reorder(self.f, 2, 0, 1, 3),
-                            p3_interpolant, 
-                            af.INTERP.CUBIC_SPLINE
-                           )
+        f = af.approx1(af.reorder(f, 2, 0, 1, 3),
+                       p3_interpolant, 
+                       af.INTERP.CUBIC_SPLINE
+                      )
 
         # Reordering back from (N_p1, N_p2, N_p3, N_s * N_q) --> (N_p3, N_p1, N_p2, N_s * N_q)
-        self.f = af.reorder(self.f, 1, 2, 0, 3)
+        f = af.reorder(f, 1, 2, 0, 3)
 
-    self.f = self._convert_to_q_expanded(self.f)
-    af.eval(self.f)
+    f = self._convert_to_q_expanded(f, N_q_local)
 
-    if(self.performance_test_flag == True):
-        af.sync()
-        toc = af.time()
-        self.time_interp3 += toc - tic
+    return(f)
 
-    return
+def _get_p_wavenumbers(self):
+    """
+    Returns the wavenumbers along p1, p2, p3(in the order used by the FFT)
+    for the grid in p-space inclusive of the ghost zones, with shapes
+    (N_p1, 1, 1, 1), (1, N_p2, 1, 1) and (1, 1, N_p3, 1) respectively.
+    These are computed on the first call and held after.
+    """
+    if(self._p_wavenumbers is None):
+        
+        self._p_wavenumbers = []
+        for (axis, N_p, dp) in [(0, self.N_p1, self.dp1), 
+                                (1, self.N_p2, self.dp2), 
+                                (2, self.N_p3, self.dp3)
+                               ]:
+            k     = 2 * np.pi * np.fft.fftfreq(N_p + 2 * self.N_ghost_p, dp)
+            shape = [1, 1, 1, 1]
+            
+            shape[axis] = k.size
+            self._p_wavenumbers.append(af.moddims(af.to_array(k), *shape))
+
+    return(self._p_wavenumbers)
+
+def _f_shift_p_spectral(self, f, A_p1, A_p2, A_p3, dt, N_q_local = None):
+    """
+    Returns f advected in p-space for advection terms which don't depend
+    on p. In this case, f is shifted by dt * A_p in each of the zones, 
+    which is carried out exactly by multiplying the FFT of f along p1, p2, 
+    p3 by the phase exp(-i k.A_p dt). Unlike the interpolations, the grid 
+    in p-space is taken to be periodic, which requires f to be negligible 
+    at the boundaries in p-space.
+
+    Parameters
+    ----------
+
+    f : af.Array
+        Array of the distribution function for the block.
+
+    A_p1, A_p2, A_p3 : af.Array
+                       Advection terms in p-space of shape (1, N_s, N_q1, N_q2)
+                       (or (1, 1, N_q1, N_q2) when same for all the species).
+
+    dt : double
+         Time-step size to evolve the system
+
+    N_q_local: tuple
+               Size of the block(non-inclusive of the ghost zones) passed 
+               to _convert_to_p_expanded. None for the complete local zone.
+    """
+    k1, k2, k3 = _get_p_wavenumbers(self)
+
+    # Shifts of each of the zones along axis 3, as in the p_expanded form:
+    def to_p_expanded(A_p):
+        A_p = af.tile(A_p, 1, f.shape[1] // A_p.shape[1])
+        return(af.moddims(A_p, 1, 1, 1, A_p.elements()))
+
+    phase = add(multiply(k1, to_p_expanded(A_p1)), multiply(k2, to_p_expanded(A_p2)))
+
+    if(self.physical_system.params.p_dim == 3):
+        phase = add(phase, multiply(k3, to_p_expanded(A_p3)))
+
+    f_hat = af.fft3(self._convert_to_p_expanded(f, N_q_local))
+    f     = af.real(af.ifft3(f_hat * af.cplx(af.cos(dt * phase), -af.sin(dt * phase))))
+
+    f = self._convert_to_q_expanded(f, N_q_local)
+
+    return(f)
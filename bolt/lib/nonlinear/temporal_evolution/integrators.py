@@ -3,13 +3,15 @@
 
 import arrayfire as af
 
+from bolt.lib.nonlinear.utils.lazy_evaluation import eval_helper
+
 def RK2(dx_dt, x_initial, dt, *args):
 
     # Obtaining value at midpoint(dt/2)
     x = x_initial + dx_dt(x_initial, *args) * (dt / 2)
     x = x_initial + dx_dt(x, *args) * dt
 
-    af.eval(x)
+    eval_helper(x)
     return(x)
 
 def RK4(dx_dt, x_initial, dt, *args):
@@ -24,7 +26,7 @@ def RK4(dx_dt, x_initial, dt, *args):
 
     x = x_initial + ((k1 + 2 * k2 + 2 * k3 + k4) / 6) * dt
 
-    af.eval(x)
+    eval_helper(x)
     return(x)
 
 def RK5(dx_dt, x_initial, dt, *args):
@@ -54,5 +56,5 @@ def RK5(dx_dt, x_initial, dt, *args):
                               + (2 / 11) * k6
                              ) * dt
 
-    af.eval(x)
+    eval_helper(x)
     return(x)
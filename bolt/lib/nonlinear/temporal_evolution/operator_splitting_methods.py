@@ -127,9 +127,11 @@ def swss(self, op1, op2, dt):
         self.fields_solver.cell_centered_EM_fields = 0.5 * (  self.fields_solver.cell_centered_EM_fields 
                                                              + cell_centered_EM_fields_intermediate
                                                            )
-        self.fields_solver.yee_grid_EM_fields      = 0.5 * (  self.fields_solver.yee_grid_EM_fields
-                                                            + yee_grid_EM_fields_intermediate
-                                                           )
+        # Not held in the lean mode when FDTD isn't used:
+        if(self.fields_solver.yee_grid_EM_fields is not None):
+            self.fields_solver.yee_grid_EM_fields = 0.5 * (  self.fields_solver.yee_grid_EM_fields
+                                                           + yee_grid_EM_fields_intermediate
+                                                          )
 
     return
 
@@ -209,8 +211,10 @@ def jia(self, op1, op2, dt):
         self.fields_solver.cell_centered_EM_fields = (2 / 3)*(  cell_centered_EM_fields_intermediate1
                                                               + cell_centered_EM_fields_intermediate2
                                                              ) - (1 / 3) * self.cell_centered_EM_fields
-        self.fields_solver.yee_grid_EM_fields      = (2 / 3)*(  yee_grid_EM_fields_intermediate1
-                                                              + yee_grid_EM_fields_intermediate2
-                                                             ) - (1 / 3) * self.yee_grid_EM_fields
+        # Not held in the lean mode when FDTD isn't used:
+        if(self.fields_solver.yee_grid_EM_fields is not None):
+            self.fields_solver.yee_grid_EM_fields = (2 / 3)*(  yee_grid_EM_fields_intermediate1
+                                                             + yee_grid_EM_fields_intermediate2
+                                                            ) - (1 / 3) * self.yee_grid_EM_fields
 
     return
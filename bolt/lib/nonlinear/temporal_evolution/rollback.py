@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Contains the routines used in rolling back the solver to a previously
+accepted state when the solution diverges, instead of terminating the run.
+
+When enabled, a ring buffer of the last N_states accepted states(the
+distribution function, the field arrays, the currents held by the
+sub-cycled FDTD solver and the time counters) is held in device memory.
+Upon divergence, the solver is restored to the latest of these states
+which is finite, and the steps from the same are retried with a reduced
+timestep(by taking substeps), and optionally with a more diffusive
+reconstruction. This is repeated with further reduced timesteps up to a
+retry budget, after which the run is terminated as before.
+
+Since each state holds a copy of f, the memory used grows with N_states.
+"""
+
+from collections import deque
+
+import numpy as np
+import arrayfire as af
+from petsc4py import PETSc
+from mpi4py import MPI
+
+# Arrays of the fields solver which are held in the states:
+_field_arrays = ['cell_centered_EM_fields',
+                 'cell_centered_EM_fields_at_n',
+                 'cell_centered_EM_fields_at_n_plus_half',
+                 'yee_grid_EM_fields'
+                ]
+
+class solver_diverging(Exception):
+    """
+    Raised by check_divergence when the solution diverges and rollback
+    has been enabled, so that the step may be retried.
+    """
+    pass
+
+def enable_rollback(self, N_states = 2, max_retries = 3, dt_reduction = 0.5,
+                    fallback_reconstruction = None
+                   ):
+    """
+    Enables rolling back to a previously accepted state upon divergence.
+
+    Parameters
+    ----------
+
+    N_states : int
+               Number of accepted states held. When divergence_check_interval
+               is greater than 1, this needs to cover the steps between checks
+               for a finite state to be available.
+
+    max_retries : int
+                  Number of retries made for a step, with the timestep reduced
+                  by dt_reduction at each retry. When exhausted, the run is
+                  terminated.
+
+    dt_reduction : double
+                   Factor by which the timestep is reduced at each retry. The
+                   interval of the original step is covered using substeps.
+
+    fallback_reconstruction : str
+                              When passed(e.g. 'minmod'), this reconstruction
+                              method is used in q and p-space by the FVM while
+                              retrying.
+
+    Examples
+    --------
+
+    >> solver.enable_rollback(N_states = 2, max_retries = 3,
+                              fallback_reconstruction = 'minmod'
+                             )
+
+    The retries made are held in solver.rollback_log.
+    """
+    self._rollback = {'states'                  : deque(maxlen = N_states),
+                      'max_retries'             : max_retries,
+                      'dt_reduction'            : dt_reduction,
+                      'fallback_reconstruction' : fallback_reconstruction
+                     }
+    self.rollback_log = []
+    return
+
+def disable_rollback(self):
+    """
+    Disables rolling back upon divergence, releasing the states held.
+    """
+    self._rollback = None
+    return
+
+def save_state(self):
+    """
+    Pushes the present state of the solver into the ring buffer.
+    """
+    state = {'f'            : self.f.copy(),
+             'time_elapsed' : self.time_elapsed,
+             'time_step'    : self.time_step,
+             'fields'       : {}
+            }
+
+    if(self.physical_system.params.EM_fields_enabled == True):
+        for name in _field_arrays:
+            array = getattr(self.fields_solver, name)
+            if(array is not None):
+                state['fields'][name] = array.copy()
+
+        state['fields_at_n'] = self.fields_solver.at_n
+
+        # Currents at (n - 1/2) used when FDTD is sub-cycled:
+        J_previous = self.fields_solver._J_previous
+        if(J_previous is not None):
+            J_previous = tuple(J.copy() for J in J_previous)
+
+        state['J_previous'] = J_previous
+
+    self._rollback['states'].append(state)
+    return
+
+def restore_latest_finite_state(self):
+    """
+    Restores the solver to the latest state held which is finite on all
+    the ranks, discarding the states after the same. Returns False when
+    no such state is held.
+    """
+    states = self._rollback['states']
+
+    while(len(states) > 0):
+        state = states[-1]
+
+        diverged = not np.isfinite(af.sum(state['f']))
+        if(self._comm.allreduce(diverged, op = MPI.LOR) == False):
+            break
+
+        states.pop()
+
+    if(len(states) == 0):
+        return(False)
+
+    # Copies are restored, since the state may be needed by further retries:
+    self.f            = state['f'].copy()
+    self.time_elapsed = state['time_elapsed']
+    self.time_step    = state['time_step']
+
+    for name, array in state['fields'].items():
+        setattr(self.fields_solver, name, array.copy())
+
+    if('fields_at_n' in state):
+        self.fields_solver.at_n        = state['fields_at_n']
+        self.fields_solver._J_previous = state['J_previous']
+
+        # Dropping the products with q/m held by get_lorentz_fields, which
+        # are of the fields at the time of divergence:
+        self.fields_solver._lorentz_fields = {}
+
+    return(True)
+
+def log_retry(self, retry, dt, N_substeps):
+    """
+    Records the retry made, and prints the same.
+    """
+    self.rollback_log.append({'time_step'  : self.time_step,
+                              'time'       : self.time_elapsed,
+                              'retry'      : retry,
+                              'dt'         : dt,
+                              'N_substeps' : N_substeps
+                             })
+
+    PETSc.Sys.Print('Solver diverged: rolled back to timestep', self.time_step,
+                    '(t = %.6e)'%self.time_elapsed, ': retry', retry,
+                    'with', N_substeps, 'substeps of dt = %.6e'%dt
+                   )
+    return
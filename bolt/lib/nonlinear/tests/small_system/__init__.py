@@ -0,0 +1,62 @@
+"""
+A small periodic 1V system(Maxwellian with a cosine perturbation along q1),
+which is used by the tests that need to declare a complete nonlinear_solver
+object. Since the solver modifies the mass and charge held by params, a 
+fresh copy of params is made each time make_solver is called.
+"""
+
+import types
+
+from bolt.lib.physical_system import physical_system
+from bolt.lib.nonlinear.nonlinear_solver import nonlinear_solver
+
+import bolt.src.nonrelativistic_boltzmann.advection_terms as advection_terms
+import bolt.src.nonrelativistic_boltzmann.collision_operator as collision_operator
+import bolt.src.nonrelativistic_boltzmann.moments as moments
+
+from . import domain
+from . import boundary_conditions
+from . import params
+from . import initialize
+
+def _copy_module(module, overrides):
+    """
+    Returns a copy of the values held by the module, with the
+    attributes passed in overrides being replaced.
+    """
+    attributes = dict((a, getattr(module, a)) for a in dir(module)
+                      if not (a.startswith('_') or a in ['np', 'af'])
+                     )
+    attributes.update(overrides or {})
+
+    return(types.SimpleNamespace(**attributes))
+
+def make_params(**overrides):
+    """
+    Returns a copy of the parameters in params.py, with the
+    attributes passed as keyword arguments overridden.
+    """
+    return(_copy_module(params, overrides))
+
+def make_solver(solver_kwargs = None, domain_kwargs = None, 
+                boundary_conditions_kwargs = None, **overrides
+               ):
+    """
+    Declares a nonlinear_solver for the system. The keyword arguments
+    in solver_kwargs are passed to the nonlinear_solver, those in 
+    domain_kwargs and boundary_conditions_kwargs override the values in
+    domain.py and boundary_conditions.py, while the other keyword 
+    arguments override the values in params.py.
+    """
+    system = physical_system(_copy_module(domain, domain_kwargs),
+                             _copy_module(boundary_conditions, 
+                                          boundary_conditions_kwargs
+                                         ),
+                             make_params(**overrides),
+                             initialize,
+                             advection_terms,
+                             collision_operator.BGK,
+                             moments
+                            )
+
+    return(nonlinear_solver(system, **(solver_kwargs or {})))
@@ -0,0 +1,5 @@
+in_q1_left  = 'periodic'
+in_q1_right = 'periodic'
+
+in_q2_bottom = 'periodic'
+in_q2_top    = 'periodic'
@@ -0,0 +1,22 @@
+q1_start = 0
+q1_end   = 1
+N_q1     = 32
+
+q2_start = 0
+q2_end   = 1
+N_q2     = 3
+
+p1_start = -10
+p1_end   = 10
+N_p1     = 32
+
+p2_start = -0.5
+p2_end   = 0.5
+N_p2     = 1
+
+p3_start = -0.5
+p3_end   = 0.5
+N_p3     = 1
+
+N_ghost_q = 3
+N_ghost_p = 0
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the evolution of the electrostatic fields
+using Ampere's law(fields/electrostatic/ampere.py). It is checked that the
+Poisson clean-up is requested on the cadence set in params, and that the
+update applies dE/dt = -J summed over the species(with the mean of J 
+removed for periodic boundaries). It is also checked for a complete solver
+that the fields evolved stay consistent with the solutions of the Poisson
+equation over a few steps, that the evaluation at the midpoint of the FVM
+step uses E^{n+1/2}, and that with a clean-up on every step the evolution
+of f matches that obtained by solving the Poisson equation.
+"""
+
+import numpy as np
+import arrayfire as af
+from mpi4py import MPI
+from petsc4py import PETSc
+
+from bolt.lib.nonlinear.fields.electrostatic import ampere
+from bolt.lib.nonlinear.finite_volume import fvm_operator
+from bolt.lib.nonlinear.utils.broadcasted_primitive_operations import multiply
+
+from small_system import make_solver
+
+class params:
+    ampere_cleanup_interval = 3
+
+class mirror_boundary_conditions:
+    in_q1_left   = 'mirror'
+    in_q1_right  = 'mirror'
+    in_q2_bottom = 'mirror'
+    in_q2_top    = 'mirror'
+
+class periodic_boundary_conditions:
+    in_q1_left   = 'periodic'
+    in_q1_right  = 'periodic'
+    in_q2_bottom = 'periodic'
+    in_q2_top    = 'periodic'
+
+class test(object):
+    def __init__(self, boundary_conditions = mirror_boundary_conditions):
+        self._comm                 = MPI.COMM_SELF
+        self._host_syncs           = {}
+        self.boundary_conditions   = boundary_conditions
+        self.N_g                   = 1
+        self.params                = params
+        self.performance_test_flag = False
+        self._ampere_calls         = 0
+
+        self.cell_centered_EM_fields = af.constant(1, 6, 1, 6, 5, dtype = af.Dtype.f64)
+
+def test_ampere_cleanup_due():
+    obj = test()
+    due = [ampere.ampere_cleanup_due(obj) for i in range(7)]
+    assert(due == [True, False, False, True, False, False, True])
+
+def test_evolve_electrostatic_fields_ampere(monkeypatch):
+    monkeypatch.setattr(ampere, 'communicate_fields', lambda self, **kwargs: None)
+    monkeypatch.setattr(ampere, 'apply_bcs_fields',   lambda self: None)
+
+    obj = test()
+
+    # Two species with currents (1, 2) and (3, 4) along q1 and q2:
+    J1 = af.join(1, af.constant(1, 1, 1, 6, 5, dtype = af.Dtype.f64),
+                    af.constant(2, 1, 1, 6, 5, dtype = af.Dtype.f64)
+                )
+    J2 = af.join(1, af.constant(3, 1, 1, 6, 5, dtype = af.Dtype.f64),
+                    af.constant(4, 1, 1, 6, 5, dtype = af.Dtype.f64)
+                )
+
+    ampere.evolve_electrostatic_fields_ampere(obj, J1, J2, 0.1)
+
+    E = obj.cell_centered_EM_fields.to_ndarray()
+
+    assert(np.allclose(E[0, 0, 1:-1, 1:-1], 1 - 0.1 * 3))
+    assert(np.allclose(E[1, 0, 1:-1, 1:-1], 1 - 0.1 * 7))
+    # E3 and the fields in the ghost zones are untouched:
+    assert(np.allclose(E[2], 1))
+    assert(np.allclose(E[0, 0, 0], 1))
+
+def test_evolve_electrostatic_fields_ampere_periodic(monkeypatch):
+    monkeypatch.setattr(ampere, 'communicate_fields', lambda self, **kwargs: None)
+    monkeypatch.setattr(ampere, 'apply_bcs_fields',   lambda self: None)
+
+    obj = test(periodic_boundary_conditions)
+
+    # Current along q1 with a mean of 2 over the interior:
+    J1_variation = np.sin(2 * np.pi * np.arange(4) / 4)
+    J1           = np.zeros([1, 1, 6, 5])
+    J1[0, 0, 1:-1, :] = 2 + J1_variation[:, None]
+    J1 = af.to_array(J1)
+
+    J2 = af.constant(3, 1, 1, 6, 5, dtype = af.Dtype.f64)
+
+    ampere.evolve_electrostatic_fields_ampere(obj, J1, J2, 0.1)
+
+    E = obj.cell_centered_EM_fields.to_ndarray()
+
+    assert(np.allclose(E[0, 0, 1:-1, 1:-1], 
+                       1 - 0.1 * J1_variation[:, None]
+                      )
+          )
+    assert(np.allclose(E[1, 0, 1:-1, 1:-1], 1))
+
+def test_ampere_consistent_with_poisson():
+    """
+    The electrostatic fields evolved using Ampere's law are compared against
+    the solution of the Poisson equation for the charge density at the end
+    of each step. A bulk velocity is used, such that the current has a mean
+    over the domain.
+    """
+    nls = make_solver(EM_fields_enabled       = True,
+                      fields_initialize       = 'multigrid',
+                      fields_solver           = 'ampere',
+                      ampere_cleanup_interval = 100,
+                      p1_bulk_background      = 0.5
+                     )
+
+    N_g = nls.N_ghost_q
+    dt  = 0.001
+
+    for i in range(5):
+        nls.strang_timestep(dt)
+
+        E_ampere = nls.fields_solver.cell_centered_EM_fields.copy()
+
+        rho = multiply(nls.physical_system.params.charge, nls.compute_moments('density'))
+        nls.fields_solver.compute_electrostatic_fields(rho)
+
+        E_poisson = nls.fields_solver.cell_centered_EM_fields
+
+        error = af.max(af.abs(  E_ampere[:2, :, N_g:-N_g, N_g:-N_g]
+                              - E_poisson[:2, :, N_g:-N_g, N_g:-N_g]
+                             )
+                      )
+        assert(error < 1e-2 * af.max(af.abs(E_poisson[:2, :, N_g:-N_g, N_g:-N_g])))
+
+        # Continuing with the fields as evolved using Ampere's law:
+        nls.fields_solver.cell_centered_EM_fields = E_ampere
+
+def test_ampere_midpoint_fields(monkeypatch):
+    """
+    On the steps without the clean-up, the evaluation of df_dt at the
+    midpoint is checked to use (E^{n} + E^{n+1}) / 2, with the fields
+    at the end of the step being E^{n+1}.
+    """
+    nls = make_solver(EM_fields_enabled       = True,
+                      fields_initialize       = 'multigrid',
+                      fields_solver           = 'ampere',
+                      ampere_cleanup_interval = 100
+                     )
+
+    dt = 0.001
+    # The first step solves the Poisson equation:
+    nls.strang_timestep(dt)
+
+    fields_seen = []
+    df_dt_fvm   = fvm_operator.df_dt_fvm
+
+    def recording_df_dt_fvm(f, self):
+        fields_seen.append(self.fields_solver.cell_centered_EM_fields.copy())
+        return(df_dt_fvm(f, self))
+
+    monkeypatch.setattr(fvm_operator, 'df_dt_fvm', recording_df_dt_fvm)
+
+    E_n = nls.fields_solver.cell_centered_EM_fields.copy()
+    nls.strang_timestep(dt)
+    E_n_plus_1 = nls.fields_solver.cell_centered_EM_fields
+
+    assert(len(fields_seen) == 2)
+    assert(af.max(af.abs(fields_seen[0] - E_n)) == 0)
+    assert(af.max(af.abs(fields_seen[1] - 0.5 * (E_n + E_n_plus_1))) < 1e-14)
+    # The fields have been evolved:
+    assert(af.max(af.abs(E_n_plus_1 - E_n)) > 0)
+
+def test_ampere_cleanup_step_matches_poisson():
+    """
+    With the clean-up on every step, the fields at the midpoint are
+    those of the Poisson equation for the density at the midpoint. The
+    evolution of f for the non-drifting Landau setup is then compared
+    against that obtained with fields_solver = 'multigrid', which would
+    differ by the update to E made over the step if the evaluation at the
+    midpoint used E^{n+1}.
+    """
+    # Converging the solves, so that the comparison isn't limited by the
+    # tolerance of the KSP:
+    options = PETSc.Options('poisson_')
+    options.setValue('ksp_rtol', 1e-12)
+
+    try:
+        nls_ampere  = make_solver(EM_fields_enabled       = True,
+                                  fields_initialize       = 'multigrid',
+                                  fields_solver           = 'ampere',
+                                  ampere_cleanup_interval = 1
+                                 )
+        nls_poisson = make_solver(EM_fields_enabled = True,
+                                  fields_initialize = 'multigrid',
+                                  fields_solver     = 'multigrid'
+                                 )
+    finally:
+        options.delValue('ksp_rtol')
+
+    f_initial = nls_poisson.f.copy()
+    dt        = 0.001
+
+    for i in range(3):
+        nls_ampere.strang_timestep(dt)
+        nls_poisson.strang_timestep(dt)
+
+    change = af.max(af.abs(nls_poisson.f - f_initial))
+    error  = af.max(af.abs(nls_ampere.f - nls_poisson.f))
+
+    assert(change > 0)
+    assert(error < 1e-8 * change)
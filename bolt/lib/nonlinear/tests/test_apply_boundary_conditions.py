@@ -42,6 +42,7 @@ def f_y(*args):
 
 class test(object):
     def __init__(self, in_q1, in_q2):
+        self._host_syncs = {}
         self.physical_system = type('obj', (object, ),
                                     {'boundary_conditions': type('obj', (object, ),
                                      {'in_q1': in_q1, 'in_q2': in_q2,
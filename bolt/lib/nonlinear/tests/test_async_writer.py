@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the async_writer under
+file_io/async_writer.py. Multiple dumps are staged in succession,
+and it is checked that the files written hold the data which was
+passed at the time of staging.
+"""
+
+import numpy as np
+import h5py
+from petsc4py import PETSc
+
+from bolt.lib.nonlinear.file_io.async_writer import async_writer
+
+class da(object):
+    def __init__(self, N_q1, N_q2):
+        self.N_q1 = N_q1
+        self.N_q2 = N_q2
+
+    def getCorners(self):
+        return((0, 0), (self.N_q1, self.N_q2))
+
+def test_async_writer(tmpdir):
+    N_q1, N_q2 = 16, 8
+
+    # The communicator held by the solver:
+    comm   = PETSc.COMM_WORLD.tompi4py()
+    writer = async_writer(comm, N_q1, N_q2, da(N_q1, N_q2))
+    assert(writer.asynchronous == True)
+
+    # The writer holds a communicator of its own:
+    assert(writer._comm != comm)
+
+    data   = [np.random.rand(N_q2 * N_q1 * 3) for i in range(4)]
+    buffer = np.zeros(N_q2 * N_q1 * 3)
+
+    # The same buffer is reused across the dumps, as done by the solver:
+    for i in range(4):
+        buffer[:] = data[i]
+        writer.submit(str(tmpdir.join('dump_%d'%i)), 'moments', buffer)
+
+    writer.submit(str(tmpdir.join('dump_f')), 'distribution_function',
+                  np.random.rand(N_q2 * N_q1), np.float32
+                 )
+    writer.wait()
+
+    for i in range(4):
+        h5f = h5py.File(str(tmpdir.join('dump_%d.h5'%i)), 'r')
+        assert(np.array_equal(h5f['moments'][:], data[i].reshape(N_q2, N_q1, 3)))
+        h5f.close()
+
+    h5f = h5py.File(str(tmpdir.join('dump_f.h5')), 'r')
+    assert(h5f['distribution_function'].shape == (N_q2, N_q1))
+    assert(h5f['distribution_function'].dtype == np.float32)
+    h5f.close()
+
+    writer.close()
+    # Closing again(as done at exit) is allowed:
+    writer.close()
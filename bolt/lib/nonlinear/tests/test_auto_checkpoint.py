@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the checkpoints written automatically
+at the end of a timestep(enable_auto_checkpoint in file_io/checkpoint.py).
+It is checked that a checkpoint is written upon receiving a signal and
+when the walltime budget is exhausted, and only then.
+"""
+
+import os
+import signal
+
+from mpi4py import MPI
+
+from bolt.lib.nonlinear.file_io import checkpoint
+
+class test(object):
+    def __init__(self):
+        self._comm            = MPI.COMM_SELF
+        self._auto_checkpoint = None
+        self.time_step        = 0
+
+def test_auto_checkpoint(monkeypatch):
+    written = []
+    monkeypatch.setattr(checkpoint, 'save_checkpoint',
+                        lambda self, file_name: written.append(self.time_step)
+                       )
+
+    obj = test()
+    checkpoint.enable_auto_checkpoint(obj, 'checkpoint', signals = ('SIGUSR1',),
+                                      exit_after_checkpoint = False
+                                     )
+
+    obj.time_step = 1
+    assert(checkpoint.check_auto_checkpoint(obj) == False)
+
+    os.kill(os.getpid(), signal.SIGUSR1)
+
+    obj.time_step = 2
+    assert(checkpoint.check_auto_checkpoint(obj) == True)
+    assert(written == [2])
+
+    # The request is cleared once the checkpoint has been written:
+    obj.time_step = 3
+    assert(checkpoint.check_auto_checkpoint(obj) == False)
+
+    checkpoint.disable_auto_checkpoint(obj)
+    assert(signal.getsignal(signal.SIGUSR1) == signal.SIG_DFL)
+
+    # Exhausted walltime budget:
+    checkpoint.enable_auto_checkpoint(obj, 'checkpoint', walltime = 0, signals = (),
+                                      exit_after_checkpoint = False
+                                     )
+    assert(checkpoint.check_auto_checkpoint(obj) == True)
+    checkpoint.disable_auto_checkpoint(obj)
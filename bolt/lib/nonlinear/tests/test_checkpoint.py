@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for save_checkpoint and load_checkpoint
+(file_io/checkpoint.py). A run with the fields evolved using sub-cycled
+FDTD is checkpointed, and the checkpoint is loaded into a newly declared
+solver. It is checked that the complete state is restored, and that the
+restarted run continues as the original one does. Reading a checkpoint
+over a different partitioning of the domain is tested in test_write_hdf5.py.
+"""
+
+import numpy as np
+import arrayfire as af
+
+from bolt.lib.nonlinear.file_io.checkpoint import _field_arrays
+
+from small_system import make_solver
+
+def make_fdtd_solver():
+    return(make_solver(EM_fields_enabled = True,
+                       fields_type       = 'electrodynamic',
+                       fields_solver     = 'fdtd',
+                       fdtd_subcycles    = 2
+                      )
+          )
+
+def assert_equal(array_1, array_2):
+    assert(np.array_equal(array_1.to_ndarray(), array_2.to_ndarray()))
+
+def test_checkpoint_round_trip(tmpdir):
+    file_name = str(tmpdir.join('checkpoint'))
+    dt        = 0.001
+    N_g       = 3
+
+    nls = make_fdtd_solver()
+    for i in range(3):
+        nls.strang_timestep(dt)
+
+    nls.save_checkpoint(file_name)
+
+    nls_restarted = make_fdtd_solver()
+    nls_restarted.load_checkpoint(file_name)
+
+    assert(nls_restarted.time_step == nls.time_step == 3)
+    assert(nls_restarted.time_elapsed == nls.time_elapsed)
+
+    assert_equal(nls_restarted.f, nls.f)
+
+    fields_solver           = nls.fields_solver
+    fields_solver_restarted = nls_restarted.fields_solver
+
+    assert(fields_solver_restarted.at_n == fields_solver.at_n)
+    assert(fields_solver_restarted._ampere_calls == fields_solver._ampere_calls)
+
+    for name in _field_arrays:
+        assert_equal(getattr(fields_solver_restarted, name),
+                     getattr(fields_solver, name)
+                    )
+
+    # Only the interior of the currents is held in the checkpoint:
+    assert(fields_solver_restarted._J_previous is not None)
+    for (J_restarted, J) in zip(fields_solver_restarted._J_previous,
+                                fields_solver._J_previous
+                               ):
+        assert_equal(J_restarted[:, :, N_g:-N_g, N_g:-N_g], J[:, :, N_g:-N_g, N_g:-N_g])
+
+    # The restarted run continues as the original one:
+    nls.strang_timestep(dt)
+    nls_restarted.strang_timestep(dt)
+
+    assert_equal(nls_restarted.f, nls.f)
+    assert_equal(fields_solver_restarted.yee_grid_EM_fields, 
+                 fields_solver.yee_grid_EM_fields
+                )
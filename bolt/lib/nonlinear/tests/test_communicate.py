@@ -22,6 +22,7 @@ from bolt.lib.nonlinear_solver.communicate \
 
 class test_distribution_function(object):
     def __init__(self):
+        self._host_syncs = {}
         
         self.q1_start = np.random.randint(0, 5)
         self.q2_start = np.random.randint(0, 5)
@@ -105,6 +106,7 @@ class test_distribution_function(object):
 
 class test_fields(object):
     def __init__(self):
+        self._host_syncs = {}
         
         self.q1_start = np.random.randint(0, 5)
         self.q2_start = np.random.randint(0, 5)
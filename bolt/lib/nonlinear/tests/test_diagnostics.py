@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the in-situ diagnostics(utils/diagnostics.py).
+A diagnostic is registered with a user-defined function, and it is checked
+that the values accumulated on the device are written to the time series
+at the flushes, along with the post-processing applied. It is also checked
+that the Fourier mode diagnostics are rejected when the mode isn't passed.
+"""
+
+import os
+
+import numpy as np
+import arrayfire as af
+import h5py
+import pytest
+from mpi4py import MPI
+
+from bolt.lib.nonlinear.utils import diagnostics
+
+class test(object):
+    def __init__(self):
+        self._comm        = MPI.COMM_SELF
+        self.time_elapsed = 0
+        self.time_step    = 0
+        self._diagnostics = diagnostics._initialize_diagnostics(self)
+
+def test_diagnostics(tmpdir):
+    obj       = test()
+    file_name = os.path.join(str(tmpdir), 'diagnostics')
+
+    diagnostics.register_diagnostic(obj, 'step',
+                                    lambda self: af.to_array(np.array([self.time_step, 1.]))
+                                   )
+    diagnostics.register_diagnostic(obj, 'norm',
+                                    lambda self: af.to_array(np.array([3., 4.])),
+                                    post = lambda values: np.sqrt(np.sum(values**2, 1))
+                                   )
+    diagnostics.enable_diagnostics(obj, file_name, interval = 2, flush_interval = 2)
+
+    for time_step in range(1, 6):
+        obj.time_step    = time_step
+        obj.time_elapsed = 0.1 * time_step
+        diagnostics.evaluate_diagnostics(obj)
+
+    # Evaluations at steps 2 and 4 have been flushed:
+    with h5py.File(file_name + '.h5', 'r') as h5f:
+        assert(np.all(h5f['time_step'][:, 0] == [2, 4]))
+        assert(np.allclose(h5f['step'][:], [[2, 1], [4, 1]]))
+        assert(np.allclose(h5f['norm'][:, 0], 5))
+
+    obj.time_step = 6
+    diagnostics.evaluate_diagnostics(obj)
+    diagnostics.close_diagnostics(obj)
+
+    with h5py.File(file_name + '.h5', 'r') as h5f:
+        assert(np.allclose(h5f['time'][:, 0], [0.2, 0.4, 0.5]))
+        assert(np.all(h5f['time_step'][:, 0] == [2, 4, 6]))
+
+def test_fourier_mode_needs_mode():
+    obj = test()
+
+    for mode in [None, (1,), (1, 0.5), 1]:
+        with pytest.raises(ValueError):
+            diagnostics.register_diagnostic(obj, 'fourier_mode_1_0', mode = mode)
+
+    diagnostics.register_diagnostic(obj, 'fourier_mode_1_0', mode = (1, 0))
+    assert(len(obj._diagnostics['registry']) == 1)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the host buffers which are used in dumping
+the distribution function(_get_dump_f_buffers, _fill_dump_f_buffer and
+release_dump_buffers). It is checked that no dump vector is allocated
+before the first dump, that the data dumped is the same as that written
+by a PETSc viewer from a vector filled directly with f(both when the
+vector used in communication is reused, and when ghost zones in p-space
+need a separate dump vector), and that the buffers may be released and 
+allocated again by the next dump.
+"""
+
+import numpy as np
+import h5py
+from petsc4py import PETSc
+
+from bolt.lib.nonlinear.file_io.dump import _get_dump_f_buffers, _fill_dump_f_buffer
+
+from small_system import make_solver
+
+def dump_baseline(nls, file_name):
+    """
+    Writes f(non-inclusive of the ghost zones) through a PETSc viewer 
+    from a vector which is allocated and filled independently of the 
+    dump buffers of the solver.
+    """
+    N_g   = nls.N_ghost_q
+    N_g_p = nls.N_ghost_p
+
+    f = nls.f.to_ndarray()[:, :, N_g:-N_g, N_g:-N_g]
+    f = f.reshape(nls.N_p1 + 2 * N_g_p, nls.N_p2 + 2 * N_g_p, nls.N_p3 + 2 * N_g_p,
+                  nls.N_species, nls.N_q1, nls.N_q2, order = 'F'
+                 )
+
+    if(N_g_p != 0):
+        f = f[N_g_p:-N_g_p, N_g_p:-N_g_p, N_g_p:-N_g_p]
+
+    baseline = nls._da_dump_f.createGlobalVec()
+    PETSc.Object.setName(baseline, 'distribution_function')
+    baseline.getArray()[:] = f.ravel(order = 'F')
+
+    viewer = PETSc.Viewer().createHDF5(file_name + '.h5', 'w', comm = nls._comm)
+    viewer(baseline)
+    viewer.destroy()
+    baseline.destroy()
+
+def read_dump(file_name):
+    h5f  = h5py.File(file_name + '.h5', 'r')
+    data = h5f['distribution_function'][:]
+    h5f.close()
+
+    return(data)
+
+def test_no_dump_buffers_before_dump():
+    nls = make_solver()
+
+    assert(nls._glob_dump_f is None)
+    assert(nls._glob_dump_f_array is None)
+    assert(nls._glob_moments is None)
+
+def test_dump_f_buffers_match_baseline(tmpdir):
+    for N_ghost_p in [0, 1]:
+        nls = make_solver(domain_kwargs = {'N_ghost_p' : N_ghost_p})
+
+        nls.dump_distribution_function(str(tmpdir.join('f_%d'%N_ghost_p)))
+        dump_baseline(nls, str(tmpdir.join('baseline_%d'%N_ghost_p)))
+
+        # The vector used in communication is only reused without ghost zones in p:
+        assert((nls._glob_dump_f is nls._glob_f) == (N_ghost_p == 0))
+
+        assert(np.array_equal(read_dump(str(tmpdir.join('f_%d'%N_ghost_p))),
+                              read_dump(str(tmpdir.join('baseline_%d'%N_ghost_p)))
+                             )
+              )
+
+def test_release_dump_buffers_round_trip(tmpdir):
+    nls = make_solver(domain_kwargs = {'N_ghost_p' : 1})
+    nls.dump_distribution_function(str(tmpdir.join('f_before_release')))
+    nls.release_dump_buffers()
+
+    assert(nls._glob_dump_f is None)
+    assert(nls._glob_dump_f_array is None)
+
+    glob_dump_f_array = _fill_dump_f_buffer(nls)
+    glob_dump_f, _    = _get_dump_f_buffers(nls)
+
+    assert(glob_dump_f is not None and glob_dump_f is not nls._glob_f)
+    assert(np.array_equal(np.asarray(glob_dump_f_array).ravel(),
+                          read_dump(str(tmpdir.join('f_before_release'))).ravel()
+                         )
+          )
+
+    # The dump made after the release is loaded back into f:
+    nls.dump_distribution_function(str(tmpdir.join('f_after_release')))
+    nls.release_dump_buffers()
+
+    nls.f = 0 * nls.f
+    nls.load_distribution_function(str(tmpdir.join('f_after_release')))
+    nls.dump_distribution_function(str(tmpdir.join('f_reloaded')))
+
+    assert(np.array_equal(read_dump(str(tmpdir.join('f_after_release'))),
+                          read_dump(str(tmpdir.join('f_reloaded')))
+                         )
+          )
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the test for dump_moments. The moments dumped 
+(for a system with 2 species) are checked against the values
+returned by compute_moments, both when all the moments are dumped
+(through the PETSc viewer) and when a subset of the same is requested
+(through h5py).
+"""
+
+import numpy as np
+import h5py
+
+from small_system import make_solver
+
+def check_dumped_moments(nls, file_name, moments = None):
+    N_g = nls.N_ghost_q
+    N_s = nls.N_species
+
+    nls.dump_moments(file_name, moments)
+
+    h5f          = h5py.File(file_name + '.h5', 'r')
+    data         = h5f['moments'][:]
+    moment_names = [name.decode() for name in h5f['moments'].attrs['moments']]
+    h5f.close()
+
+    if(moments is not None):
+        assert(moment_names == moments)
+
+    # Stored with the shape (N_q2, N_q1, N_moments * N_s):
+    assert(data.shape[2] == len(moment_names) * N_s)
+
+    for i in range(len(moment_names)):
+        moment = nls.compute_moments(moment_names[i])[:, :, N_g:-N_g, N_g:-N_g]
+        moment = moment.to_ndarray().reshape(N_s, nls.N_q1, nls.N_q2, order = 'F')
+        
+        for s in range(N_s):
+            assert(np.allclose(data[:, :, i * N_s + s], moment[s].transpose(),
+                               rtol = 1e-13, atol = 1e-15
+                              )
+                  )
+
+def test_dump_moments(tmpdir):
+    nls = make_solver(mass = [1, 2], charge = [-1, 1])
+
+    check_dumped_moments(nls, str(tmpdir.join('moments')))
+    check_dumped_moments(nls, str(tmpdir.join('moments_subset')), 
+                         ['energy', 'density']
+                        )
@@ -21,6 +21,7 @@ from bolt.lib.nonlinear_solver.communicate import communicate_fields
 
 class test(object):
     def __init__(self, N):
+        self._host_syncs = {}
         self.q1_start = 0
         self.q2_start = 0
 
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the sub-cycling of FDTD(fdtd_subcycled in
+fields/electrodynamic/fdtd_explicit.py). The FDTD updates are replaced by
+functions recording the arguments, and it is checked that the substeps cover
+dt, that B is moved to the staggering of the substeps and back, and that the
+currents are interpolated to the middle of each substep. Additionally, a
+light wave in vacuum is evolved using the fields solver of a complete solver,
+and it is checked that the sub-cycled steps agree with FDTD steps taken at
+the reduced timestep, and with the analytical solution.
+"""
+
+import numpy as np
+import arrayfire as af
+
+from bolt.lib.nonlinear.fields.electrodynamic import fdtd_explicit
+
+from small_system import make_solver
+
+class test(object):
+    def __init__(self):
+        # Currents at (n + 1/2):
+        self.J1 = 2.0
+        self.J2 = 4.0
+        self.J3 = 6.0
+
+def test_fdtd_subcycled(monkeypatch):
+    calls = []
+    monkeypatch.setattr(fdtd_explicit, 'fdtd',
+                        lambda self, dt: calls.append(('fdtd', dt, self.J1))
+                       )
+    monkeypatch.setattr(fdtd_explicit, '_fdtd_update_B',
+                        lambda self, dt: calls.append(('B', dt, None))
+                       )
+
+    obj = test()
+    dt  = 0.4
+
+    # Currents at (n - 1/2):
+    fdtd_explicit.fdtd_subcycled(obj, dt, 4, (1.0, 2.0, 3.0))
+
+    assert(calls[0][0] == 'B' and np.isclose(calls[0][1], -0.5 * (dt - dt / 4)))
+    assert(calls[-1][0] == 'B' and np.isclose(calls[-1][1], 0.5 * (dt - dt / 4)))
+
+    substeps = calls[1:-1]
+    assert(len(substeps) == 4)
+    assert(np.isclose(sum(call[1] for call in substeps), dt))
+
+    # J1 changes by 1 over dt, and is 2 at the middle of the step:
+    assert(np.allclose([call[2] for call in substeps], [1.625, 1.875, 2.125, 2.375]))
+
+    # The currents at (n + 1/2) are restored:
+    assert(obj.J1 == 2.0 and obj.J2 == 4.0 and obj.J3 == 6.0)
+
+def initialize_vacuum_wave(fields_solver, t_B):
+    """
+    Assigns the wave E3 = cos(k q1 - k t), B2 = -cos(k q1 - k t) to the
+    Yee grid at t = 0 for E3, and t = t_B for B2. E3 is located at the
+    corners(i, j) of the zones, and B2 at (i + 1/2, j).
+    """
+    k  = 2 * np.pi
+    q1 = fields_solver.q1
+
+    E3 =  af.cos(k * (q1 - 0.5 * fields_solver.dq1))
+    B2 = -af.cos(k * q1 - k * t_B)
+
+    fields_solver.yee_grid_EM_fields    = 0 * fields_solver.yee_grid_EM_fields
+    fields_solver.yee_grid_EM_fields[2] = E3
+    fields_solver.yee_grid_EM_fields[4] = B2
+
+    # Vacuum:
+    fields_solver.J1 = fields_solver.J2 = fields_solver.J3 = 0 * E3
+
+def test_fdtd_subcycled_vacuum_wave():
+    N_g = 3
+    dt  = 0.02
+    N_t = 10
+
+    fields_solvers = []
+    for i in range(2):
+        nls = make_solver(EM_fields_enabled = True,
+                          fields_type       = 'electrodynamic',
+                          fields_solver     = 'fdtd',
+                          charge            = [0]
+                         )
+        fields_solvers.append(nls.fields_solver)
+
+    fields_solver_subcycled, fields_solver_reference = fields_solvers
+
+    # B is staggered by half of the timestep used by the FDTD steps:
+    initialize_vacuum_wave(fields_solver_subcycled, 0.5 * dt)
+    initialize_vacuum_wave(fields_solver_reference, 0.125 * dt)
+
+    for n in range(N_t):
+        fdtd_explicit.fdtd_subcycled(fields_solver_subcycled, dt, 4)
+
+        for substep in range(4):
+            fdtd_explicit.fdtd(fields_solver_reference, dt / 4)
+
+    E3_subcycled = fields_solver_subcycled.yee_grid_EM_fields[2, :, N_g:-N_g, N_g:-N_g]
+    E3_reference = fields_solver_reference.yee_grid_EM_fields[2, :, N_g:-N_g, N_g:-N_g]
+
+    q1          = fields_solver_subcycled.q1[:, :, N_g:-N_g, N_g:-N_g]
+    E3_analytic = af.cos(2 * np.pi * (q1 - 0.5 * fields_solver_subcycled.dq1 - N_t * dt))
+
+    assert(af.max(af.abs(E3_subcycled - E3_reference)) < 5e-3)
+    assert(af.max(af.abs(E3_subcycled - E3_analytic)) < 2e-2)
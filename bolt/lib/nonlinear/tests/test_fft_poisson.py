@@ -22,6 +22,7 @@ def compute_moments(self, *args):
 
 class test(object):
     def __init__(self):
+        self._host_syncs = {}
 
         # Creating object:
         self.physical_system = type('obj', (object, ),
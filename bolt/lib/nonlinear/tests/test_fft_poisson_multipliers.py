@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+In this test we check that fft_poisson, which uses the multipliers
+precomputed by initialize_fft_poisson and a batched inverse transform,
+gives the same fields as the formulation used before(where the 
+wavenumbers were computed using fftfreq/meshgrid upon each call). 
+A grid with N_q1 != N_q2 and dq1 != dq2 is used, so that a transposition
+of the axes of the multipliers would be caught.
+"""
+
+import numpy as np
+import arrayfire as af
+from mpi4py import MPI
+
+from bolt.lib.nonlinear.fields.electrostatic.fft import fft_poisson
+
+class test(object):
+    def __init__(self):
+        self.N_q1 = 24
+        self.N_q2 = 10
+        self.N_g  = 3
+
+        self.dq1 = 2.0 / self.N_q1
+        self.dq2 = 0.5 / self.N_q2
+
+        self._comm       = MPI.COMM_SELF
+        self._host_syncs = {}
+
+        self.performance_test_flag = False
+
+        self.cell_centered_EM_fields = af.constant(0, 6, 1, 
+                                                   self.N_q1 + 2 * self.N_g,
+                                                   self.N_q2 + 2 * self.N_g,
+                                                   dtype = af.Dtype.f64
+                                                  )
+
+def fft_poisson_per_call(self, rho):
+    """
+    The formulation which was used before the multipliers were cached.
+    Returns E1, E2 non-inclusive of the ghost zones.
+    """
+    N_g = self.N_g
+
+    rho = af.reorder(rho[:, :, N_g:-N_g, N_g:-N_g] , 2, 3, 0, 1)
+    rho = af.sum(rho, 3)
+
+    k_q1 = np.fft.fftfreq(rho.shape[0], self.dq1)
+    k_q2 = np.fft.fftfreq(rho.shape[1], self.dq2)
+
+    k_q2, k_q1 = np.meshgrid(k_q2, k_q1)
+
+    k_q1 = af.to_array(k_q1)
+    k_q2 = af.to_array(k_q2)
+
+    rho_hat = af.fft2(rho)
+
+    potential_hat       = rho_hat / (4 * np.pi**2 * (k_q1**2 + k_q2**2))
+    potential_hat[0, 0] = 0
+
+    E1_hat = -1j * 2 * np.pi * k_q1 * potential_hat
+    E2_hat = -1j * 2 * np.pi * k_q2 * potential_hat
+
+    E1_ifft = af.ifft2(E1_hat, scale=1)/(E1_hat.shape[0] * E1_hat.shape[1])
+    E2_ifft = af.ifft2(E2_hat, scale=1)/(E2_hat.shape[0] * E2_hat.shape[1])
+    
+    E1 = af.reorder(af.real(E1_ifft), 2, 3, 0, 1)
+    E2 = af.reorder(af.real(E2_ifft), 2, 3, 0, 1)
+
+    return(E1, E2)
+
+def test_fft_poisson_non_square():
+    obj = test()
+    N_g = obj.N_g
+
+    # Charge density of 2 species:
+    rho = af.randu(1, 2, obj.N_q1 + 2 * N_g, obj.N_q2 + 2 * N_g, dtype = af.Dtype.f64)
+
+    E1_expected, E2_expected = fft_poisson_per_call(obj, rho)
+
+    # Called twice, so that the cached multipliers are also used:
+    for i in range(2):
+        fft_poisson(obj, rho)
+
+        E1 = obj.cell_centered_EM_fields[0, 0, N_g:-N_g, N_g:-N_g]
+        E2 = obj.cell_centered_EM_fields[1, 0, N_g:-N_g, N_g:-N_g]
+
+        assert(obj._fft_poisson_multipliers.shape == (obj.N_q1, obj.N_q2, 2))
+        assert(af.max(af.abs(E1_expected)) > 0)
+        assert(af.max(af.abs(E1 - E1_expected)) < 1e-13)
+        assert(af.max(af.abs(E2 - E2_expected)) < 1e-13)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the exchange of the ghost zones of a
+subset of the field components(communicate_fields). It is checked that
+the ghost zones of the requested components are filled with the periodic
+images of the domain, while those of the remaining components are left
+untouched.
+"""
+
+import numpy as np
+import arrayfire as af
+from petsc4py import PETSc
+
+from bolt.lib.nonlinear.communicate import communicate_fields
+
+class test(object):
+    def __init__(self):
+        self._host_syncs = {}
+        self.N_q1 = 12
+        self.N_q2 = 10
+        self.N_g  = 2
+
+        self.performance_test_flag = False
+        self._halo_exchanges       = {}
+
+        self._da_fields = PETSc.DMDA().create([self.N_q1, self.N_q2],
+                                              dof           = 6,
+                                              stencil_width = self.N_g,
+                                              boundary_type = ('periodic', 'periodic'),
+                                              stencil_type  = 1,
+                                              comm          = PETSc.COMM_SELF
+                                             )
+
+        N_g = self.N_g
+
+        # Distinct values in the domain, and -1 in the ghost zones:
+        fields = -np.ones([6, 1, self.N_q1 + 2 * N_g, self.N_q2 + 2 * N_g])
+        fields[:, :, N_g:-N_g, N_g:-N_g] = \
+            np.random.rand(6, 1, self.N_q1, self.N_q2)
+
+        self.domain                  = fields[:, :, N_g:-N_g, N_g:-N_g]
+        self.cell_centered_EM_fields = af.to_array(fields)
+
+def test_communicate_fields_components():
+    obj = test()
+    N_g = obj.N_g
+
+    communicate_fields(obj, components = (3, 6))
+
+    fields   = obj.cell_centered_EM_fields.to_ndarray()
+    expected = np.pad(obj.domain, ((0, 0), (0, 0), (N_g, N_g), (N_g, N_g)), mode = 'wrap')
+
+    assert(np.array_equal(fields[3:], expected[3:]))
+    # Ghost zones of E aren't exchanged:
+    assert(np.all(fields[:3, :, :N_g] == -1))
+    assert(np.array_equal(fields[:3, :, N_g:-N_g, N_g:-N_g], obj.domain[:3]))
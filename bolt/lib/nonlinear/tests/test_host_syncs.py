@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the changes which removed the host syncs
+from the production timestep. It is checked that wrap_periodic gives the
+same result as the loops it replaced(which shifted the out of domain points
+by the length of the domain until none were left), including for points
+which lie several periods outside the domain. It is also checked that the
+syncs are counted per solver, and that a production FVM step records at
+most a single sync apart from the transfers made for communication.
+"""
+
+import numpy as np
+import arrayfire as af
+
+from bolt.lib.nonlinear.boundaries import wrap_periodic
+
+from small_system import make_solver
+
+def wrap_periodic_loop(coordinates, start, end):
+    """
+    The formulation which was used before wrap_periodic.
+    """
+    L = end - start
+
+    while(af.sum(coordinates > end) != 0):
+        coordinates = af.select(coordinates > end, coordinates - L, coordinates)
+
+    while(af.sum(coordinates < start) != 0):
+        coordinates = af.select(coordinates < start, coordinates + L, coordinates)
+
+    return(coordinates)
+
+def test_wrap_periodic():
+    start = -0.3
+    end   = 1.7
+
+    # Spanning several periods on both sides of the domain, along with
+    # points which lie on the edges and at integer multiples away from them:
+    coordinates = af.join(0, 
+                          af.flat(-11 + 24 * af.randu(50, 20, dtype = af.Dtype.f64)),
+                          af.to_array(np.array([start, end, 
+                                                start - 2 * (end - start),
+                                                end + 3 * (end - start)
+                                               ]
+                                              )
+                                     )
+                         )
+
+    wrapped   = wrap_periodic(coordinates, start, end).to_ndarray()
+    reference = wrap_periodic_loop(coordinates, start, end).to_ndarray()
+
+    assert(np.all(wrapped >= start) and np.all(wrapped <= end))
+    assert(np.max(np.abs(wrapped - reference)) < 1e-12)
+
+def test_host_syncs_per_solver():
+    nls_1 = make_solver()
+    nls_2 = make_solver()
+
+    nls_1._communicate_f()
+
+    assert(nls_1.get_host_sync_count('communicate_f') == 1)
+    assert(nls_2.get_host_sync_count() == 0)
+
+def test_fvm_step_host_syncs():
+    N_steps = 4
+    nls     = make_solver({'divergence_check_interval' : N_steps})
+    dt      = 0.001
+
+    communication_sites = ['communicate_f', 'communicate_fields']
+
+    for i in range(N_steps):
+        nls.reset_host_sync_count()
+        nls.strang_timestep(dt)
+
+        syncs = sum(count for site, count in nls._host_syncs.items()
+                    if site not in communication_sites
+                   )
+
+        # Only the divergence check, made on the last of the steps:
+        assert(syncs <= 1)
+        assert(   nls.get_host_sync_count('check_divergence') 
+               == int(i == N_steps - 1)
+              )
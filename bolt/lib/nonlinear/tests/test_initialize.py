@@ -58,6 +58,7 @@ class params:
 
 class test(object):
     def __init__(self):
+        self._host_syncs = {}
         self.performance_test_flag = False
         # Initializing object with required parameters:
         self.physical_system = type('obj', (object, ),
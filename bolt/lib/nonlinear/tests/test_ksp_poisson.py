@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+In this test we check that the parallel Poisson solver(KSP with
+a multigrid preconditioner) works as intended. For this purpose,
+we assign a charge density for which the analytical solution for
+the electrostatic fields may be computed, and check the solution
+given by the solver against the same to second order accuracy.
+This is done for periodic boundaries, and for grounded(dirichlet)
+walls. Additionally, it is checked that a repeated solve converges
+immediately due to the warm start, and that a non-finite initial
+guess is discarded.
+"""
+
+import numpy as np
+import arrayfire as af
+from petsc4py import PETSc
+
+from bolt.lib.nonlinear.fields.electrostatic.multigrid import \
+    initialize_ksp_poisson, ksp_poisson
+
+class periodic_boundary_conditions:
+    in_q1_left   = 'periodic'
+    in_q1_right  = 'periodic'
+    in_q2_bottom = 'periodic'
+    in_q2_top    = 'periodic'
+
+class dirichlet_boundary_conditions:
+    in_q1_left   = 'dirichlet'
+    in_q1_right  = 'dirichlet'
+    in_q2_bottom = 'dirichlet'
+    in_q2_top    = 'dirichlet'
+
+class test(object):
+    def __init__(self, N, boundary_conditions):
+        self._host_syncs = {}
+        self.N_q1 = N
+        self.N_q2 = N
+        self.N_g  = 2
+
+        self.dq1 = 1 / self.N_q1
+        self.dq2 = 1 / self.N_q2
+
+        self.boundary_conditions   = boundary_conditions
+        self.performance_test_flag = False
+
+        petsc_bc = 'periodic' if boundary_conditions.in_q1_left == 'periodic' else 'ghosted'
+
+        self._da_fields = PETSc.DMDA().create([self.N_q1, self.N_q2],
+                                              dof           = 6,
+                                              stencil_width = self.N_g,
+                                              boundary_type = (petsc_bc, petsc_bc),
+                                              stencil_type  = 1
+                                             )
+
+        ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = self._da_fields.getCorners()
+
+        q1 = (i_q1_start + 0.5 + np.arange(-self.N_g, N_q1_local + self.N_g)) * self.dq1
+        q2 = (i_q2_start + 0.5 + np.arange(-self.N_g, N_q2_local + self.N_g)) * self.dq2
+
+        q2, q1 = np.meshgrid(q2, q1)
+
+        self.q1 = af.moddims(af.to_array(q1), 1, 1, q1.shape[0], q1.shape[1])
+        self.q2 = af.moddims(af.to_array(q2), 1, 1, q2.shape[0], q2.shape[1])
+
+        self.cell_centered_EM_fields = af.constant(0, 6, 1, q1.shape[0], q1.shape[1],
+                                                   dtype = af.Dtype.f64
+                                                  )
+
+def test_ksp_poisson():
+    obj = test(128, periodic_boundary_conditions)
+    initialize_ksp_poisson(obj)
+
+    rho = af.sin(2 * np.pi * obj.q1 + 4 * np.pi * obj.q2)
+    ksp_poisson(obj, rho)
+
+    # -laplacian(phi) = rho ==> phi = rho / (20 pi^2)
+    E1_expected = -(1 / (10 * np.pi)) * af.cos(2 * np.pi * obj.q1 + 4 * np.pi * obj.q2)
+    E2_expected = -(1 / ( 5 * np.pi)) * af.cos(2 * np.pi * obj.q1 + 4 * np.pi * obj.q2)
+
+    N_g = obj.N_g
+
+    error_E1 = af.max(af.abs(  obj.cell_centered_EM_fields[0, 0, N_g:-N_g, N_g:-N_g]
+                             - E1_expected[:, :, N_g:-N_g, N_g:-N_g]
+                            )
+                     )
+
+    error_E2 = af.max(af.abs(  obj.cell_centered_EM_fields[1, 0, N_g:-N_g, N_g:-N_g]
+                             - E2_expected[:, :, N_g:-N_g, N_g:-N_g]
+                            )
+                     )
+
+    assert (error_E1 < 1e-3 and error_E2 < 1e-3)
+
+    # Warm started from the previous solution:
+    ksp_poisson(obj, rho)
+    assert (obj._poisson_ksp.getIterationNumber() <= 1)
+
+    # A non-finite initial guess is discarded, and the solve repeated from zero:
+    obj._poisson_phi.set(np.nan)
+    obj.cell_centered_EM_fields[:2] = 0
+    ksp_poisson(obj, rho)
+
+    assert (np.isfinite(obj._poisson_phi.norm()))
+    assert (obj._poisson_ksp.getConvergedReason() > 0)
+
+    error_E1_restarted = af.max(af.abs(  obj.cell_centered_EM_fields[0, 0, N_g:-N_g, N_g:-N_g]
+                                       - E1_expected[:, :, N_g:-N_g, N_g:-N_g]
+                                      )
+                               )
+    assert (error_E1_restarted < 1e-3)
+
+def test_ksp_poisson_dirichlet():
+    obj = test(128, dirichlet_boundary_conditions)
+    initialize_ksp_poisson(obj)
+
+    # phi = sin(pi q1) sin(pi q2) vanishes on the walls:
+    rho = 2 * np.pi**2 * af.sin(np.pi * obj.q1) * af.sin(np.pi * obj.q2)
+    ksp_poisson(obj, rho)
+
+    E1_expected = -np.pi * af.cos(np.pi * obj.q1) * af.sin(np.pi * obj.q2)
+    E2_expected = -np.pi * af.sin(np.pi * obj.q1) * af.cos(np.pi * obj.q2)
+
+    N_g = obj.N_g
+
+    error_E1 = af.max(af.abs(  obj.cell_centered_EM_fields[0, 0, N_g:-N_g, N_g:-N_g]
+                             - E1_expected[:, :, N_g:-N_g, N_g:-N_g]
+                            )
+                     )
+
+    error_E2 = af.max(af.abs(  obj.cell_centered_EM_fields[1, 0, N_g:-N_g, N_g:-N_g]
+                             - E2_expected[:, :, N_g:-N_g, N_g:-N_g]
+                            )
+                     )
+
+    assert (error_E1 < 1e-2 and error_E2 < 1e-2)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the functions under 
+utils/lazy_evaluation.py. It is checked that the evaluations
+in the helper routines are deferred only when lazy evaluation
+is enabled, that the planned evaluations fold in all the
+deferred helper results, that the counts are kept on the
+solver whose counters are active, and that the mode which was
+active before is restored on leaving lazy_evaluation_mode.
+"""
+
+import arrayfire as af
+
+from bolt.lib.nonlinear.utils import lazy_evaluation
+from bolt.lib.nonlinear.utils.lazy_evaluation import eval_helper, eval_planned
+
+class test(object):
+    def __init__(self):
+        lazy_evaluation.reset_jit_statistics(self)
+
+def test_eager_evaluation():
+    obj = test()
+
+    with lazy_evaluation.lazy_evaluation_mode(False, obj._jit_statistics):
+        a = af.randu(10, 10, dtype = af.Dtype.f64)
+        b = a + 1
+        eval_helper(b)
+        c = 2 * b
+        eval_planned(c)
+
+    assert(obj._jit_statistics['af_eval_calls'] == 2)
+    assert(obj._jit_statistics['deferred_arrays'] == 0)
+    assert(obj._jit_statistics['max_arrays_per_eval'] == 1)
+
+def test_lazy_evaluation():
+    obj = test()
+
+    with lazy_evaluation.lazy_evaluation_mode(True, obj._jit_statistics):
+        a = af.randu(10, 10, dtype = af.Dtype.f64)
+        b = a + 1
+        eval_helper(b)
+        c = 2 * b
+        eval_helper(c)
+        d = c - a
+        eval_planned(d)
+
+    assert(obj._jit_statistics['af_eval_calls'] == 1)
+    assert(obj._jit_statistics['deferred_arrays'] == 2)
+    assert(obj._jit_statistics['max_arrays_per_eval'] == 3)
+    assert(af.max(af.abs(d - (a + 2))) < 1e-14)
+
+def test_statistics_per_solver():
+    obj_1 = test()
+    obj_2 = test()
+
+    a = af.randu(10, 10, dtype = af.Dtype.f64)
+
+    with lazy_evaluation.lazy_evaluation_mode(False, obj_1._jit_statistics):
+        eval_planned(a + 1)
+
+        # The counters of the enclosing block are restored on exit:
+        with lazy_evaluation.lazy_evaluation_mode(True, obj_2._jit_statistics):
+            eval_helper(a + 2)
+            eval_planned(a + 3)
+
+        eval_planned(a + 4)
+
+    # Evaluations made outside of the mode aren't counted:
+    eval_planned(a + 5)
+
+    assert(obj_1._jit_statistics['af_eval_calls'] == 2)
+    assert(obj_1._jit_statistics['deferred_arrays'] == 0)
+    assert(obj_2._jit_statistics['af_eval_calls'] == 1)
+    assert(obj_2._jit_statistics['deferred_arrays'] == 1)
+
+def test_lazy_evaluation_mode_restored():
+    previous_flag = lazy_evaluation.get_lazy_evaluation()
+
+    try:
+        lazy_evaluation.set_lazy_evaluation(False)
+
+        # The mode is restored on exit, including upon exceptions:
+        try:
+            with lazy_evaluation.lazy_evaluation_mode(True):
+                assert(lazy_evaluation.get_lazy_evaluation() == True)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        assert(lazy_evaluation.get_lazy_evaluation() == False)
+        assert(lazy_evaluation._active_statistics is None)
+
+    finally:
+        lazy_evaluation.set_lazy_evaluation(previous_flag)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+In this test we check that the fields returned by get_lorentz_fields are
+those returned by get_fields multiplied by q/m of each of the species,
+including when the fields are windowed along q2(with the windows at the
+ends of the zone wrapping around) and held across the blocks. For a complete
+solver, the product is checked to be taken once per update of the fields,
+irrespective of the blocks over which the RHS is evaluated.
+Additionally, we check that the advection terms in p-space for the
+nonrelativistic Boltzmann equation are formed using these.
+"""
+
+import numpy as np
+import arrayfire as af
+
+from bolt.lib.nonlinear.fields import fields
+from bolt.lib.nonlinear.fields.fields import fields_solver
+from bolt.lib.nonlinear.finite_volume import fvm_operator
+from bolt.src.nonrelativistic_boltzmann.advection_terms import A_p
+
+from small_system import make_solver
+
+class params:
+    fields_solver       = 'fft'
+    solver_method_in_p  = 'ASL'
+    p_dim               = 3
+
+    charge = af.to_array(np.array([-1., 2.])).T
+    mass   = af.to_array(np.array([1., 4.])).T
+
+class test(object):
+    def __init__(self):
+        self.params     = params
+        self._q2_window = None
+        self.at_n       = True
+
+        self._charge_by_mass = params.charge / params.mass
+        self._lorentz_fields = {}
+
+        self.magnetic_fields_vanish = False
+
+        self.cell_centered_EM_fields = af.randu(6, 1, 8, 12, dtype = af.Dtype.f64)
+
+    _get_EM_fields     = fields_solver._get_EM_fields
+    get_fields         = fields_solver.get_fields
+    get_lorentz_fields = fields_solver.get_lorentz_fields
+
+def test_get_lorentz_fields():
+    obj = test()
+
+    for q2_window in [None, (2, 7), (5, 12), (-3, 4), (9, 15)]:
+        obj._q2_window = q2_window
+
+        fields         = obj.get_fields()
+        lorentz_fields = obj.get_lorentz_fields()
+
+        for field, lorentz_field in zip(fields, lorentz_fields):
+            assert(lorentz_field.shape == (1, 2, 8, field.shape[3]))
+            assert(af.max(af.abs(lorentz_field[:, 0] + field)) < 1e-14)
+            assert(af.max(af.abs(lorentz_field[:, 1] - 0.5 * field)) < 1e-14)
+
+    # The product is held across the blocks:
+    assert('cell_centered' in obj._lorentz_fields)
+
+def test_A_p():
+    obj = test()
+
+    v1 = af.to_array(np.array([0.5]))
+    v2 = af.to_array(np.array([-1.]))
+    v3 = af.to_array(np.array([2.]))
+
+    A_p1, A_p2, A_p3 = af.broadcast(A_p, None, 0, None, None, v1, v2, v3, 
+                                    obj, params
+                                   )
+
+    E1, E2, E3, B1, B2, B3 = obj.get_fields()
+    A_p3_expected = -(E3 + 0.5 * B2 + B1)
+
+    assert(af.max(af.abs(A_p3[:, 0] - A_p3_expected)) < 1e-14)
+
+def test_lorentz_fields_products_per_update(monkeypatch):
+    """
+    The fields are updated before each evaluation of df_dt, by the Poisson
+    solves for fields_solver = 'multigrid', and by the Ampere update(and
+    the averaging for the midpoint) for fields_solver = 'ampere'. One
+    product with q/m is expected per evaluation, for any number of blocks.
+    """
+    for solver in ['multigrid', 'ampere']:
+        for rhs_blocks in [1, 4]:
+            nls = make_solver({'rhs_blocks' : rhs_blocks}, {'N_q2' : 8},
+                              EM_fields_enabled       = True,
+                              fields_initialize       = 'multigrid',
+                              fields_solver           = solver,
+                              ampere_cleanup_interval = 3
+                             )
+
+            charge_by_mass = nls.fields_solver._charge_by_mass
+            counts         = {'products' : 0, 'df_dt' : 0}
+
+            multiply  = fields.multiply
+            df_dt_fvm = fvm_operator.df_dt_fvm
+
+            def counting_multiply(a, b):
+                if(a is charge_by_mass):
+                    counts['products'] += 1
+                return(multiply(a, b))
+
+            def counting_df_dt_fvm(f, self):
+                counts['df_dt'] += 1
+                return(df_dt_fvm(f, self))
+
+            monkeypatch.setattr(fields, 'multiply', counting_multiply)
+            monkeypatch.setattr(fvm_operator, 'df_dt_fvm', counting_df_dt_fvm)
+
+            # Including the steps with and without the clean-up solves:
+            for i in range(4):
+                nls.strang_timestep(0.001)
+
+            assert(counts['df_dt'] > 0)
+            assert(counts['products'] == counts['df_dt'])
+
+            monkeypatch.undo()
+
+def test_lorentz_fields_invalidated(monkeypatch):
+    """
+    The product held is reused until the fields are reassigned or
+    changed in place by the solvers.
+    """
+    nls = make_solver(EM_fields_enabled = True,
+                      fields_initialize = 'multigrid',
+                      fields_solver     = 'multigrid'
+                     )
+
+    counts   = {'products' : 0}
+    multiply = fields.multiply
+
+    def counting_multiply(a, b):
+        if(a is nls.fields_solver._charge_by_mass):
+            counts['products'] += 1
+        return(multiply(a, b))
+
+    monkeypatch.setattr(fields, 'multiply', counting_multiply)
+
+    nls.fields_solver.get_lorentz_fields()
+    nls.fields_solver.get_lorentz_fields()
+    assert(counts['products'] == 1)
+
+    # Changed in place by the Poisson solve:
+    rho = multiply(nls.physical_system.params.charge, nls.compute_moments('density'))
+    nls.fields_solver.compute_electrostatic_fields(rho)
+    nls.fields_solver.get_lorentz_fields()
+    assert(counts['products'] == 2)
+
+    # Reassigned(as done by the rollback and the user-defined fields):
+    E = 2 * nls.fields_solver.cell_centered_EM_fields
+    nls.fields_solver.cell_centered_EM_fields = E
+
+    E1 = nls.fields_solver.get_lorentz_fields()[0]
+    assert(counts['products'] == 3)
+    assert(af.max(af.abs(E1 - multiply(nls.fields_solver._charge_by_mass, E[0]))) < 1e-14)
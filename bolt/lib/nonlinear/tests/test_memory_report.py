@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for memory_report. It is checked that the
+buffers held within the containers of the solver(the rollback states, the
+halo exchange buffers of the fields solver..) are listed with their sizes,
+and that a buffer which is reachable through several references is only
+counted once.
+"""
+
+import numpy as np
+import arrayfire as af
+
+from small_system import make_solver
+
+def test_memory_report_rollback_state():
+    nls = make_solver()
+    nls.enable_rollback(N_states = 2)
+    nls.strang_timestep(0.001)
+
+    sizes = nls.memory_report()
+
+    N_bytes_f = nls.f.elements() * 8
+
+    assert(sizes['f'] == N_bytes_f)
+    assert(sizes["_rollback['states'][0]['f']"] == N_bytes_f)
+
+def test_memory_report_containers():
+    nls = make_solver()
+
+    nls._scratch = {'buffers' : [af.constant(0, 10, dtype = af.Dtype.f32), 
+                                 np.zeros(7)
+                                ],
+                    'alias'   : nls.f
+                   }
+
+    sizes = nls.memory_report()
+
+    assert(sizes["_scratch['buffers'][0]"] == 40)
+    assert(sizes["_scratch['buffers'][1]"] == 56)
+
+    # nls.f is listed under its own name, and the alias isn't counted again:
+    assert("_scratch['alias']" not in sizes)
+    assert(sizes['f'] == nls.f.elements() * 8)
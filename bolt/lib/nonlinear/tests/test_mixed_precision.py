@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the solver when declared with
+precision = 'mixed'. It is checked that packing two single precision
+values into each entry of the PETSc vectors leaves the halo exchange
+unchanged, that the evolution stays within single precision tolerance
+of the double precision run, and that the distribution function is
+dumped in single precision without modifying the options database.
+"""
+
+import numpy as np
+import arrayfire as af
+import h5py
+from petsc4py import PETSc
+
+from small_system import make_solver
+
+def test_packed_halo_exchange():
+    nls_mixed  = make_solver({'precision' : 'mixed'})
+    nls_double = make_solver({'precision' : 'double'})
+
+    assert(nls_mixed._pack_f_in_communication == True)
+    assert(nls_double._pack_f_in_communication == False)
+    assert(nls_mixed._glob_f_array.dtype == np.float32)
+
+    # Values which are exactly representable in single precision:
+    f = af.cast(af.randu(nls_double.f.shape[0], nls_double.f.shape[1],
+                         nls_double.f.shape[2], nls_double.f.shape[3],
+                         dtype = af.Dtype.f32
+                        ),
+                af.Dtype.f64
+               )
+
+    nls_mixed.f  = af.cast(f, af.Dtype.f32)
+    nls_double.f = f
+
+    nls_mixed._communicate_f()
+    nls_double._communicate_f()
+
+    assert(nls_mixed.f.dtype() == af.Dtype.f32)
+    assert(np.array_equal(nls_mixed.f.to_ndarray(), 
+                          nls_double.f.to_ndarray().astype(np.float32)
+                         )
+          )
+
+def test_mixed_vs_double():
+    nls_mixed  = make_solver({'precision' : 'mixed'})
+    nls_double = make_solver({'precision' : 'double'})
+
+    dt = 0.001
+    for i in range(10):
+        nls_mixed.strang_timestep(dt)
+        nls_double.strang_timestep(dt)
+
+    assert(nls_mixed.f.dtype() == af.Dtype.f32)
+
+    n_mixed  = nls_mixed.compute_moments('density').to_ndarray()
+    n_double = nls_double.compute_moments('density').to_ndarray()
+
+    assert(np.max(np.abs(n_mixed - n_double)) < 1e-5 * np.max(np.abs(n_double)))
+
+def test_single_precision_dump(tmpdir):
+    nls       = make_solver({'precision' : 'mixed'})
+    file_name = str(tmpdir.join('f'))
+    N_g       = nls.N_ghost_q
+
+    nls.dump_distribution_function(file_name)
+
+    h5f = h5py.File(file_name + '.h5', 'r')
+    f   = h5f['distribution_function'][:]
+    h5f.close()
+
+    assert(f.dtype == np.float32)
+    
+    # Stored with the shape (N_q2, N_q1, N_s * N_p3 * N_p2 * N_p1):
+    f_ref = nls.f[:, :, N_g:-N_g, N_g:-N_g].to_ndarray().transpose(3, 2, 1, 0)
+    assert(np.array_equal(f, f_ref.reshape(f.shape)))
+
+    # The option used by the viewer isn't left in the options database:
+    assert(PETSc.Options().hasName('bolt_dump_f_viewer_hdf5_sp_output') == False)
+    assert(PETSc.Options('bolt_dump_f_').hasName('viewer_hdf5_sp_output') == False)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the selection of the moments which
+are dumped by dump_moments. It is checked that all the moments are
+selected by default, and that undefined moments are rejected.
+"""
+
+import pytest
+
+from bolt.lib.nonlinear.file_io.dump import _get_moment_names
+
+class moments(object):
+    def density(f, p1, p2, p3, integral_measure):
+        return(f)
+
+    def energy(f, p1, p2, p3, integral_measure):
+        return(f)
+
+    def integral_over_v(array, integral_measure):
+        return(array)
+
+class test(object):
+    def __init__(self):
+        self.physical_system = type('obj', (object,), {'moments' : moments})
+
+def test_get_moment_names():
+    obj = test()
+
+    assert(_get_moment_names(obj) == ['density', 'energy'])
+    assert(_get_moment_names(obj, ['energy']) == ['energy'])
+
+    with pytest.raises(ValueError):
+        _get_moment_names(obj, ['q_q1'])
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the per-rank output mode under
+file_io/per_rank.py. The per-rank files of a domain split across 2
+ranks are written, and it is checked that the global view presented
+by the virtual datasets(and the merged copy) holds the expected data.
+"""
+
+import numpy as np
+import h5py
+from mpi4py import MPI
+
+from bolt.lib.nonlinear.file_io.per_rank import write_per_rank, merge_per_rank, \
+                                                rank_file_name
+
+def test_write_per_rank(tmpdir):
+    N_q1, N_q2 = 16, 8
+    data       = np.random.rand(N_q2, N_q1, 3)
+    file_name  = str(tmpdir.join('moments'))
+
+    write_per_rank(MPI.COMM_SELF, ((0, 0), (N_q1, N_q2)), N_q1, N_q2,
+                   file_name, 'moments', data, attrs = {'N_species' : 1}
+                  )
+
+    with h5py.File(file_name + '.h5', 'r') as h5f:
+        assert(h5f['moments'].is_virtual)
+        assert(np.array_equal(h5f['moments'][:], data))
+        assert(h5f['moments'].attrs['N_species'] == 1)
+
+def test_merge_per_rank(tmpdir):
+    N_q1, N_q2 = 16, 8
+    data       = np.random.rand(N_q2, N_q1, 6)
+    file_name  = str(tmpdir.join('EM_fields'))
+
+    # Files as written by 2 ranks, with the domain split along q1:
+    for rank in range(2):
+        with h5py.File(rank_file_name(file_name, rank) + '.h5', 'w') as h5f:
+            dataset = h5f.create_dataset('EM_fields', 
+                                         data = data[:, rank * N_q1 // 2:(rank + 1) * N_q1 // 2]
+                                        )
+            dataset.attrs['i_q1_start'] = rank * N_q1 // 2
+            dataset.attrs['i_q2_start'] = 0
+            dataset.attrs['N_q1']       = N_q1
+            dataset.attrs['N_q2']       = N_q2
+
+    merge_per_rank(file_name)
+
+    with h5py.File(file_name + '.h5', 'r') as h5f:
+        assert(h5f['EM_fields'].is_virtual)
+        assert(np.array_equal(h5f['EM_fields'][:], data))
+
+    merge_per_rank(file_name, copy = True)
+
+    with h5py.File(file_name + '.h5', 'r') as h5f:
+        assert(not h5f['EM_fields'].is_virtual)
+        assert(np.array_equal(h5f['EM_fields'][:], data))
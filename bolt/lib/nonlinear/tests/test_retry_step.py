@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the retries made by the timestepping
+routines upon divergence(_retry_step in timestep.py), when rollback has
+been enabled. A NaN is injected into f during a step, and it is checked
+that the step is retried using substeps with the settings used for the
+retries, that the settings are restored afterwards, and that the run is
+terminated once the retry budget is exhausted.
+"""
+
+import numpy as np
+import arrayfire as af
+import pytest
+from mpi4py import MPI
+
+from bolt.lib.nonlinear import timestep
+from bolt.lib.nonlinear.timestep import _with_rollback, check_divergence
+from bolt.lib.nonlinear.temporal_evolution import rollback
+
+from small_system import make_solver
+
+class test(object):
+    def __init__(self):
+        self._comm       = MPI.COMM_SELF
+        self._host_syncs = {}
+        self.f           = af.constant(1, 8, 1, 4, 4, dtype = af.Dtype.f64)
+
+        self.time_elapsed = 0
+        self.time_step    = 0
+
+        self.lazy_evaluation           = False
+        self._jit_statistics           = None
+        self.divergence_check_interval = 1
+        self._auto_checkpoint          = 'auto_checkpoint'
+        self._rollback                 = None
+        self._diagnostics              = {'file_name' : None, 'registry' : []}
+
+        self.physical_system = \
+            type('obj', (object,), 
+                 {'params' : type('obj', (object,), 
+                                  {'EM_fields_enabled'          : False,
+                                   'reconstruction_method_in_q' : 'weno5',
+                                   'reconstruction_method_in_p' : 'weno5'
+                                  }
+                                 )
+                 }
+                )
+
+        # Settings seen by each call made to the step:
+        self.calls = []
+
+def make_step(diverges):
+    """
+    Returns a step which adds dt to f, and injects a NaN into f
+    when diverges(dt, number of calls made) is True.
+    """
+    @_with_rollback
+    def step(self, dt):
+        self.dt = dt
+        params  = self.physical_system.params
+        
+        self.calls.append({'dt'                        : dt,
+                           'reconstruction_method'     : params.reconstruction_method_in_q,
+                           'divergence_check_interval' : self.divergence_check_interval,
+                           'auto_checkpoint'           : self._auto_checkpoint
+                          }
+                         )
+        self.f = self.f + dt
+
+        if(diverges(dt, len(self.calls))):
+            self.f[0] = np.nan
+
+        check_divergence(self)
+        # Substeps advance the counters, which are overwritten by the retries:
+        self.time_elapsed += dt
+        self.time_step    += 1
+
+    return(step)
+
+def check_settings_restored(obj, dt):
+    params = obj.physical_system.params
+    
+    assert(params.reconstruction_method_in_q == 'weno5')
+    assert(params.reconstruction_method_in_p == 'weno5')
+    assert(obj.divergence_check_interval == 1)
+    assert(obj._auto_checkpoint == 'auto_checkpoint')
+    assert(obj.dt == dt)
+
+def test_retry_step_recovers():
+    obj  = test()
+    dt   = 0.5
+    step = make_step(lambda dt, N_calls: N_calls == 2)
+
+    rollback.enable_rollback(obj, fallback_reconstruction = 'minmod')
+
+    step(obj, dt)
+    step(obj, dt)
+
+    assert(obj.rollback_log == [{'time_step'  : 1,
+                                 'time'       : dt,
+                                 'retry'      : 1,
+                                 'dt'         : dt / 2,
+                                 'N_substeps' : 2
+                                }
+                               ]
+          )
+
+    # The retry is made with 2 substeps, using the settings for the retries:
+    assert([call['dt'] for call in obj.calls] == [dt, dt, dt / 2, dt / 2])
+    for call in obj.calls[2:]:
+        assert(call['reconstruction_method'] == 'minmod')
+        assert(call['divergence_check_interval'] == 0)
+        assert(call['auto_checkpoint'] is None)
+
+    # The substeps are counted as a single step of dt:
+    assert(obj.time_step == 2)
+    assert(obj.time_elapsed == 2 * dt)
+    assert(np.allclose(obj.f.to_ndarray(), 1 + 2 * dt))
+
+    check_settings_restored(obj, dt)
+
+def test_retry_budget_exhausted():
+    obj  = test()
+    dt   = 0.5
+    step = make_step(lambda dt, N_calls: N_calls > 1)
+
+    rollback.enable_rollback(obj, max_retries = 3, fallback_reconstruction = 'minmod')
+
+    step(obj, dt)
+
+    with pytest.raises(SystemExit):
+        step(obj, dt)
+
+    assert([entry['N_substeps'] for entry in obj.rollback_log] == [2, 4, 8])
+    assert([entry['time_step'] for entry in obj.rollback_log] == [1, 1, 1])
+
+    check_settings_restored(obj, dt)
+
+def test_retry_step_solver(monkeypatch):
+    """
+    A NaN is injected once into f while the solver takes a step, after which
+    the step is retried using 2 substeps. The result is then the same as that
+    of a solver which takes 2 steps of dt / 2.
+    """
+    op_fvm   = timestep.op_fvm
+    injected = []
+
+    def op_fvm_injecting_nan(self, dt):
+        op_fvm(self, dt)
+        if(len(injected) == 0):
+            injected.append(dt)
+            self.f[0, 0, 5, 5] = np.nan
+
+    monkeypatch.setattr(timestep, 'op_fvm', op_fvm_injecting_nan)
+
+    dt = 0.001
+
+    nls = make_solver()
+    nls.enable_rollback()
+    nls.strang_timestep(dt)
+
+    assert(len(nls.rollback_log) == 1)
+    assert(nls.rollback_log[0]['time_step'] == 0)
+    assert(nls.rollback_log[0]['N_substeps'] == 2)
+    
+    assert(nls.time_step == 1)
+    assert(nls.time_elapsed == dt)
+
+    nls_reference = make_solver()
+    nls_reference.strang_timestep(dt / 2)
+    nls_reference.strang_timestep(dt / 2)
+
+    assert(np.array_equal(nls.f.to_ndarray(), nls_reference.f.to_ndarray()))
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the functions under
+utils/rhs_blocks.py. It is checked that the blocks along q2
+partition the local zone, and that the number of blocks is
+taken as passed when it isn't determined automatically.
+"""
+
+import numpy as np
+
+from bolt.lib.nonlinear.utils.rhs_blocks import get_q2_blocks, get_N_rhs_blocks
+
+class test(object):
+    def __init__(self, rhs_blocks):
+        self.rhs_blocks    = rhs_blocks
+        self._N_rhs_blocks = {}
+
+def test_get_q2_blocks():
+    for N_q2_local, N_blocks in [(32, 1), (32, 3), (17, 4), (5, 8)]:
+        blocks = get_q2_blocks(N_q2_local, N_blocks)
+
+        assert(len(blocks) == min(N_blocks, N_q2_local))
+        assert(blocks[0][0] == 0)
+        assert(blocks[-1][1] == N_q2_local)
+
+        # Blocks are contiguous and non-empty:
+        for i in range(len(blocks)):
+            assert(blocks[i][1] > blocks[i][0])
+            if(i > 0):
+                assert(blocks[i][0] == blocks[i - 1][1])
+
+        # Blocks are balanced:
+        sizes = np.array([block[1] - block[0] for block in blocks])
+        assert(sizes.max() - sizes.min() <= 1)
+
+def test_get_N_rhs_blocks():
+    obj = test(4)
+    assert(get_N_rhs_blocks(obj, 24) == 4)
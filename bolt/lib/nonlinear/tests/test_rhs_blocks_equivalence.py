@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests which check that evaluating df_dt_fvm
+and f_interp_p_3d over blocks along q2 gives the same result as 
+evaluating them over the complete local zone. For df_dt_fvm, this is
+checked both without fields and with the electrostatic fields enabled,
+where the windows of the fields used for each block are also exercised.
+The values in the ghost zones are also compared, both for periodic and
+mirror boundaries along q2, with a random distribution function so that
+the stencils of the blocks at the ends of the local zone are exercised. 
+Since the interpolations in p-space need the fields, f_interp_p_3d is
+checked with the fields enabled.
+"""
+
+import numpy as np
+import arrayfire as af
+
+from bolt.lib.nonlinear.finite_volume.df_dt_fvm import df_dt_fvm
+from bolt.lib.nonlinear.semi_lagrangian.interpolation_routines import f_interp_p_3d
+
+from small_system import make_solver
+
+def make_solvers(EM_fields_enabled, in_q2 = 'periodic'):
+    return([make_solver({'rhs_blocks' : rhs_blocks}, {'N_q2' : 8},
+                        {'in_q2_bottom' : in_q2, 'in_q2_top' : in_q2},
+                        EM_fields_enabled = EM_fields_enabled
+                       )
+            for rhs_blocks in [1, 4]
+           ]
+          )
+
+def check_df_dt_fvm(EM_fields_enabled, in_q2 = 'periodic'):
+    nls_1, nls_4 = make_solvers(EM_fields_enabled, in_q2)
+
+    # Using the same random values in all the zones(inclusive of the ghost zones):
+    nls_1.f = af.randu(nls_1.f.shape[0], nls_1.f.shape[1], 
+                       nls_1.f.shape[2], nls_1.f.shape[3],
+                       dtype = af.Dtype.f64
+                      )
+    nls_4.f = nls_1.f.copy()
+
+    df_dt_1 = df_dt_fvm(nls_1.f, nls_1).to_ndarray()
+    df_dt_4 = df_dt_fvm(nls_4.f, nls_4).to_ndarray()
+
+    assert(np.max(np.abs(df_dt_1)) > 0)
+    assert(np.allclose(df_dt_1, df_dt_4, rtol = 1e-12, atol = 1e-14))
+
+    if(EM_fields_enabled == True):
+        assert(nls_4.fields_solver._q2_window is None)
+        assert(nls_4.fields_solver.at_n == nls_1.fields_solver.at_n)
+
+def test_f_interp_p_3d_blocks_with_fields():
+    nls_1, nls_4 = make_solvers(True)
+
+    f_interp_p_3d(nls_1, 0.01)
+    f_interp_p_3d(nls_4, 0.01)
+
+    assert(np.allclose(nls_1.f.to_ndarray(), nls_4.f.to_ndarray(),
+                       rtol = 1e-12, atol = 1e-14
+                      )
+          )
+
+    assert(nls_4.fields_solver._q2_window is None)
+
+def test_df_dt_fvm_blocks():
+    check_df_dt_fvm(False)
+
+def test_df_dt_fvm_blocks_with_fields():
+    check_df_dt_fvm(True)
+
+def test_df_dt_fvm_blocks_mirror():
+    check_df_dt_fvm(False, 'mirror')
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the routines under
+temporal_evolution/rollback.py. States are pushed into the ring
+buffer, and it is checked that the solver is restored to the latest
+finite state, with the non-finite states being discarded. The fields
+and the currents held for the sub-cycled FDTD are restored along with
+the distribution function.
+"""
+
+import numpy as np
+import arrayfire as af
+from mpi4py import MPI
+
+from bolt.lib.nonlinear.temporal_evolution import rollback
+
+class test(object):
+    def __init__(self):
+        self._comm = MPI.COMM_SELF
+        self.f     = af.constant(1, 8, 1, 4, 4, dtype = af.Dtype.f64)
+
+        self.time_elapsed = 0
+        self.time_step    = 0
+
+        self.physical_system = \
+            type('obj', (object,), 
+                 {'params' : type('obj', (object,), {'EM_fields_enabled' : False})}
+                )
+
+def test_restore_latest_finite_state():
+    obj = test()
+    rollback.enable_rollback(obj, N_states = 2)
+
+    rollback.save_state(obj)
+
+    obj.f           = 2 * obj.f
+    obj.time_step   = 1
+    rollback.save_state(obj)
+
+    obj.f           = obj.f * np.nan
+    obj.time_step   = 2
+    rollback.save_state(obj)
+
+    # Only the last 2 states are held, the latest of which isn't finite:
+    assert(len(obj._rollback['states']) == 2)
+    assert(rollback.restore_latest_finite_state(obj) == True)
+
+    assert(obj.time_step == 1)
+    assert(af.max(obj.f) == 2)
+    assert(len(obj._rollback['states']) == 1)
+
+    # The state held is unaffected by changes to the restored array:
+    obj.f[0] = 5
+    assert(af.max(obj._rollback['states'][-1]['f']) == 2)
+
+class fields_solver(object):
+    def __init__(self):
+        self.cell_centered_EM_fields                = af.constant(1, 6, 1, 4, 4, dtype = af.Dtype.f64)
+        self.cell_centered_EM_fields_at_n           = None
+        self.cell_centered_EM_fields_at_n_plus_half = None
+        self.yee_grid_EM_fields                     = None
+
+        self.at_n        = True
+        self._J_previous = None
+
+def test_restore_fields():
+    obj = test()
+    obj.physical_system.params.EM_fields_enabled = True
+    obj.fields_solver = fields_solver()
+
+    rollback.enable_rollback(obj, N_states = 2)
+
+    J_previous = tuple(af.constant(i, 1, 1, 4, 4, dtype = af.Dtype.f64) for i in range(3))
+    obj.fields_solver._J_previous = J_previous
+    rollback.save_state(obj)
+
+    # Changes made by a step which diverges:
+    obj.f                                     = obj.f * np.nan
+    obj.fields_solver.cell_centered_EM_fields = 2 * obj.fields_solver.cell_centered_EM_fields
+    obj.fields_solver.at_n                    = False
+    obj.fields_solver._J_previous             = tuple(J * np.nan for J in J_previous)
+
+    assert(rollback.restore_latest_finite_state(obj) == True)
+
+    assert(af.max(obj.fields_solver.cell_centered_EM_fields) == 1)
+    assert(obj.fields_solver.at_n == True)
+
+    for i in range(3):
+        assert(np.array_equal(obj.fields_solver._J_previous[i].to_ndarray(), 
+                              J_previous[i].to_ndarray()
+                             )
+              )
+
+    # States saved before sub-cycling began restore the currents as None:
+    obj.fields_solver._J_previous = None
+    rollback.save_state(obj)
+    obj.fields_solver._J_previous = J_previous
+
+    assert(rollback.restore_latest_finite_state(obj) == True)
+    assert(obj.fields_solver._J_previous is None)
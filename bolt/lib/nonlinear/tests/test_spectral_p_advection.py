@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+In this test we check that the advection in p-space for advection terms
+which don't depend on p(carried out using spectral shifts) shifts f by
+dt * A_p in each of the zones. For this purpose, a Gaussian is shifted
+by integral and fractional numbers of zones, and compared against the
+analytical solution. It is also checked that the spectral shifts are only
+used when requested using params.p_advection, and that the same agree
+with the interpolations for a complete solver.
+"""
+
+import numpy as np
+import arrayfire as af
+import pytest
+
+from bolt.lib.nonlinear.semi_lagrangian import interpolation_routines
+from bolt.lib.nonlinear.semi_lagrangian.interpolation_routines import \
+    _f_shift_p_spectral, f_interp_p_3d
+
+from small_system import make_solver
+
+class physical_system:
+    class params:
+        p_dim = 2
+
+class test(object):
+    def __init__(self):
+        self.N_p1, self.N_p2, self.N_p3 = 64, 64, 1
+        self.N_ghost_p = 0
+        self.N_q       = 3
+        
+        self.dp1 = self.dp2 = self.dp3 = 20 / 64
+
+        self.physical_system = physical_system
+        self._p_wavenumbers  = None
+
+    def _convert_to_p_expanded(self, array, N_q_local = None):
+        return(af.moddims(array, self.N_p1, self.N_p2, self.N_p3, self.N_q))
+
+    def _convert_to_q_expanded(self, array, N_q_local = None):
+        return(af.moddims(array, self.N_p1 * self.N_p2 * self.N_p3, 1, self.N_q, 1))
+
+def gaussian(obj, p1_shift, p2_shift):
+    p1 = (-10 + (0.5 + np.arange(obj.N_p1)) * obj.dp1).reshape(-1, 1)
+    p2 = (-10 + (0.5 + np.arange(obj.N_p2)) * obj.dp2).reshape(1, -1)
+
+    return(np.exp(-(p1 - p1_shift)**2 - (p2 - p2_shift)**2))
+
+def test_f_shift_p_spectral():
+    obj = test()
+
+    f = np.stack([gaussian(obj, 0, 0)] * obj.N_q, axis = 2)
+    f = af.moddims(af.to_array(f.ravel(order = 'F')), obj.N_p1 * obj.N_p2, 1, obj.N_q, 1)
+
+    # Shifts of 3 zones along p1, 1.5 zones along p2 in the zones:
+    dt   = 0.5
+    A_p1 = af.moddims(af.to_array(np.array([0, 3 * obj.dp1, -obj.dp1]) / dt), 1, 1, obj.N_q)
+    A_p2 = af.moddims(af.to_array(np.array([1.5 * obj.dp2, 0, 0]) / dt), 1, 1, obj.N_q)
+    A_p3 = 0 * A_p1
+
+    f_shifted = _f_shift_p_spectral(obj, f, A_p1, A_p2, A_p3, dt)
+    f_shifted = obj._convert_to_p_expanded(f_shifted).to_ndarray()
+
+    for i_q, (p1_shift, p2_shift) in enumerate([(0, 1.5), (3, 0), (-1, 0)]):
+        f_expected = gaussian(obj, p1_shift * obj.dp1, p2_shift * obj.dp2)
+        assert(np.max(np.abs(f_shifted[:, :, 0, i_q] - f_expected)) < 1e-10)
+
+def test_p_advection_option():
+    assert(make_solver()._p_advection == 'interpolation')
+    assert(make_solver(p_advection = 'spectral')._p_advection == 'spectral')
+
+    with pytest.raises(ValueError):
+        make_solver(p_advection = 'fft')
+
+    # The grid in p-space needs to be periodic for the spectral shifts:
+    with pytest.raises(ValueError):
+        make_solver(domain_kwargs = {'N_ghost_p' : 1}, p_advection = 'spectral')
+
+def test_spectral_p_advection_solver(monkeypatch):
+    calls = []
+    def f_shift_p_spectral(self, *args, **kwargs):
+        calls.append(self._p_advection)
+        return(_f_shift_p_spectral(self, *args, **kwargs))
+
+    monkeypatch.setattr(interpolation_routines, '_f_shift_p_spectral', f_shift_p_spectral)
+
+    nls_interpolation, nls_spectral = \
+        [make_solver(EM_fields_enabled = True, p_advection = p_advection)
+         for p_advection in ['interpolation', 'spectral']
+        ]
+
+    # Only the solver which requests the spectral shifts uses the same:
+    for nls in [nls_interpolation, nls_spectral]:
+        f_interp_p_3d(nls, 0.01)
+    
+    assert(calls == ['spectral'])
+
+    f_interpolation = nls_interpolation.f.to_ndarray()
+    f_spectral      = nls_spectral.f.to_ndarray()
+
+    assert(np.max(np.abs(f_spectral - f_interpolation)) < 1e-4 * np.max(np.abs(f_spectral)))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the time_series_writer under
+file_io/time_series.py. Data is appended at multiple times, and
+it is checked that the datasets are extended with the data and
+the time coordinate as expected. This is also checked for a domain
+split between 2 ranks when h5py doesn't have MPI support, in which
+case each rank appends to a file of its own.
+"""
+
+import numpy as np
+import h5py
+import pytest
+from petsc4py import PETSc
+
+from bolt.lib.nonlinear.file_io.time_series import time_series_writer, _chunk_shape
+
+class da(object):
+    def __init__(self, N_q1, N_q2, i_q2_start = 0):
+        self.N_q1       = N_q1
+        self.N_q2       = N_q2
+        self.i_q2_start = i_q2_start
+
+    def getCorners(self):
+        return((0, self.i_q2_start), (self.N_q1, self.N_q2))
+
+class two_rank_comm(object):
+    """
+    Stands in for the communicator of each of 2 ranks, which are
+    called in turn from this process.
+    """
+    size = 2
+
+    def __init__(self, rank, all_corners):
+        self.rank        = rank
+        self.all_corners = all_corners
+
+    def gather(self, value, root = 0):
+        # Only the corners of the local zones may be gathered:
+        assert(value in self.all_corners)
+        return(self.all_corners if self.rank == root else None)
+
+def test_chunk_shape():
+    assert(_chunk_shape((0, 32, 16, 5), 8) == (1, 32, 16, 5))
+
+    # Chunks are bounded in size:
+    chunks = _chunk_shape((0, 1024, 1024, 64), 8)
+    assert(np.prod(chunks) * 8 <= 2**22)
+    assert(chunks[2:] == (1024, 64))
+
+def test_time_series_writer(tmpdir):
+    N_q1, N_q2 = 16, 8
+
+    # The communicator held by the solvers:
+    comm = PETSc.COMM_WORLD.tompi4py()
+
+    writer = time_series_writer(str(tmpdir.join('time_series')), comm,
+                                N_q1, N_q2, da(N_q1, N_q2), flush_interval = 2
+                               )
+
+    data = [np.random.rand(N_q2 * N_q1 * 3) for i in range(3)]
+
+    for i in range(3):
+        writer.append('moments', 0.1 * i, data[i])
+
+    writer.append('EM_fields', 0.2, np.random.rand(N_q2 * N_q1 * 6))
+    writer.close()
+
+    h5f = h5py.File(str(tmpdir.join('time_series.h5')), 'r')
+
+    assert(h5f['moments'].shape == (3, N_q2, N_q1, 3))
+    assert(h5f['EM_fields'].shape == (1, N_q2, N_q1, 6))
+    assert(np.allclose(h5f['moments_time'][:], [0, 0.1, 0.2]))
+
+    for i in range(3):
+        assert(np.array_equal(h5f['moments'][i], data[i].reshape(N_q2, N_q1, 3)))
+
+    h5f.close()
+
+@pytest.mark.skipif(h5py.get_config().mpi == True, 
+                    reason = 'the ranks write collectively with MPI support in h5py'
+                   )
+def test_time_series_writer_without_mpi(tmpdir):
+    N_q1, N_q2 = 16, 8
+    file_name  = str(tmpdir.join('time_series'))
+
+    # Domain split along q2 between the 2 ranks:
+    all_corners = [((0, 0), (N_q1, N_q2 // 2)), ((0, N_q2 // 2), (N_q1, N_q2 // 2))]
+    writers     = [time_series_writer(file_name, two_rank_comm(rank, all_corners),
+                                      N_q1, N_q2, da(N_q1, N_q2 // 2, rank * N_q2 // 2),
+                                      flush_interval = 0
+                                     )
+                   for rank in range(2)
+                  ]
+
+    data = [np.random.rand(N_q2, N_q1, 3) for i in range(2)]
+
+    for i in range(2):
+        for rank in range(2):
+            writers[rank].append('moments', 0.1 * i, 
+                                 data[i][rank * N_q2 // 2:(rank + 1) * N_q2 // 2]
+                                )
+
+    # Rank 0 is closed last since it writes the virtual datasets:
+    writers[1].close()
+    writers[0].close()
+
+    h5f = h5py.File(file_name + '.h5', 'r')
+
+    assert(h5f['moments'].is_virtual)
+    assert(h5f['moments'].shape == (2, N_q2, N_q1, 3))
+    assert(np.allclose(h5f['moments_time'][:], [0, 0.1]))
+
+    for i in range(2):
+        assert(np.array_equal(h5f['moments'][i], data[i]))
+
+    h5f.close()
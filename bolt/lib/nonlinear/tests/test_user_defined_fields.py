@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+In this test we check that the user defined fields are held fixed when
+declared static, and are linearly interpolated in time when these are
+declared at tabulated times.
+"""
+
+import numpy as np
+import arrayfire as af
+
+from bolt.lib.nonlinear.fields.fields import fields_solver
+
+class params:
+    
+    @staticmethod
+    def user_defined_E(q1, q2, t):
+        return(t + 0 * q1, 2 * t + 0 * q1, 0 * q1)
+
+    @staticmethod
+    def user_defined_B(q1, q2, t):
+        return(1 + 0 * q1, 0 * q1, 0 * q1)
+
+class test(object):
+    def __init__(self):
+        self.q1 = af.constant(0, 1, 1, 8, 8, dtype = af.Dtype.f64)
+        self.q2 = af.constant(0, 1, 1, 8, 8, dtype = af.Dtype.f64)
+
+        self.params = params
+
+    _evaluate_user_defined_fields   = fields_solver._evaluate_user_defined_fields
+    _initialize_user_defined_fields = fields_solver._initialize_user_defined_fields
+    update_user_defined_fields      = fields_solver.update_user_defined_fields
+
+def test_user_defined_fields_static():
+    params.user_defined_fields_static = True
+    params.user_defined_fields_times  = None
+
+    obj = test()
+    obj._initialize_user_defined_fields()
+    obj.update_user_defined_fields(0.5)
+
+    assert(af.max(af.abs(obj.cell_centered_EM_fields[:2])) == 0)
+
+def test_user_defined_fields_tabulated():
+    params.user_defined_fields_static = False
+    params.user_defined_fields_times  = [0, 1, 2]
+
+    obj = test()
+    obj._initialize_user_defined_fields()
+
+    for t, E1 in [(0.25, 0.25), (1.5, 1.5), (3, 2)]:
+        obj.update_user_defined_fields(t)
+        assert(np.isclose(af.max(obj.cell_centered_EM_fields[0]), E1))
+        assert(np.isclose(af.max(obj.cell_centered_EM_fields[1]), 2 * E1))
+        assert(np.isclose(af.min(obj.cell_centered_EM_fields[3]), 1))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+This file contains the tests for the functions under file_io/write_hdf5.py.
+It is checked that the chunks hold complete velocity blocks, and that the 
+data written with compression and reduced precision is read back as expected.
+Additionally, it is checked that the local zones read back for a partitioning
+of the domain different from the one used in writing hold the expected data,
+and that without MPI support in h5py the ranks write files of their own(with
+the global view presented through a virtual dataset) instead of gathering
+the local zones to a single rank.
+"""
+
+import numpy as np
+import h5py
+import pytest
+from mpi4py import MPI
+
+from bolt.lib.nonlinear.file_io.write_hdf5 import write_hdf5, velocity_block_chunks
+from bolt.lib.nonlinear.file_io.write_hdf5 import write_hdf5_attrs, read_hdf5, read_hdf5_attrs
+
+class two_rank_comm(object):
+    """
+    Stands in for the communicator of each of 2 ranks, which are
+    called in turn from this process.
+    """
+    size = 2
+
+    def __init__(self, rank, all_corners):
+        self.rank        = rank
+        self.all_corners = all_corners
+
+    def gather(self, value, root = 0):
+        # Only the corners of the local zones may be gathered:
+        assert(value in self.all_corners)
+        return(self.all_corners if self.rank == root else None)
+
+def test_velocity_block_chunks():
+    assert(velocity_block_chunks((32, 16, 64), 8) == (32, 16, 64))
+
+    # Chunks are bounded in size, and hold complete velocity blocks:
+    chunks = velocity_block_chunks((1024, 1024, 32**3), 4)
+    assert(np.prod(chunks) * 4 <= 2**22)
+    assert(chunks[2] == 32**3)
+
+def test_write_hdf5(tmpdir):
+    N_q1, N_q2, dof = 16, 8, 27
+    data = np.random.rand(N_q2, N_q1, dof)
+
+    write_hdf5(MPI.COMM_SELF, ((0, 0), (N_q1, N_q2)), N_q1, N_q2,
+               str(tmpdir.join('dump')), 'distribution_function',
+               data.astype(np.float16), compression = 'gzip', shuffle = True,
+               chunks = velocity_block_chunks((N_q2, N_q1, dof), 2),
+               attrs  = {'N_p1' : 3}
+              )
+
+    h5f     = h5py.File(str(tmpdir.join('dump.h5')), 'r')
+    dataset = h5f['distribution_function']
+
+    assert(dataset.dtype == np.float16)
+    assert(dataset.compression == 'gzip')
+    assert(dataset.attrs['N_p1'] == 3)
+    assert(np.allclose(dataset[:], data, rtol = 1e-3))
+
+    h5f.close()
+
+def test_read_hdf5(tmpdir):
+    N_q1, N_q2, dof = 16, 8, 6
+    data = np.random.rand(N_q2, N_q1, dof)
+
+    file_name = str(tmpdir.join('checkpoint'))
+
+    write_hdf5(MPI.COMM_SELF, ((0, 0), (N_q1, N_q2)), N_q1, N_q2,
+               file_name, 'EM_fields/cell_centered_EM_fields', data
+              )
+    write_hdf5_attrs(MPI.COMM_SELF, file_name, {'time_elapsed' : 0.5})
+
+    # Reading the zones of a 2 x 2 partitioning of the domain:
+    for i_q1_start in [0, N_q1 // 2]:
+        for i_q2_start in [0, N_q2 // 2]:
+            local_data = read_hdf5(MPI.COMM_SELF, 
+                                   ((i_q1_start, i_q2_start), (N_q1 // 2, N_q2 // 2)),
+                                   file_name, 'EM_fields/cell_centered_EM_fields'
+                                  )
+
+            assert(np.array_equal(local_data, 
+                                  data[i_q2_start:i_q2_start + N_q2 // 2,
+                                       i_q1_start:i_q1_start + N_q1 // 2
+                                      ]
+                                 )
+                  )
+
+    assert(read_hdf5_attrs(file_name)['time_elapsed'] == 0.5)
+
+@pytest.mark.skipif(h5py.get_config().mpi == True, 
+                    reason = 'the ranks write collectively with MPI support in h5py'
+                   )
+def test_write_hdf5_without_mpi(tmpdir):
+    N_q1, N_q2, dof = 16, 8, 6
+    data = np.random.rand(N_q2, N_q1, dof)
+
+    file_name = str(tmpdir.join('checkpoint'))
+
+    # Domain split along q2 between the 2 ranks:
+    all_corners = [((0, 0), (N_q1, N_q2 // 2)), ((0, N_q2 // 2), (N_q1, N_q2 // 2))]
+
+    # Rank 0 is called last since it writes the virtual dataset:
+    for rank in [1, 0]:
+        ((i_q1_start, i_q2_start), (N_q1_local, N_q2_local)) = all_corners[rank]
+
+        write_hdf5(two_rank_comm(rank, all_corners), all_corners[rank], N_q1, N_q2,
+                   file_name, 'EM_fields/cell_centered_EM_fields',
+                   data[i_q2_start:i_q2_start + N_q2_local]
+                  )
+
+    with h5py.File(file_name + '.h5', 'r') as h5f:
+        assert(h5f['EM_fields/cell_centered_EM_fields'].is_virtual)
+
+    local_data = read_hdf5(MPI.COMM_SELF, ((0, 0), (N_q1, N_q2)), file_name,
+                           'EM_fields/cell_centered_EM_fields'
+                          )
+
+    assert(np.array_equal(local_data, data))
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+In this test we check that the interpolations between the cell centered
+grid and the Yee grid, which are evaluated as a single stencil over all
+the components, agree with the interpolations carried out separately
+for each of the components.
+"""
+
+import numpy as np
+import arrayfire as af
+
+from bolt.lib.nonlinear.fields.fields import _yee_stencil, _yee_grid_weights
+
+def interpolate_by_component(F, d):
+    E1, E2, E3, B1, B2, B3 = [F[i] for i in range(6)]
+
+    return(af.join(0, 
+                   af.join(0, 0.5 * (E1 + af.shift(E1, 0, 0, 0, d)),
+                              0.5 * (E2 + af.shift(E2, 0, 0, d, 0)),
+                              0.25 * (  E3 + af.shift(E3, 0, 0, d, 0)
+                                      + af.shift(E3, 0, 0, 0, d)
+                                      + af.shift(E3, 0, 0, d, d)
+                                     )
+                          ),
+                   af.join(0, 0.5 * (B1 + af.shift(B1, 0, 0, d, 0)),
+                              0.5 * (B2 + af.shift(B2, 0, 0, 0, d)),
+                              B3
+                          )
+                  )
+          )
+
+def test_yee_stencil():
+    F       = af.randu(6, 1, 16, 24, dtype = af.Dtype.f64)
+    weights = [af.to_array(w.copy()) for w in _yee_grid_weights]
+
+    for d in [1, -1]:
+        error = af.max(af.abs(  _yee_stencil(F, weights, d) 
+                              - interpolate_by_component(F, d)
+                             )
+                      )
+        assert(error < 1e-14)
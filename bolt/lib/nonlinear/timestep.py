@@ -15,28 +15,162 @@ NOTE: When FVM is used in the q-space as well as the p-space, there is no splitt
       case, all the methods are equivalent.
 """ 
 
+import functools
+
 import arrayfire as af
 import numpy as np
+from mpi4py import MPI
+
+from .utils.host_syncs import host_sync, record_host_sync
+from .file_io.checkpoint import check_auto_checkpoint
+from .utils.diagnostics import evaluate_diagnostics
+from .utils.lazy_evaluation import lazy_evaluation_mode
 
 # Importing functions used used for time-splitting and time-stepping:
 from .temporal_evolution import operator_splitting_methods as split
+from .temporal_evolution import rollback
 
 # Importing solver functions:
 from .finite_volume.fvm_operator import op_fvm
 from .semi_lagrangian.asl_operators import op_advect_q, op_solve_src, op_fields
 
-def check_divergence(self):
+def check_divergence(self, force = False):
     """
     Used to terminate the program if a blowup occurs in any segment
     of the solver, resulting in the values becoming infinity or 
     undefined.
-    """
 
-    if(   af.any_true(af.isinf(self.f))
-       or af.any_true(af.isnan(self.f))
+    Since the host needs to wait on the device to make this check, it
+    is only carried out once every divergence_check_interval timesteps
+    (unless force is True). A single reduction is used to detect both 
+    infinities and NaNs, since the sum of an array holding either of 
+    them isn't finite. The result is reduced across the ranks so that
+    all the ranks act upon the divergence together.
+
+    When rollback has been enabled, solver_diverging is raised so that 
+    the step may be retried.
+    """
+    if(    force == False
+       and (   self.divergence_check_interval == 0
+            or (self.time_step + 1) % self.divergence_check_interval != 0
+           )
       ):
+        return
+
+    record_host_sync(self, 'check_divergence')
+
+    diverged = not np.isfinite(af.sum(self.f))
+
+    if(self._comm.size > 1):
+        diverged = self._comm.allreduce(diverged, op = MPI.LOR)
+
+    if(diverged):
+        if(self._rollback is not None):
+            raise rollback.solver_diverging()
+
         raise SystemExit('Solver Diverging!')
 
+def _retry_step(self, step, dt, target_time_step):
+    """
+    Rolls back to the latest finite state held, and advances the solver
+    from the same up to target_time_step using substeps of a reduced 
+    timestep. The timestep is reduced further upon each failed retry.
+    """
+    params = self.physical_system.params
+
+    max_retries             = self._rollback['max_retries']
+    dt_reduction            = self._rollback['dt_reduction']
+    fallback_reconstruction = self._rollback['fallback_reconstruction']
+
+    # The checks for divergence are made at the end of each step during the
+    # retries, while checkpoints aren't written from the intermediate states:
+    divergence_check_interval  = self.divergence_check_interval
+    auto_checkpoint            = self._auto_checkpoint
+    reconstruction_method_in_q = params.reconstruction_method_in_q
+    reconstruction_method_in_p = params.reconstruction_method_in_p
+
+    self.divergence_check_interval = 0
+    self._auto_checkpoint          = None
+
+    if(fallback_reconstruction is not None):
+        params.reconstruction_method_in_q = fallback_reconstruction
+        params.reconstruction_method_in_p = fallback_reconstruction
+
+    try:
+        for retry in range(1, max_retries + 1):
+
+            if(rollback.restore_latest_finite_state(self) == False):
+                raise SystemExit('Solver Diverging! No finite state to roll back to')
+
+            N_substeps = int(round((1 / dt_reduction)**retry))
+            rollback.log_retry(self, retry, dt / N_substeps, N_substeps)
+
+            try:
+                while(self.time_step < target_time_step):
+                    time_elapsed = self.time_elapsed
+                    time_step    = self.time_step
+
+                    for i in range(N_substeps):
+                        step(self, dt / N_substeps)
+
+                    check_divergence(self, force = True)
+
+                    # Counting the substeps as a single step of dt:
+                    self.time_elapsed = time_elapsed + dt
+                    self.time_step    = time_step + 1
+
+                    if(self.time_step < target_time_step):
+                        rollback.save_state(self)
+
+                return
+
+            except rollback.solver_diverging:
+                continue
+
+        raise SystemExit('Solver Diverging! Retry budget exhausted at timestep ' +
+                         str(target_time_step)
+                        )
+
+    finally:
+        self.divergence_check_interval    = divergence_check_interval
+        self._auto_checkpoint             = auto_checkpoint
+        params.reconstruction_method_in_q = reconstruction_method_in_q
+        params.reconstruction_method_in_p = reconstruction_method_in_p
+        self.dt                           = dt
+
+def _with_rollback(step):
+    """
+    Wraps the timestepping routines such that the accepted states are 
+    held and the step is retried upon divergence, when rollback has been
+    enabled using enable_rollback. The diagnostics registered are 
+    evaluated at the end of each accepted step. The lazy evaluation mode
+    and the JIT counters of the solver are active for the duration of the
+    step.
+    """
+    @functools.wraps(step)
+    def step_with_rollback(self, dt):
+        with lazy_evaluation_mode(self.lazy_evaluation, self._jit_statistics):
+
+            if(self._rollback is None):
+                step(self, dt)
+
+            else:
+                rollback.save_state(self)
+                target_time_step = self.time_step + 1
+
+                try:
+                    step(self, dt)
+                except rollback.solver_diverging:
+                    _retry_step(self, step, dt, target_time_step)
+
+            # Evaluated once the step has been accepted:
+            evaluate_diagnostics(self)
+
+        return
+
+    return(step_with_rollback)
+
+@_with_rollback
 def lie_step(self, dt):
     """
     Advances the system using a lie-split scheme. 
@@ -89,14 +223,17 @@ def lie_step(self, dt):
 
     check_divergence(self)
     self.time_elapsed += dt 
+    self.time_step    += 1
+    check_auto_checkpoint(self)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_ts += toc - tic
 
     return
 
+@_with_rollback
 def strang_step(self, dt):
     """
     Advances the system using a strang-split scheme. This scheme is 
@@ -149,14 +286,17 @@ def strang_step(self, dt):
 
     check_divergence(self)
     self.time_elapsed += dt 
+    self.time_step    += 1
+    check_auto_checkpoint(self)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_ts += toc - tic
 
     return
 
+@_with_rollback
 def swss_step(self, dt):
     """
     Advances the system using a SWSS-split scheme. 
@@ -209,15 +349,18 @@ def swss_step(self, dt):
 
     check_divergence(self)
     self.time_elapsed += dt 
+    self.time_step    += 1
+    check_auto_checkpoint(self)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_ts += toc - tic
 
     return
 
 
+@_with_rollback
 def jia_step(self, dt):
     """
     Advances the system using the Jia split scheme.
@@ -272,9 +415,11 @@ def jia_step(self, dt):
 
     check_divergence(self)
     self.time_elapsed += dt 
+    self.time_step    += 1
+    check_auto_checkpoint(self)
 
     if(self.performance_test_flag == True):
-        af.sync()
+        host_sync(self, 'performance_timing')
         toc = af.time()
         self.time_ts += toc - tic
 
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Contains the registry of in-situ diagnostics, which are reductions of the
+state of the solver evaluated during the run.
+
+The diagnostics registered are evaluated on the device every interval
+steps, and the values are accumulated in a device buffer without being
+transferred to the host. Once flush_interval evaluations have been
+accumulated, the buffer is transferred to the host in a single transfer,
+reduced across the ranks using a single MPI reduction per reduction
+operation, and appended to a time series in an HDF5 file(written by rank 0).
+
+Each diagnostic is a function which takes the solver and returns an
+af.Array holding the contribution of the local zone(non-inclusive of the
+ghost zones). The contributions are reduced across the ranks using the
+operation registered('sum', 'max' or 'min'), after which an optional
+post-processing function is applied on the host.
+
+The following diagnostics are built in for the nonlinear solver(the values
+are per species, with the integrals taken over the phase space):
+
+- mass         : integral of f
+- momentum     : integral of f * (p1, p2, p3)
+- energy       : integral of f * (p1^2 + p2^2 + p3^2) / 2
+- l2_norm      : sqrt(integral of f^2)
+- entropy      : -integral of f * ln(f), over the zones where f > 0
+- field_energy : integral of (E^2, B^2) / 2 over the domain
+- fourier_mode : amplitude of the mode (k_q1, k_q2) of the density, where
+                 k_q1, k_q2 are the integer wavenumbers passed as mode.
+"""
+
+import numpy as np
+import arrayfire as af
+import h5py
+from mpi4py import MPI
+
+from .broadcasted_primitive_operations import multiply
+from ..compute_moments import _get_moment_inputs
+
+_mpi_ops = {'sum' : MPI.SUM, 'max' : MPI.MAX, 'min' : MPI.MIN}
+
+def _get_f_and_p(self):
+    """
+    Returns f(non-inclusive of the ghost zones in p and q-space) in
+    double precision along with the p-arrays, and the phase space
+    volume element.
+    """
+    N_g = self.N_ghost_q
+
+    f, p1, p2, p3 = _get_moment_inputs(self, self.f[:, :, N_g:-N_g, N_g:-N_g])
+    dv            = self.dp1 * self.dp2 * self.dp3 * self.dq1 * self.dq2
+
+    return(f, p1, p2, p3, dv)
+
+def _sum_per_species(array):
+    # Summing over p-space and q-space, leaving the species axis:
+    return(af.sum(af.sum(af.sum(array, 0), 2), 3))
+
+def _mass(self):
+    f, p1, p2, p3, dv = _get_f_and_p(self)
+    return(dv * _sum_per_species(f))
+
+def _momentum(self):
+    f, p1, p2, p3, dv = _get_f_and_p(self)
+    return(dv * af.join(0, _sum_per_species(multiply(f, p1)),
+                           _sum_per_species(multiply(f, p2)),
+                           _sum_per_species(multiply(f, p3))
+                       )
+          )
+
+def _energy(self):
+    f, p1, p2, p3, dv = _get_f_and_p(self)
+    return(0.5 * dv * _sum_per_species(multiply(f, p1**2 + p2**2 + p3**2)))
+
+def _l2_norm(self):
+    f, p1, p2, p3, dv = _get_f_and_p(self)
+    return(dv * _sum_per_species(f**2))
+
+def _entropy(self):
+    f, p1, p2, p3, dv = _get_f_and_p(self)
+    positive = f > 0
+    return(-dv * _sum_per_species(af.select(positive, f * af.log(af.select(positive, f, 1)), 0)))
+
+def _field_energy(self):
+    N_g    = self.N_ghost_q
+    fields = self.fields_solver.cell_centered_EM_fields[:, :, N_g:-N_g, N_g:-N_g]
+
+    return(0.5 * self.dq1 * self.dq2 * af.join(0, af.sum(af.flat(fields[:3]**2), 0),
+                                                  af.sum(af.flat(fields[3:]**2), 0)
+                                              )
+          )
+
+def _fourier_mode(mode):
+    """
+    Returns the diagnostic for the amplitude of the mode (k_q1, k_q2)
+    of the density. The partial sums of the discrete Fourier transform
+    over the local zones are reduced across the ranks, which avoids a
+    distributed FFT.
+    """
+    k_q1, k_q2 = mode
+
+    def fourier_mode(self):
+        N_g = self.N_ghost_q
+        f, p1, p2, p3, dv = _get_f_and_p(self)
+
+        density = af.sum(f, 0) * self.dp1 * self.dp2 * self.dp3
+        phase   = 2 * np.pi * (  k_q1 * (self.q1_center[:, :, N_g:-N_g, N_g:-N_g] - self.q1_start)
+                                      / (self.q1_end - self.q1_start)
+                               + k_q2 * (self.q2_center[:, :, N_g:-N_g, N_g:-N_g] - self.q2_start)
+                                      / (self.q2_end - self.q2_start)
+                              )
+
+        N_q = self.N_q1 * self.N_q2
+        return(af.join(0, af.flat(af.sum(af.sum(multiply(density, af.cos(phase)), 2), 3)),
+                          af.flat(af.sum(af.sum(multiply(density, -af.sin(phase)), 2), 3))
+                      ) / N_q
+              )
+
+    return(fourier_mode)
+
+def _fourier_mode_amplitude(values):
+    # The values hold (real, imaginary) parts for each species:
+    values = values.reshape(values.shape[0], 2, -1)
+    return(np.sqrt(values[:, 0]**2 + values[:, 1]**2))
+
+_built_in = {'mass'         : (_mass,         'sum', None),
+             'momentum'     : (_momentum,     'sum', None),
+             'energy'       : (_energy,       'sum', None),
+             'l2_norm'      : (_l2_norm,      'sum', np.sqrt),
+             'entropy'      : (_entropy,      'sum', None),
+             'field_energy' : (_field_energy, 'sum', None)
+            }
+
+def register_diagnostic(self, name, function = None, reduction = 'sum', post = None,
+                        mode = None
+                       ):
+    """
+    Registers a diagnostic which is evaluated every interval steps once
+    the diagnostics have been enabled using enable_diagnostics.
+
+    Parameters
+    ----------
+
+    name : str
+           Name of the dataset holding the diagnostic. When function isn't
+           passed, this needs to be one of the built in diagnostics: mass,
+           momentum, energy, l2_norm, entropy, field_energy, fourier_mode.
+           Names starting with fourier_mode(such as fourier_mode_1_0) may
+           be used to register multiple modes.
+
+    function : callable
+               function(solver) returning an af.Array with the contribution
+               of the local zone to the diagnostic.
+
+    reduction : str
+                Operation used in reducing the contributions across the
+                ranks('sum', 'max' or 'min').
+
+    post : callable
+           Function applied on the host to the reduced values, which are
+           passed as an array of shape (N_t, N_values).
+
+    mode : tuple
+           Integer wavenumbers (k_q1, k_q2) of the mode for fourier_mode. This
+           needs to be passed for the names starting with fourier_mode.
+
+    Examples
+    --------
+
+    >> solver.register_diagnostic('mass')
+
+    >> solver.register_diagnostic('fourier_mode_1_0', mode = (1, 0))
+
+    >> solver.register_diagnostic('max_density',
+                                  lambda solver: af.max(af.flat(solver.compute_moments('density')), 0),
+                                  reduction = 'max'
+                                 )
+    """
+    if(function is None):
+        if(name.startswith('fourier_mode')):
+            if(   not isinstance(mode, (tuple, list)) or len(mode) != 2
+               or not all(isinstance(k, (int, np.integer)) for k in mode)
+              ):
+                raise ValueError('Diagnostic ' + name + ' needs to be passed the ' +
+                                 'integer wavenumbers of the mode as mode = (k_q1, k_q2)'
+                                )
+
+            function, post = _fourier_mode(mode), _fourier_mode_amplitude
+
+        elif(name in _built_in):
+            function, reduction, post = _built_in[name]
+
+        else:
+            raise ValueError('Diagnostic ' + name + ' is not built in, and ' +
+                             'needs to be passed a function'
+                            )
+
+    if(reduction not in _mpi_ops):
+        raise ValueError('reduction needs to be one of sum, max or min')
+
+    if(self._diagnostics['buffer'] is not None):
+        raise RuntimeError('Diagnostics need to be registered before the first evaluation')
+
+    self._diagnostics['registry'].append({'name'      : name,
+                                          'function'  : function,
+                                          'reduction' : reduction,
+                                          'post'      : post,
+                                          'size'      : None
+                                         })
+    return
+
+def _initialize_diagnostics(self):
+    """
+    Returns the state held by the solver for the diagnostics.
+    """
+    return({'registry'       : [],
+            'file_name'      : None,
+            'interval'       : 1,
+            'flush_interval' : 1,
+            'N_calls'        : 0,
+            'buffer'         : None,
+            'N_rows'         : 0,
+            'times'          : [],
+            'h5f'            : None
+           })
+
+def enable_diagnostics(self, file_name, interval = 1, flush_interval = 100):
+    """
+    Enables the evaluation of the registered diagnostics, which are
+    written to the file 'file_name.h5'.
+
+    Parameters
+    ----------
+
+    file_name : str
+                Name of the file(without the extension) to be written.
+
+    interval : int
+               Number of steps(calls to evaluate_diagnostics) after which
+               the diagnostics are evaluated.
+
+    flush_interval : int
+                     Number of evaluations accumulated on the device before
+                     being reduced and written to file.
+    """
+    self._diagnostics['file_name']      = file_name
+    self._diagnostics['interval']       = interval
+    self._diagnostics['flush_interval'] = flush_interval
+    return
+
+def evaluate_diagnostics(self):
+    """
+    Evaluates the diagnostics(every interval calls) into the device buffer,
+    flushing the same when full. This is called by the timestepping routines
+    of the nonlinear solver at the end of each step, and needs to be called
+    at the end of each step by the user with the linear solver.
+    """
+    state = self._diagnostics
+
+    if(state['file_name'] is None or len(state['registry']) == 0):
+        return
+
+    state['N_calls'] += 1
+    if(state['N_calls'] % state['interval'] != 0):
+        return
+
+    values = [af.flat(af.cast(diagnostic['function'](self), af.Dtype.f64))
+              for diagnostic in state['registry']
+             ]
+
+    if(state['buffer'] is None):
+        for diagnostic, value in zip(state['registry'], values):
+            diagnostic['size'] = value.elements()
+
+        state['buffer'] = af.constant(0, sum(value.elements() for value in values),
+                                      state['flush_interval'], dtype = af.Dtype.f64
+                                     )
+
+    offset = 0
+    for value in values:
+        state['buffer'][offset:offset + value.elements(), state['N_rows']] = value
+        offset += value.elements()
+
+    af.eval(state['buffer'])
+
+    state['times'].append((self.time_elapsed, getattr(self, 'time_step', state['N_calls'])))
+    state['N_rows'] += 1
+
+    if(state['N_rows'] == state['flush_interval']):
+        flush_diagnostics(self)
+
+    return
+
+def flush_diagnostics(self):
+    """
+    Reduces the values accumulated in the device buffer across the ranks,
+    and appends the same to the file. This needs to be called by all ranks.
+    """
+    state = self._diagnostics
+
+    if(state['N_rows'] == 0):
+        return
+
+    comm   = self._comm
+    N_rows = state['N_rows']
+
+    # Single transfer to the host, as (N_rows, N_values):
+    values = np.ascontiguousarray(state['buffer'][:, :N_rows].to_ndarray().reshape(-1, N_rows).T)
+
+    # A single reduction for each of the reduction operations used:
+    reduced = np.empty_like(values)
+    for reduction in _mpi_ops:
+        columns = []
+        offset  = 0
+        for diagnostic in state['registry']:
+            if(diagnostic['reduction'] == reduction):
+                columns += list(range(offset, offset + diagnostic['size']))
+            offset += diagnostic['size']
+
+        if(len(columns) > 0):
+            send = np.ascontiguousarray(values[:, columns])
+            recv = np.empty_like(send)
+            comm.Reduce(send, recv, op = _mpi_ops[reduction], root = 0)
+            reduced[:, columns] = recv
+
+    if(comm.rank == 0):
+        _append_diagnostics(state, reduced)
+
+    state['N_rows'] = 0
+    state['times']  = []
+    return
+
+def _output_size(diagnostic):
+    """
+    Returns the number of values written for the diagnostic, which
+    may be changed from that evaluated by the post-processing.
+    """
+    if(diagnostic['post'] is None):
+        return(diagnostic['size'])
+
+    return(np.asarray(diagnostic['post'](np.zeros((1, diagnostic['size'])))).size)
+
+def _append_diagnostics(state, reduced):
+    """
+    Appends the reduced values of the diagnostics to the file.
+    """
+    if(state['h5f'] is None):
+        state['h5f'] = h5py.File(state['file_name'] + '.h5', 'w')
+
+        for name, size in ([('time', 1), ('time_step', 1)] +
+                           [(diagnostic['name'], _output_size(diagnostic))
+                            for diagnostic in state['registry']
+                           ]
+                          ):
+            state['h5f'].create_dataset(name, (0, size), maxshape = (None, size),
+                                        dtype = np.int64 if name == 'time_step' else np.float64,
+                                        chunks = (max(1, state['flush_interval']), size)
+                                       )
+
+    h5f    = state['h5f']
+    N_t    = h5f['time'].shape[0]
+    N_rows = reduced.shape[0]
+    times  = np.array(state['times'])
+
+    columns = {'time'      : times[:, :1],
+               'time_step' : times[:, 1:]
+              }
+
+    offset = 0
+    for diagnostic in state['registry']:
+        values = reduced[:, offset:offset + diagnostic['size']]
+        offset += diagnostic['size']
+
+        if(diagnostic['post'] is not None):
+            values = np.asarray(diagnostic['post'](values)).reshape(N_rows, -1)
+
+        columns[diagnostic['name']] = values
+
+    for name, values in columns.items():
+        h5f[name].resize(N_t + N_rows, axis = 0)
+        h5f[name][N_t:] = values
+
+    h5f.flush()
+    return
+
+def close_diagnostics(self):
+    """
+    Writes the diagnostics accumulated, and closes the file.
+    """
+    flush_diagnostics(self)
+
+    if(self._diagnostics['h5f'] is not None):
+        self._diagnostics['h5f'].close()
+
+    self._diagnostics = _initialize_diagnostics(self)
+    return
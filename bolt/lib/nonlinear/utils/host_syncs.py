@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Keeps count of the device --> host synchronizations made by the solver.
+
+Every point at which the host has to wait on the device(reading a reduction
+to make a decision on the host, copying arrays to the PETSc buffers for
+communication, or an explicit af.sync) stalls the asynchronous queue of
+ArrayFire. The sites at which these take place are recorded here so that
+they may be audited using print_host_syncs of the nonlinear solver.
+
+The counts are held by each solver(_host_syncs), and the fields solver
+shares the counters of the nonlinear solver which declared it, such that
+the syncs of one solver aren't mixed with those of other solvers.
+
+For a production run(performance_test_flag = False), a timestep should
+only contain the transfers needed for the communication of the boundary
+zones, in addition to the single reduction made by check_divergence on
+the steps on which it is carried out.
+"""
+
+import numpy as np
+import arrayfire as af
+from petsc4py import PETSc
+from mpi4py import MPI
+from prettytable import PrettyTable
+
+def record_host_sync(self, site):
+    """
+    Records a synchronization made at the site passed.
+
+    Parameters
+    ----------
+
+    self: nonlinear_solver/fields_solver
+          The solver whose counters are incremented.
+
+    site: str
+          Name of the routine which performs the synchronization.
+    """
+    self._host_syncs[site] = self._host_syncs.get(site, 0) + 1
+    return
+
+def host_sync(self, site):
+    """
+    Blocks until the device has completed all the queued operations,
+    while recording the same. Used in place of af.sync.
+
+    Parameters
+    ----------
+
+    self: nonlinear_solver/fields_solver
+          The solver whose counters are incremented.
+
+    site: str
+          Name of the routine which performs the synchronization.
+    """
+    af.sync()
+    record_host_sync(self, site)
+    return
+
+def get_host_sync_count(self, site = None):
+    """
+    Returns the number of synchronizations made at the site passed.
+    When no site is passed, the total over all sites is returned.
+    """
+    if(site is None):
+        return(sum(self._host_syncs.values()))
+
+    return(self._host_syncs.get(site, 0))
+
+def reset_host_sync_count(self):
+    """
+    Resets the counters of all the sites. The dictionary is cleared
+    in place since it is shared with the fields solver.
+    """
+    self._host_syncs.clear()
+    return
+
+def print_host_syncs(self, N_iters):
+    """
+    Prints the number of device --> host synchronizations made per
+    timestep at each of the sites of the solver.
+
+    Parameters
+    ----------
+
+    N_iters: int
+             Number of timesteps taken since the counters were reset.
+    """
+    # All ranks need to take part in the reductions:
+    sites = self._comm.bcast(sorted(self._host_syncs.keys()), root = 0)
+
+    table = PrettyTable(["Site", "Syncs(per iter)"])
+    total = 0
+
+    for site in sites:
+        syncs = np.zeros(1)
+        self._comm.Reduce(np.array([self._host_syncs.get(site, 0) / N_iters]), syncs,
+                          op = MPI.MAX, root = 0
+                         )
+        table.add_row([site.upper(), syncs[0]])
+        total += syncs[0]
+
+    table.add_row(['TOTAL', total])
+
+    if(self._comm.rank == 0):
+        PETSc.Sys.Print(table)
+
+    return
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Controls the points at which the ArrayFire JIT is forced to evaluate.
+
+By default, every helper routine of the solver(reconstructions, Riemann
+solvers, layout conversions, moments, integrators...) calls af.eval on its
+result. While this keeps the memory usage predictable, it prevents the JIT
+from fusing operations across function boundaries and materializes a
+full-sized temporary per helper call.
+
+When lazy evaluation is enabled, the helpers defer to the JIT by calling
+eval_helper, and the evaluation takes place only at the planned points
+of each stage(end of df_dt, end of an operator, before communication) which
+call eval_planned.
+
+The mode is held by each solver(nonlinear_solver.lazy_evaluation), and is
+made active only for the duration of its timesteps using lazy_evaluation_mode,
+such that solvers declared with different modes don't affect each other.
+
+The counters are held by each solver(nonlinear_solver._jit_statistics),
+and are made active along with the mode by lazy_evaluation_mode, such that
+the counts of a solver aren't mixed with those of other solvers. They are
+used by print_jit_diagnostics of the nonlinear solver.
+
+ArrayFire does not expose the number of kernels it launches or the size of
+its JIT trees. What is counted is the number of calls made to af.eval, and
+the number of arrays whose evaluation was deferred to a planned call. A
+single af.eval may launch several kernels(or none, when the arrays passed
+have already been evaluated), so these counts are proxies and should be
+compared across the modes of the solver rather than read as kernel counts.
+Kernel level counts can be obtained by running with AF_TRACE=jit, which
+logs each kernel generated by the JIT.
+"""
+
+import contextlib
+
+import numpy as np
+import arrayfire as af
+from petsc4py import PETSc
+from mpi4py import MPI
+from prettytable import PrettyTable
+
+# Mode which is active(set by lazy_evaluation_mode for each timestep):
+_lazy_evaluation = False
+
+# Counters of the solver which is stepping(set by lazy_evaluation_mode):
+_active_statistics = None
+
+def set_lazy_evaluation(flag):
+    """
+    Enables/disables the deferral of evaluations
+    in the helper routines of the solver.
+
+    Parameters
+    ----------
+
+    flag: bool
+          When True, only the planned evaluation points are evaluated.
+    """
+    global _lazy_evaluation
+    _lazy_evaluation = bool(flag)
+    return
+
+def get_lazy_evaluation():
+    """
+    Returns True if the evaluations in the helper routines are deferred.
+    """
+    return(_lazy_evaluation)
+
+@contextlib.contextmanager
+def lazy_evaluation_mode(flag, statistics = None):
+    """
+    Context manager which makes the mode and the counters passed active
+    within the block, and restores those which were active before on exit.
+
+    Parameters
+    ----------
+
+    flag: bool
+          When True, only the planned evaluation points are evaluated.
+
+    statistics: dict
+                Counters of the solver(as created by reset_jit_statistics)
+                which are incremented by the evaluations made within the
+                block. No counts are kept when None.
+    """
+    global _active_statistics
+
+    previous_flag       = get_lazy_evaluation()
+    previous_statistics = _active_statistics
+
+    set_lazy_evaluation(flag)
+    _active_statistics = statistics
+
+    try:
+        yield
+
+    finally:
+        set_lazy_evaluation(previous_flag)
+        _active_statistics = previous_statistics
+
+def reset_jit_statistics(self):
+    """
+    Resets the counters of the solver which are used by the JIT diagnostics.
+    """
+    self._jit_statistics = {'af_eval_calls'       : 0,
+                            'deferred_arrays'     : 0,
+                            'pending_arrays'      : 0,
+                            'max_arrays_per_eval' : 0
+                           }
+
+    return
+
+def eval_helper(*arrays):
+    """
+    Used in place of af.eval inside the helper routines. The evaluation
+    is deferred to the next planned point when lazy evaluation is enabled.
+
+    Parameters
+    ----------
+
+    arrays: af.Array
+            The arrays which are to be evaluated.
+    """
+    if(_lazy_evaluation == True):
+        if(_active_statistics is not None):
+            _active_statistics['deferred_arrays'] += len(arrays)
+            _active_statistics['pending_arrays']  += len(arrays)
+
+    else:
+        af.eval(*arrays)
+        if(_active_statistics is not None):
+            _active_statistics['af_eval_calls'] += 1
+
+    return
+
+def eval_planned(*arrays):
+    """
+    Evaluates the arrays passed. This is used at the points where
+    the evaluation needs to take place irrespective of the mode used,
+    such as the end of a stage, or before the data is communicated.
+
+    Parameters
+    ----------
+
+    arrays: af.Array
+            The arrays which are to be evaluated.
+    """
+    af.eval(*arrays)
+
+    if(_active_statistics is not None):
+        _active_statistics['af_eval_calls'] += 1
+        _active_statistics['max_arrays_per_eval'] = \
+            max(_active_statistics['max_arrays_per_eval'],
+                _active_statistics['pending_arrays'] + len(arrays)
+               )
+        _active_statistics['pending_arrays'] = 0
+
+    return
+
+def print_jit_diagnostics(self, N_iters):
+    """
+    Prints the number of calls made to af.eval, and the number of arrays
+    whose evaluation was deferred per timestep. The counters are accumulated
+    since the solver was declared(or since reset_jit_statistics was called).
+    These are proxies for the kernel launches and the JIT tree sizes, which
+    ArrayFire doesn't expose(see the module docstring).
+
+    Parameters
+    ----------
+
+    N_iters: int
+             Number of timesteps taken since the counters were reset.
+    """
+    statistics = self._jit_statistics
+
+    eval_calls = np.zeros(1)
+    deferred   = np.zeros(1)
+    max_arrays = np.zeros(1)
+
+    # Performing reduction operations to obtain the greatest value amongst nodes/devices:
+    self._comm.Reduce(np.array([statistics['af_eval_calls']/N_iters]), eval_calls,
+                      op = MPI.MAX, root = 0
+                     )
+    self._comm.Reduce(np.array([statistics['deferred_arrays']/N_iters]), deferred,
+                      op = MPI.MAX, root = 0
+                     )
+    self._comm.Reduce(np.array([float(statistics['max_arrays_per_eval'])]), max_arrays,
+                      op = MPI.MAX, root = 0
+                     )
+
+    if(self._comm.rank == 0):
+
+        table = PrettyTable(["Quantity", "Value"])
+
+        table.add_row(['LAZY_EVALUATION', self.lazy_evaluation])
+        table.add_row(['AF_EVAL_CALLS(per iter)', eval_calls[0]])
+        table.add_row(['DEFERRED_ARRAYS(per iter)', deferred[0]])
+
+        if(eval_calls[0] != 0):
+            table.add_row(['MEAN_ARRAYS_PER_EVAL', 1 + deferred[0] / eval_calls[0]])
+
+        table.add_row(['MAX_ARRAYS_PER_EVAL', max_arrays[0]])
+
+        PETSc.Sys.Print(table)
+
+    return
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Reports the memory held by the buffers of the solver.
+
+The arrays held on the device(af.Array), and on the host(PETSc.Vec,
+PETSc.Mat and numpy arrays) by the solver are listed along with their sizes.
+The containers held by the solver(dicts, lists, tuples and deques such as
+the rollback states, the halo exchange buffers or the diagnostics buffer)
+and the helper objects of bolt which it owns(fields_solver, async_writer..)
+are searched recursively. The matrices of a PETSc.KSP are listed with the
+same, while the work vectors created internally by PETSc aren't visible
+from here. The numpy arrays which are views of the PETSc vectors are listed
+as views, and aren't counted in the totals. A buffer which is reachable
+through several references is only listed at the first of these.
+
+ArrayFire retains the buffers which are freed by the solver in its memory
+manager for reuse, until af.device_gc is called. The memory allocated by
+the allocator is thus the high-water mark of the device memory used since
+the last garbage collection. The largest value seen over the calls made
+to memory_report is reported as AF_MAX_OBSERVED. This isn't the peak of 
+the allocator, since allocations made(and collected) between the calls 
+aren't seen.
+"""
+
+from collections import deque
+
+import numpy as np
+import arrayfire as af
+from petsc4py import PETSc
+from mpi4py import MPI
+from prettytable import PrettyTable
+
+# Bytes per element for the types as returned by af.Array.type():
+_bytes_per_element = {0 : 4,  # f32
+                      1 : 8,  # c32
+                      2 : 8,  # f64
+                      3 : 16, # c64
+                      4 : 1,  # b8
+                      5 : 4,  # s32
+                      6 : 4,  # u32
+                      7 : 1,  # u8
+                      8 : 8,  # s64
+                      9 : 8,  # u64
+                      10: 2,  # s16
+                      11: 2,  # u16
+                      12: 2   # f16
+                     }
+
+def _sorted_attributes(obj):
+    """
+    Returns the attributes of the object sorted by name, with the buffers
+    held directly as attributes placed before the containers. This lists
+    the buffers which are also referenced from the containers by the name
+    of the attribute.
+    """
+    return(sorted(vars(obj).items(),
+                  key = lambda item: (not isinstance(item[1], (af.Array, 
+                                                               PETSc.Object,
+                                                               np.ndarray
+                                                              )
+                                                    ),
+                                      item[0]
+                                     )
+                 )
+          )
+
+def _list_buffers(value, name, buffers, seen):
+    """
+    Appends (name, location, bytes) to buffers for each of the buffers
+    which are reachable from the value passed. The ids of the values
+    already visited are held in seen.
+    """
+    # The same PETSc object may be wrapped by several python objects:
+    if(isinstance(value, PETSc.Object)):
+        if(value.handle == 0):
+            return
+        key = ('PETSc', value.handle)
+
+    else:
+        key = id(value)
+
+    if(key in seen):
+        return
+    
+    seen.add(key)
+
+    if(isinstance(value, af.Array)):
+        buffers.append((name, 'device',
+                        value.elements() * _bytes_per_element[value.type()]
+                      ))
+
+    elif(isinstance(value, PETSc.Vec)):
+        buffers.append((name, 'host(PETSc)',
+                        value.getLocalSize() * np.dtype(PETSc.ScalarType).itemsize
+                      ))
+
+    elif(isinstance(value, PETSc.Mat)):
+        try:
+            buffers.append((name, 'host(PETSc)', int(value.getInfo()['memory'])))
+        # Matrices such as shell matrices don't report their memory:
+        except PETSc.Error:
+            pass
+
+    elif(isinstance(value, PETSc.KSP)):
+        for i, operator in enumerate(value.getOperators()):
+            _list_buffers(operator, name + '.operators[%d]'%i, buffers, seen)
+
+    elif(isinstance(value, np.ndarray)):
+        if(value.flags['OWNDATA'] == True):
+            buffers.append((name, 'host', value.nbytes))
+        else:
+            buffers.append((name, 'host(view)', 0))
+
+    elif(isinstance(value, dict)):
+        for item_key, item in sorted(value.items(), key = lambda item: repr(item[0])):
+            _list_buffers(item, name + '[%r]'%(item_key, ), buffers, seen)
+
+    elif(isinstance(value, (list, tuple, deque))):
+        for i, item in enumerate(value):
+            _list_buffers(item, name + '[%d]'%i, buffers, seen)
+
+    # Helper objects of bolt which are held by the solver:
+    elif(type(value).__module__.startswith('bolt.') and hasattr(value, '__dict__')):
+        for attribute, item in _sorted_attributes(value):
+            _list_buffers(item, name + '.' + attribute, buffers, seen)
+
+    return
+
+def memory_report(self):
+    """
+    Prints the buffers which are held by the solver on the device and
+    the host along with their sizes(in MB), and the memory allocated by
+    the ArrayFire allocator(along with the largest value of the same seen
+    over the calls to memory_report). The maximum over all the ranks is 
+    printed.
+
+    Returns a dictionary with the size(in bytes) of each of the buffers
+    held on this rank.
+    """
+    buffers = []
+    seen    = set([id(self)])
+
+    for name, value in _sorted_attributes(self):
+        _list_buffers(value, name, buffers, seen)
+
+    alloc_bytes, alloc_buffers, lock_bytes, lock_buffers = af.device_mem_info()
+
+    self._device_memory_max_observed = \
+        max(getattr(self, '_device_memory_max_observed', 0), alloc_bytes)
+
+    sizes = dict([(name, size) for (name, location, size) in buffers])
+
+    # All ranks need to take part in the reductions:
+    buffers = self._comm.bcast(buffers, root = 0)
+
+    table = PrettyTable(["Buffer", "Location", "Size(MB)"])
+    total = {'device' : 0, 'host' : 0}
+
+    def reduced(value):
+        value_max = np.zeros(1)
+        self._comm.Reduce(np.array([float(value)]), value_max,
+                          op = MPI.MAX, root = 0
+                         )
+        return(value_max[0] / 1024**2)
+
+    for (name, location, size) in buffers:
+        size = reduced(sizes.get(name, 0))
+        table.add_row([name, location, size])
+        total[location.split('(')[0]] += size
+
+    table.add_row(['TOTAL', 'device', total['device']])
+    table.add_row(['TOTAL', 'host', total['host']])
+    table.add_row(['AF_ALLOCATED', 'device', reduced(alloc_bytes)])
+    table.add_row(['AF_IN_USE', 'device', reduced(lock_bytes)])
+    table.add_row(['AF_MAX_OBSERVED', 'device', reduced(self._device_memory_max_observed)])
+
+    if(self._comm.rank == 0):
+        PETSc.Sys.Print(table)
+
+    return(sizes)
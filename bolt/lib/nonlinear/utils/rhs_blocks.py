@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Used in evaluating the RHS of the solver over blocks of the local zone.
+
+The evaluation of df_dt_fvm and f_interp_p_3d creates several temporaries
+which are of the same size as the distribution function(stencil copies,
+fluxes and face values along each of the directions, converted layouts..).
+When the solver is declared with rhs_blocks != 1, these routines are
+evaluated over blocks along q2, such that the peak memory usage is bounded
+by the size of the temporaries for a single block.
+
+When rhs_blocks = 'auto', the number of blocks is chosen such that the
+temporaries for each block fit in the memory which is available on the
+device. Since ArrayFire does not report the free memory of the device,
+this is determined by trial allocations.
+"""
+
+import numpy as np
+import arrayfire as af
+
+# Approximate number of temporaries of the size of f which are
+# alive at the peak of each of the blocked routines:
+temporaries_df_dt_fvm     = 24
+temporaries_f_interp_p_3d = 8
+
+def probe_available_device_memory(N_bytes_required, N_bytes_min = 2**20):
+    """
+    Returns the number of bytes(upto N_bytes_required) which may be
+    allocated on the device. This is determined by trial allocations,
+    halving the size of the allocation until it succeeds.
+
+    Parameters
+    ----------
+
+    N_bytes_required: int
+                      Upper bound for the memory probed.
+
+    N_bytes_min: int
+                 Size below which the probing is stopped, and 0 is returned.
+    """
+    N_bytes = int(N_bytes_required)
+
+    while(N_bytes >= N_bytes_min):
+        try:
+            probe = af.constant(0, N_bytes // 4, dtype = af.Dtype.f32)
+            af.eval(probe)
+            af.sync()
+
+            del probe
+            af.device_gc()
+            return(N_bytes)
+
+        except RuntimeError:
+            af.device_gc()
+            N_bytes = N_bytes // 2
+
+    return(0)
+
+def get_N_rhs_blocks(self, N_temporaries):
+    """
+    Returns the number of blocks along q2 over which the RHS is to be
+    evaluated. When the solver is declared with rhs_blocks = 'auto',
+    this is determined once for each routine using the memory which
+    is available on the device.
+
+    Parameters
+    ----------
+
+    N_temporaries: int
+                   Number of temporaries of the size of f created
+                   by the routine which is to be evaluated.
+    """
+    if(self.rhs_blocks != 'auto'):
+        return(self.rhs_blocks)
+
+    if(N_temporaries not in self._N_rhs_blocks):
+
+        N_g_q      = self.N_ghost_q
+        N_q2_local = self.f.shape[3] - 2 * N_g_q if (self.f.numdims() == 4) else 1
+
+        # The temporaries are held in double precision, irrespective
+        # of the precision in which f is stored:
+        N_bytes_required = N_temporaries * self.f.elements() * 8
+        N_bytes_free     = probe_available_device_memory(N_bytes_required)
+
+        # Smallest number of blocks whose temporaries(inclusive of the
+        # overlapping ghost zones) fit in the memory available:
+        N_blocks = 1
+        while(    N_blocks < N_q2_local
+              and (  N_bytes_required
+                   * (np.ceil(N_q2_local / N_blocks) + 2 * N_g_q)
+                   / (N_q2_local + 2 * N_g_q)
+                  ) > N_bytes_free
+             ):
+            N_blocks += 1
+
+        self._N_rhs_blocks[N_temporaries] = N_blocks
+
+    return(self._N_rhs_blocks[N_temporaries])
+
+def get_q2_blocks(N_q2_local, N_blocks):
+    """
+    Returns a list of the (start, end) indices of the blocks along q2,
+    which partition the local zone(non-inclusive of the ghost zones).
+
+    Parameters
+    ----------
+
+    N_q2_local: int
+                Number of zones along q2 in the local zone.
+
+    N_blocks: int
+              Number of blocks into which the zone is to be divided.
+    """
+    N_blocks = max(1, min(N_blocks, N_q2_local))
+    edges    = np.linspace(0, N_q2_local, N_blocks + 1).astype(np.int64)
+
+    return([(int(edges[i]), int(edges[i + 1])) for i in range(N_blocks)])
+
+def slice_q2_window(array, q2_window):
+    """
+    Returns the slice of the array along q2(axis 3) for the window passed.
+    Windows which extend past the ends of the local zone are wrapped around,
+    in the same way as the af.shift used by the stencils. This allows the
+    blocks at the ends of the local zone to see the same neighbours for the
+    ghost zones as when the complete local zone is evaluated.
+
+    Parameters
+    ----------
+
+    array: af.Array
+           Array whose size along axis 3 is that of the local zone
+           (inclusive of the ghost zones).
+
+    q2_window: tuple
+               The (start, end) indices along q2 of the window. start may 
+               be negative, and end may exceed the size of the local zone.
+    """
+    start, end = q2_window
+    N_q2       = array.shape[3]
+
+    if(start < 0):
+        return(af.join(3, array[:, :, :, N_q2 + start:], array[:, :, :, :end]))
+
+    if(end > N_q2):
+        return(af.join(3, array[:, :, :, start:], array[:, :, :, :end - N_q2]))
+
+    return(array[:, :, :, start:end])
@@ -25,11 +25,10 @@ def A_p(q1, q2, p1, p2, p3,
         params
        ):
     """Return the terms A_p1, A_p2 and A_p3."""
-    F1 =   (params.charge_electron / params.mass_particle) \
-         * (E1 + p2 * B3 - p3 * B2)
-    F2 =   (params.charge_electron / params.mass_particle) \
-         * (E2 - p1 * B3 + p3 * B1)
-    F3 =   (params.charge_electron / params.mass_particle) \
-         * (E3 - p2 * B1 + p1 * B2)
+    charge_by_mass = params.charge_electron / params.mass_particle
+
+    F1 = charge_by_mass * (E1 + p2 * B3 - p3 * B2)
+    F2 = charge_by_mass * (E2 - p1 * B3 + p3 * B1)
+    F3 = charge_by_mass * (E3 - p2 * B1 + p1 * B2)
 
     return (F1, F2, F3)
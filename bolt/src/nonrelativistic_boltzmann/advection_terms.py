@@ -7,7 +7,7 @@ nonrelativistic Boltzmann equation.
 
 The equation that we are solving is:
 
-df/dt + v_x * df/dq1 + v_y * df/dy + (E + v X B)_x * df/dv_x + (E + v X B)_y * df/dv_y + (E + v X B)_y * df/dv_z = 0
+df/dt + v_x * df/dq1 + v_y * df/dy + (E + v X B)_x * df/dv_x + (E + v X B)_y * df/dv_y + (E + v X B)_z * df/dv_z = 0
 
 In the solver framework this can be described using:
 
@@ -20,8 +20,17 @@ A_q2 = C_q2 = v_y = v2
 A_v1 = C_v1 = q/m * (E_x + v_y * B_z - v_z * B_y) = q/m * (E1 + v2 * B3 - v3 * B2)
 A_v2 = C_v2 = q/m * (E_y + v_z * B_x - v_x * B_z) = q/m * (E2 + v3 * B1 - v1 * B3)
 A_v3 = C_v3 = q/m * (E_z + v_x * B_y - v_y * B_x) = q/m * (E3 + v1 * B2 - v2 * B1)
+
+The fields returned by fields_solver.get_lorentz_fields() are already
+multiplied by q/m of each of the species. When the magnetic fields vanish,
+A_p is returned without the velocity axis, which is used by the solver to
+advect in p-space using spectral shifts.
 """
 
+import arrayfire as af
+
+from bolt.lib.nonlinear.utils.lazy_evaluation import eval_helper
+
 def A_q(f, t, q1, q2, v1, v2, v3, params):
     """
     Return the terms A_q1, A_q2.
@@ -134,14 +143,23 @@ def A_p(f, t, q1, q2, v1, v2, v3,
     params: The parameters file/object that is originally declared by the user.
             This can be used to inject other functions/attributes into the function
     """
-    q = params.charge
-    m = params.mass
+    # (q/m)E, (q/m)B:
+    E1, E2, E3, B1, B2, B3 = fields_solver.get_lorentz_fields()
+
+    # The force doesn't depend on the velocity:
+    if(fields_solver.magnetic_fields_vanish == True):
+        return(E1, E2, E3)
 
-    E1, E2, E3, B1, B2, B3 = fields_solver.get_fields()
+    A_p1 = E1 + v2 * B3 - v3 * B2
+    A_p2 = E2 + v3 * B1 - v1 * B3
+    A_p3 = E3 + v1 * B2 - v2 * B1
 
-    A_p1 = (q/m) * (E1 + v2 * B3 - v3 * B2)
-    A_p2 = (q/m) * (E2 + v3 * B1 - v1 * B3)
-    A_p3 = (q/m) * (E1 + v1 * B2 - v2 * B1)
+    # Evaluating the components together(A_p3 is only used when p_dim = 3).
+    # This is deferred to the planned points when lazy evaluation is active:
+    if(params.p_dim == 3):
+        eval_helper(A_p1, A_p2, A_p3)
+    else:
+        eval_helper(A_p1, A_p2)
 
     return (A_p1, A_p2, A_p3)
 
@@ -182,13 +200,14 @@ def C_p(f, t, q1, q2, v1, v2, v3,
     params: The parameters file/object that is originally declared by the user.
             This can be used to inject other functions/attributes into the function
     """
-    q = params.charge
-    m = params.mass
+    # (q/m)E, (q/m)B:
+    E1, E2, E3, B1, B2, B3 = fields_solver.get_lorentz_fields()
 
-    E1, E2, E3, B1, B2, B3 = fields_solver.get_fields()
+    C_p1 = E1 + v2 * B3 - v3 * B2
+    C_p2 = E2 + v3 * B1 - v1 * B3
+    C_p3 = E3 + v1 * B2 - v2 * B1
 
-    C_p1 = (q/m) * (E1 + v2 * B3 - v3 * B2)
-    C_p2 = (q/m) * (E2 + v3 * B1 - v1 * B3)
-    C_p3 = (q/m) * (E1 + v1 * B2 - v2 * B1)
+    # Evaluating the components together(deferred when lazy evaluation is active):
+    eval_helper(C_p1, C_p2, C_p3)
 
     return (C_p1, C_p2, C_p3)
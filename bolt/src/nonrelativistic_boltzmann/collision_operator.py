@@ -7,6 +7,7 @@ import numpy as np
 import arrayfire as af
 
 from bolt.lib.nonlinear.utils.broadcasted_primitive_operations import multiply
+from bolt.lib.nonlinear.utils.lazy_evaluation import eval_helper
 
 # Using af.broadcast, since v1, v2, v3 are of size (1, 1, Nv1*Nv2*Nv3)
 # All moment quantities are of shape (Nq1, Nq2)
@@ -64,7 +65,7 @@ def f0(v1, v2, v3, n, T, v1_bulk, v2_bulk, v3_bulk, params):
         f0 = n * af.sqrt(m / (2 * np.pi * k * T)) \
                * af.exp(-m * (v1 - v1_bulk)**2 / (2 * k * T))
 
-    af.eval(f0)
+    eval_helper(f0)
     return (f0)
 
 def BGK(f, t, q1, q2, v1, v2, v3, moments, params, flag = False):